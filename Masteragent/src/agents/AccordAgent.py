@@ -1,111 +1,117 @@
-from typing import Dict, Any, List
-import logging
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.messages import HumanMessage
-
-class AccordAgent:
-    def __init__(self):
-        self.llm = ChatGoogleGenerativeAI(
-            model="gemini-pro",
-            temperature=0.3
-        )
-        
-        self.accord_prompt = """
-        Analyze this data model against ACCORD standards:
-        
-        Data Model: {data}
-        
-        Provide comprehensive analysis for:
-        1. ACCORD Standard Mappings:
-           - Data standards alignment
-           - Industry standard patterns
-           - Required transformations
-        
-        2. Insurance Domain Concepts:
-           - Core insurance entities
-           - Business processes
-           - Industry relationships
-        
-        3. Compliance Analysis:
-           - Standard compliance levels
-           - Required validations
-           - Integration requirements
-        
-        4. Implementation Recommendations:
-           - Data transformations
-           - Integration patterns
-           - Best practices
-        
-        Format each section clearly and provide confidence levels.
-        """
-
-    async def process(self, datapedia_result: Dict[str, Any]) -> Dict[str, Any]:
-        try:
-            # Prepare data for analysis
-            analysis_data = {
-                "entities": datapedia_result.get("entities", {}),
-                "relationships": datapedia_result.get("relationships", []),
-                "analysis": datapedia_result.get("analysis", "")
-            }
-
-            # Generate ACCORD analysis
-            messages = [
-                HumanMessage(
-                    content=self.accord_prompt.format(data=analysis_data)
-                )
-            ]
-            
-            response = await self.llm.ainvoke(messages)
-            
-            # Process and structure the response
-            accord_analysis = {
-                "standard_mappings": self._extract_standard_mappings(response.content),
-                "domain_concepts": self._extract_domain_concepts(response.content),
-                "compliance": self._analyze_compliance(response.content),
-                "recommendations": self._extract_recommendations(response.content),
-                "raw_analysis": response.content
-            }
-
-            return accord_analysis
-
-        except Exception as e:
-            logging.error(f"Error in AccordAgent: {e}")
-            raise
-
-    def _extract_standard_mappings(self, analysis: str) -> Dict[str, Any]:
-        mappings = {}
-        try:
-            if "Standard Mappings:" in analysis:
-                mappings_section = analysis.split("Standard Mappings:")[1].split("2.")[0]
-                # Extract mappings
-                # Add mapping logic here
-        except Exception as e:
-            logging.error(f"Error extracting standard mappings: {e}")
-        return mappings
-
-    def _extract_domain_concepts(self, analysis: str) -> Dict[str, Any]:
-        concepts = {
-            "core_entities": [],
-            "processes": [],
-            "relationships": []
-        }
-        # Implementation of concept extraction
-        return concepts
-
-    def _analyze_compliance(self, analysis: str) -> Dict[str, Any]:
-        compliance = {
-            "overall_level": "unknown",
-            "validations": [],
-            "requirements": []
-        }
-        # Implementation of compliance analysis
-        return compliance
-
-    def _extract_recommendations(self, analysis: str) -> Dict[str, Any]:
-        recommendations = {
-            "transformations": [],
-            "patterns": [],
-            "practices": []
-        }
-        # Implementation of recommendation extraction
+from typing import Dict, Any, List
+import logging
+from src.llm.gateway import get_gateway
+from src.llm.metrics import tagged
+from src.llm.serializer import render_prompt
+from langchain_core.messages import HumanMessage
+
+class AccordAgent:
+    def __init__(self, llm=None):
+        self.llm = llm or get_gateway()
+        
+        self.accord_prompt = """
+        Analyze this data model against ACCORD standards:
+        
+        Data Model: {data}
+        
+        Provide comprehensive analysis for:
+        1. ACCORD Standard Mappings:
+           - Data standards alignment
+           - Industry standard patterns
+           - Required transformations
+        
+        2. Insurance Domain Concepts:
+           - Core insurance entities
+           - Business processes
+           - Industry relationships
+        
+        3. Compliance Analysis:
+           - Standard compliance levels
+           - Required validations
+           - Integration requirements
+        
+        4. Implementation Recommendations:
+           - Data transformations
+           - Integration patterns
+           - Best practices
+        
+        Format each section clearly and provide confidence levels.
+        """
+        # What the catalog is searched for when the prompt only carries the
+        # most relevant entities (MapperAgent retrieval_top_k)
+        self.retrieval_query = (
+            "insurance policy policyholder party claim coverage premium insured "
+            "risk underwriting beneficiary producer agreement"
+        )
+
+    async def process(self, datapedia_result: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            # Prepare data for analysis
+            analysis_data = {
+                "entities": datapedia_result.get("entities", {}),
+                "relationships": datapedia_result.get("relationships", []),
+                "analysis": datapedia_result.get("analysis", "")
+            }
+
+            # Generate ACCORD analysis
+            messages = [
+                HumanMessage(
+                    content=render_prompt(self.accord_prompt, label="accord", data=analysis_data).text
+                )
+            ]
+            
+            with tagged(agent="AccordAgent"):
+                response = await self.llm.ainvoke(messages)
+            
+            # Process and structure the response
+            accord_analysis = {
+                "standard_mappings": self._extract_standard_mappings(response.content),
+                "domain_concepts": self._extract_domain_concepts(response.content),
+                "compliance": self._analyze_compliance(response.content),
+                "recommendations": self._extract_recommendations(response.content),
+                "raw_analysis": response.content
+            }
+
+            return accord_analysis
+
+        except Exception as e:
+            logging.error(f"Error in AccordAgent: {e}")
+            raise
+
+    def _extract_standard_mappings(self, analysis: str) -> Dict[str, Any]:
+        mappings = {}
+        try:
+            if "Standard Mappings:" in analysis:
+                mappings_section = analysis.split("Standard Mappings:")[1].split("2.")[0]
+                # Extract mappings
+                # Add mapping logic here
+        except Exception as e:
+            logging.error(f"Error extracting standard mappings: {e}")
+        return mappings
+
+    def _extract_domain_concepts(self, analysis: str) -> Dict[str, Any]:
+        concepts = {
+            "core_entities": [],
+            "processes": [],
+            "relationships": []
+        }
+        # Implementation of concept extraction
+        return concepts
+
+    def _analyze_compliance(self, analysis: str) -> Dict[str, Any]:
+        compliance = {
+            "overall_level": "unknown",
+            "validations": [],
+            "requirements": []
+        }
+        # Implementation of compliance analysis
+        return compliance
+
+    def _extract_recommendations(self, analysis: str) -> Dict[str, Any]:
+        recommendations = {
+            "transformations": [],
+            "patterns": [],
+            "practices": []
+        }
+        # Implementation of recommendation extraction
         return recommendations
\ No newline at end of file
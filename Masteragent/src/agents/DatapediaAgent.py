@@ -1,134 +1,205 @@
-from typing import Dict, Any, List
-import logging
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.messages import HumanMessage
-
-class DatapediaAgent:
-    def __init__(self, vertex_db_client):
-        self.vertex_db = vertex_db_client
-        self.llm = ChatGoogleGenerativeAI(
-            model="gemini-pro",
-            temperature=0.3
-        )
-        
-        self.analysis_prompt = """
-        Analyze the following data sources and provide a comprehensive analysis:
-        
-        Datapedia: {datapedia}
-        Conceptual Model: {conceptual}
-        Schema: {schema}
-        
-        Provide analysis of:
-        1. Entity relationships
-        2. Data consistency
-        3. Business rules
-        4. Technical constraints
-        
-        Format your response with clear sections for each aspect.
-        """
-
-    async def process(self) -> Dict[str, Any]:
-        try:
-            # Get data from VertexDB
-            vertex_data = self.vertex_db.get_data()
-            datapedia = vertex_data.get("datapedia", {})
-            conceptual_model = vertex_data.get("conceptual_model", {})
-            schema = vertex_data.get("schema", {})
-
-            # Generate analysis using LLM
-            messages = [
-                HumanMessage(
-                    content=self.analysis_prompt.format(
-                        datapedia=datapedia,
-                        conceptual=conceptual_model,
-                        schema=schema
-                    )
-                )
-            ]
-            
-            response = await self.llm.ainvoke(messages)
-            
-            analysis_result = {
-                "raw_data": {
-                    "datapedia": datapedia,
-                    "conceptual_model": conceptual_model,
-                    "schema": schema
-                },
-                "analysis": response.content,
-                "entities": self._extract_entities(datapedia, conceptual_model, schema),
-                "relationships": self._extract_relationships(datapedia, conceptual_model, schema)
-            }
-
-            return analysis_result
-
-        except Exception as e:
-            logging.error(f"Error in DatapediaAgent: {e}")
-            raise
-
-    def _extract_entities(self, datapedia: Dict, conceptual: Dict, schema: Dict) -> Dict[str, Any]:
-        entities = {}
-        
-        # Extract from datapedia
-        if "entities" in datapedia:
-            for entity_name, entity_data in datapedia["entities"].items():
-                entities[entity_name] = {
-                    "source": "datapedia",
-                    "attributes": entity_data.get("attributes", []),
-                    "description": entity_data.get("definition", "")
-                }
-                
-        # Extract from conceptual model
-        if "entities" in conceptual:
-            for entity_name, entity_data in conceptual["entities"].items():
-                if entity_name not in entities:
-                    entities[entity_name] = {
-                        "source": "conceptual",
-                        "attributes": entity_data.get("attributes", []),
-                        "description": entity_data.get("description", "")
-                    }
-                    
-        # Extract from schema
-        if "tables" in schema:
-            for table_name, table_data in schema["tables"].items():
-                if table_name not in entities:
-                    entities[table_name] = {
-                        "source": "schema",
-                        "attributes": [col["name"] for col in table_data.get("columns", [])],
-                        "description": table_data.get("description", "")
-                    }
-                    
-        return entities
-
-    def _extract_relationships(self, datapedia: Dict, conceptual: Dict, schema: Dict) -> List[Dict]:
-        relationships = []
-        
-        # Extract from datapedia
-        if "relationships" in datapedia:
-            for rel in datapedia["relationships"]:
-                relationships.append({
-                    "source": "datapedia",
-                    **rel
-                })
-                
-        # Extract from conceptual model
-        if "relationships" in conceptual:
-            for rel in conceptual["relationships"]:
-                relationships.append({
-                    "source": "conceptual",
-                    **rel
-                })
-                
-        # Extract from schema (foreign keys)
-        if "tables" in schema:
-            for table_name, table_data in schema["tables"].items():
-                for column in table_data.get("columns", []):
-                    if "foreign_key" in column:
-                        relationships.append({
-                            "source": "schema",
-                            "source_entity": table_name,
-                            "target_entity": column["foreign_key"]["table"],
-                            "type": "foreign_key",
-                            "cardinality": "N:1"
-                        })
-                        
+from typing import Dict, Any, Iterable, List, Optional
+from collections.abc import Mapping
+import logging
+from src.llm.gateway import get_gateway
+from src.llm.metrics import tagged
+from src.llm.serializer import render_prompt
+from src.pipeline.incremental import catalog_names, scope_catalog
+from src.vertex.async_api import run_blocking
+from src.vertex.names import NameIndex, attribute_key, attribute_names, conceptual_entities
+from langchain_core.messages import HumanMessage
+
+class DatapediaAgent:
+    def __init__(self, vertex_db_client, llm=None):
+        self.vertex_db = vertex_db_client
+        self.llm = llm or get_gateway()
+        
+        self.analysis_prompt = """
+        Analyze the following data sources and provide a comprehensive analysis:
+        
+        Datapedia: {datapedia}
+        Conceptual Model: {conceptual}
+        Schema: {schema}
+        
+        Provide analysis of:
+        1. Entity relationships
+        2. Data consistency
+        3. Business rules
+        4. Technical constraints
+        
+        Format your response with clear sections for each aspect.
+        """
+
+    async def process(self, scope: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        try:
+            # Get data from VertexDB
+            aget_data = getattr(self.vertex_db, "aget_data", None)
+            vertex_data = await aget_data() if aget_data else self.vertex_db.get_data()
+            # Scoping, rendering and extraction walk the whole catalog, so they
+            # run on the catalog executor instead of stalling the event loop
+            prepared = await run_blocking(self._prepare, vertex_data, scope)
+
+            # Generate analysis using LLM
+            messages = [HumanMessage(content=prepared["prompt"])]
+            
+            with tagged(agent="DatapediaAgent"):
+                response = await self.llm.ainvoke(messages)
+            
+            analysis_result = {
+                "raw_data": prepared["raw_data"],
+                "analysis": response.content,
+                "entities": prepared["entities"],
+                "relationships": prepared["relationships"]
+            }
+
+            return analysis_result
+
+        except Exception as e:
+            logging.error(f"Error in DatapediaAgent: {e}")
+            raise
+
+    def _prepare(self, vertex_data: Dict[str, Any], scope: Optional[Iterable[str]]) -> Dict[str, Any]:
+        # The client's index is built once per catalog version; it also covers
+        # entities outside an incremental scope, which resolve the same way
+        name_index = getattr(self.vertex_db, "name_index", None)
+        names = name_index() if name_index else None
+        if scope is not None:
+            # Incremental runs only re-analyze the changed part of the catalog;
+            # the scope holds NameIndex keys, so every spelling is kept
+            names = names or catalog_names(vertex_data)
+            vertex_data = scope_catalog(vertex_data, scope, names)
+        datapedia = vertex_data.get("datapedia", {})
+        conceptual_model = vertex_data.get("conceptual_model", {})
+        schema = vertex_data.get("schema", {})
+        names = names or NameIndex.from_catalog(datapedia, conceptual_model, schema)
+        return {
+            "prompt": render_prompt(
+                self.analysis_prompt,
+                label="datapedia",
+                datapedia=datapedia,
+                conceptual=conceptual_model,
+                schema=schema
+            ).text,
+            "raw_data": {
+                "datapedia": datapedia,
+                "conceptual_model": conceptual_model,
+                "schema": schema
+            },
+            "entities": self._extract_entities(datapedia, conceptual_model, schema, names),
+            "relationships": self._extract_relationships(datapedia, conceptual_model, schema, names)
+        }
+
+    def _extract_entities(
+        self,
+        datapedia: Dict,
+        conceptual: Dict,
+        schema: Dict,
+        names: Optional[NameIndex] = None
+    ) -> Dict[str, Any]:
+        # Spellings of the same entity across sources (Customer, customers,
+        # a conceptual sub-type) are merged here rather than by the LLM
+        names = names or NameIndex.from_catalog(datapedia, conceptual, schema)
+        entities = {}
+        seen_attributes: Dict[str, set] = {}
+
+        def add(section: str, name: str, attributes: Any, description: str) -> None:
+            key = names.resolve(name) or name
+            entity = entities.get(key)
+            if entity is None:
+                # Copied once so later sources can be merged in place
+                entity = entities[key] = {
+                    "source": section,
+                    "attributes": dict(attributes) if isinstance(attributes, Mapping) else list(attributes or []),
+                    "description": description
+                }
+                seen_attributes[key] = {attribute_key(n) for n in attribute_names(attributes)}
+                supertypes = names.supertypes(key)
+                if supertypes:
+                    entity["supertypes"] = supertypes
+                if name == key:
+                    return
+            elif not entity["description"]:
+                entity["description"] = description
+
+            entity.setdefault("aliases", {}).setdefault(section, []).append(name)
+            seen = seen_attributes[key]
+            for attribute in attribute_names(attributes):
+                # Only spelling differences merge: party_type and
+                # party_type_cd, or status and statuses, stay separate
+                if attribute_key(attribute) in seen:
+                    continue
+                seen.add(attribute_key(attribute))
+                if isinstance(entity["attributes"], dict):
+                    entity["attributes"][attribute] = {"source": section}
+                else:
+                    entity["attributes"].append(attribute)
+
+        # Extract from datapedia
+        for entity_name, entity_data in datapedia.get("entities", {}).items():
+            add("datapedia", entity_name, entity_data.get("attributes", []), entity_data.get("definition", ""))
+
+        # Extract from conceptual model
+        for entity_name, entity_data in conceptual_entities(conceptual):
+            add("conceptual", entity_name, entity_data.get("attributes", []), entity_data.get("description", ""))
+
+        # Extract from schema
+        for table_name, table_data in schema.get("tables", {}).items():
+            add(
+                "schema",
+                table_name,
+                [col["name"] for col in table_data.get("columns", [])],
+                table_data.get("description", "")
+            )
+
+        return entities
+
+    def _extract_relationships(
+        self,
+        datapedia: Dict,
+        conceptual: Dict,
+        schema: Dict,
+        names: Optional[NameIndex] = None
+    ) -> List[Dict]:
+        names = names or NameIndex.from_catalog(datapedia, conceptual, schema)
+        relationships = []
+
+        def endpoints(rel: Dict) -> Dict[str, Any]:
+            # Named after the merged entities, like the foreign keys below
+            return {
+                "source_entity": names.resolve(rel.get("source") or "") or rel.get("source"),
+                "target_entity": names.resolve(rel.get("target") or "") or rel.get("target")
+            }
+        
+        # Extract from datapedia
+        if "relationships" in datapedia:
+            for rel in datapedia["relationships"]:
+                relationships.append({
+                    "source": "datapedia",
+                    **rel,
+                    **endpoints(rel)
+                })
+                
+        # Extract from conceptual model
+        if "relationships" in conceptual:
+            for rel in conceptual["relationships"]:
+                relationships.append({
+                    "source": "conceptual",
+                    **rel,
+                    **endpoints(rel)
+                })
+                
+        # Extract from schema (foreign keys)
+        if "tables" in schema:
+            for table_name, table_data in schema["tables"].items():
+                for column in table_data.get("columns", []):
+                    if "foreign_key" in column:
+                        relationships.append({
+                            "source": "schema",
+                            # Named after the merged entities rather than the tables
+                            "source_entity": names.resolve(table_name) or table_name,
+                            "target_entity": names.resolve(column["foreign_key"]["table"]) or column["foreign_key"]["table"],
+                            "type": "foreign_key",
+                            "cardinality": "N:1"
+                        })
+                        
         return relationships
\ No newline at end of file
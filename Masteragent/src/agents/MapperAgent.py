@@ -1,245 +1,558 @@
-from typing import Dict, Any, List
-import logging
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.messages import HumanMessage
-from .DatapediaAgent import DatapediaAgent
-from .BIANAgent import BIANAgent
-from .AccordAgent import AccordAgent
-from src.types.suggestions import EntitySuggestion, RelationSuggestion
-
-class MapperAgent:
-    def __init__(self, vertex_db_client):
-        self.datapedia_agent = DatapediaAgent(vertex_db_client)
-        self.bian_agent = BIANAgent()
-        self.accord_agent = AccordAgent()
-        
-        self.llm = ChatGoogleGenerativeAI(
-            model="gemini-pro",
-            temperature=0.3
-        )
-        
-        # Define prompts for entity and relationship analysis
-        self.entity_prompt = """
-        Analyze these integrated data sources and suggest comprehensive entities:
-        
-        Datapedia Analysis: {datapedia}
-        BIAN Analysis: {bian}
-        ACCORD Analysis: {accord}
-        
-        For each entity, provide in this exact format:
-        Entity: [entity name]
-        Description: [detailed description integrating all sources]
-        Attributes: [comma-separated list of all attributes]
-        Source: [primary source framework]
-        Confidence: [score between 0 and 1]
-        
-        Consider:
-        - Merge similar entities from different sources
-        - Include all relevant attributes
-        - Maintain data consistency
-        - Follow industry standards
-        - Consider both banking and insurance domains
-        """
-        
-        self.relation_prompt = """
-        Analyze and suggest relationships between the entities:
-        
-        Available Entities: {entities}
-        
-        Source Data:
-        Datapedia: {datapedia}
-        BIAN Framework: {bian}
-        ACCORD Standards: {accord}
-        
-        For each relationship, provide in this exact format:
-        Relation: [relationship name]
-        Source: [source entity]
-        Target: [target entity]
-        Type: [relationship type]
-        Cardinality: [cardinality]
-        Confidence: [score between 0 and 1]
-        Description: [detailed description]
-        
-        Consider:
-        - Business rules from all sources
-        - Industry standard patterns
-        - Data integrity requirements
-        - Cross-domain relationships
-        """
-
-    async def analyze_and_suggest(self) -> Dict[str, Any]:
-        try:
-            logging.info("Starting MapperAgent analysis")
-            
-            # Get results from all agents
-            datapedia_result = await self.datapedia_agent.process()
-            logging.info("Datapedia analysis complete")
-            
-            bian_result = await self.bian_agent.process(datapedia_result)
-            logging.info("BIAN analysis complete")
-            
-            accord_result = await self.accord_agent.process(datapedia_result)
-            logging.info("ACCORD analysis complete")
-            
-            # Generate entity suggestions
-            entity_response = await self._get_llm_response(
-                self.entity_prompt,
-                datapedia=datapedia_result,
-                bian=bian_result,
-                accord=accord_result
-            )
-            entity_suggestions = self._parse_entity_suggestions(entity_response)
-            logging.info(f"Generated {len(entity_suggestions)} entity suggestions")
-            
-            # Generate relation suggestions
-            relation_response = await self._get_llm_response(
-                self.relation_prompt,
-                entities=entity_suggestions,
-                datapedia=datapedia_result,
-                bian=bian_result,
-                accord=accord_result
-            )
-            relation_suggestions = self._parse_relation_suggestions(relation_response)
-            logging.info(f"Generated {len(relation_suggestions)} relation suggestions")
-            
-            return {
-                "entity_suggestions": entity_suggestions,
-                "relation_suggestions": relation_suggestions,
-                "source_analyses": {
-                    "datapedia": datapedia_result,
-                    "bian": bian_result,
-                    "accord": accord_result
-                }
-            }
-            
-        except Exception as e:
-            logging.error(f"Error in MapperAgent analyze_and_suggest: {str(e)}")
-            raise
-
-    async def _get_llm_response(self, prompt: str, **kwargs) -> str:
-        try:
-            messages = [HumanMessage(content=prompt.format(**kwargs))]
-            response = await self.llm.ainvoke(messages)
-            return response.content
-        except Exception as e:
-            logging.error(f"Error in LLM response: {str(e)}")
-            return ""
-
-    def _parse_entity_suggestions(self, text: str) -> List[EntitySuggestion]:
-        try:
-            entities = []
-            lines = text.split('\n')
-            current_entity = None
-            
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    continue
-                    
-                if line.startswith('Entity:'):
-                    if current_entity:
-                        entities.append(current_entity)
-                    name = line.split('Entity:')[1].strip()
-                    current_entity = {
-                        'name': name,
-                        'attributes': [],
-                        'description': '',
-                        'source': '',
-                        'confidence': 0.0
-                    }
-                elif current_entity:
-                    if line.startswith('Attributes:'):
-                        attrs = line.split('Attributes:')[1].strip()
-                        current_entity['attributes'] = [
-                            attr.strip() 
-                            for attr in attrs.split(',')
-                            if attr.strip()
-                        ]
-                    elif line.startswith('Description:'):
-                        current_entity['description'] = line.split('Description:')[1].strip()
-                    elif line.startswith('Source:'):
-                        current_entity['source'] = line.split('Source:')[1].strip()
-                    elif line.startswith('Confidence:'):
-                        try:
-                            confidence = float(line.split('Confidence:')[1].strip())
-                            current_entity['confidence'] = min(max(confidence, 0.0), 1.0)
-                        except ValueError:
-                            current_entity['confidence'] = 0.0
-            
-            if current_entity:
-                entities.append(current_entity)
-                
-            return [
-                EntitySuggestion(
-                    name=e['name'],
-                    attributes=e['attributes'],
-                    source=e['source'],
-                    confidence=e['confidence'],
-                    description=e['description']
-                )
-                for e in entities
-            ]
-            
-        except Exception as e:
-            logging.error(f"Error parsing entity suggestions: {str(e)}")
-            return []
-
-    def _parse_relation_suggestions(self, text: str) -> List[RelationSuggestion]:
-        try:
-            relations = []
-            lines = text.split('\n')
-            current_relation = None
-            
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    continue
-                    
-                if line.startswith('Relation:'):
-                    if current_relation:
-                        relations.append(current_relation)
-                    current_relation = {
-                        'source_entity': '',
-                        'target_entity': '',
-                        'relation_type': '',
-                        'cardinality': '',
-                        'confidence': 0.0,
-                        'description': ''
-                    }
-                elif current_relation:
-                    if line.startswith('Source:'):
-                        current_relation['source_entity'] = line.split('Source:')[1].strip()
-                    elif line.startswith('Target:'):
-                        current_relation['target_entity'] = line.split('Target:')[1].strip()
-                    elif line.startswith('Type:'):
-                        current_relation['relation_type'] = line.split('Type:')[1].strip()
-                    elif line.startswith('Cardinality:'):
-                        current_relation['cardinality'] = line.split('Cardinality:')[1].strip()
-                    elif line.startswith('Confidence:'):
-                        try:
-                            confidence = float(line.split('Confidence:')[1].strip())
-                            current_relation['confidence'] = min(max(confidence, 0.0), 1.0)
-                        except ValueError:
-                            current_relation['confidence'] = 0.0
-                    elif line.startswith('Description:'):
-                        current_relation['description'] = line.split('Description:')[1].strip()
-            
-            if current_relation:
-                relations.append(current_relation)
-                
-            return [
-                RelationSuggestion(
-                    source_entity=r['source_entity'],
-                    target_entity=r['target_entity'],
-                    relation_type=r['relation_type'],
-                    cardinality=r['cardinality'],
-                    confidence=r['confidence'],
-                    description=r['description']
-                )
-                for r in relations
-                if r['source_entity'] and r['target_entity']  # Ensure required fields exist
-            ]
-            
-        except Exception as e:
-            logging.error(f"Error parsing relation suggestions: {str(e)}")
-            return []
\ No newline at end of file
+from typing import Dict, Any, AsyncIterator, Callable, Iterable, List, Optional, Set, Tuple
+from contextvars import ContextVar
+from pathlib import Path
+import asyncio
+import contextlib
+import functools
+import logging
+import threading
+import time
+from src.llm.gateway import get_gateway
+from src.llm.metrics import MetricsCollector, collecting, tagged, write_prometheus
+from src.llm.serializer import render_prompt
+from langchain_core.messages import HumanMessage
+from .DatapediaAgent import DatapediaAgent
+from .BIANAgent import BIANAgent
+from .AccordAgent import AccordAgent
+from .suggestion_parser import entity_parser, relation_parser
+from src.types.suggestions import EntitySuggestion, RelationSuggestion, merge_relation_lists, merge_suggestion_lists
+from src.pipeline.dag import Stage, StageDAG
+from src.pipeline.sharding import shard_datapedia_result
+from src.pipeline.incremental import IncrementalState, fingerprint
+from src.retrieval.embedders import Embedder, HashingEmbedder
+from src.retrieval.entities import EntityRetriever
+from src.vertex.async_api import run_blocking
+from src.vertex.validation import CatalogValidationError, validate_catalog
+
+# Seconds spent parsing model output during the current analyze_and_suggest run
+_parse_seconds: ContextVar[Optional[List[float]]] = ContextVar("_parse_seconds", default=None)
+# Catalog entities covered by entity or relation prompts that failed during
+# the current run; incremental runs do not mark them as analyzed
+_failed_entities: ContextVar[Optional[Set[str]]] = ContextVar("_failed_entities", default=None)
+
+class MapperAgent:
+    def __init__(
+        self,
+        vertex_db_client,
+        llm=None,
+        shard_token_budget: Optional[int] = None,
+        relation_batch_size: Optional[int] = None,
+        relation_workers: int = 2,
+        state_path: Optional[Path] = None,
+        metrics_path: Optional[Path] = None,
+        retrieval_top_k: Optional[int] = None,
+        embedder: Optional[Embedder] = None,
+        vector_index_path: Optional[Path] = None
+    ):
+        # All agents share one gateway so caching and rate limits are global
+        self.llm = llm or get_gateway()
+        self.vertex_db = vertex_db_client
+        self.datapedia_agent = DatapediaAgent(vertex_db_client, self.llm)
+        self.bian_agent = BIANAgent(self.llm)
+        self.accord_agent = AccordAgent(self.llm)
+        # When set, entity suggestion runs one prompt per shard of at most
+        # this many estimated tokens of datapedia entities. Only the datapedia
+        # part is sharded: the BIAN and ACCORD analyses are one model answer
+        # each, bounded by the output limit rather than the catalog size, and
+        # are free text that does not split by entity, so every shard carries
+        # them whole
+        self.shard_token_budget = shard_token_budget
+        # When set, relation prompts start for every this many parsed
+        # entities instead of waiting for the whole entity stage
+        self.relation_batch_size = relation_batch_size
+        self.relation_workers = relation_workers
+        # When set, only entities whose fingerprints changed since the last
+        # run (plus their relationship neighbors) are re-sent to the LLM
+        self.incremental = IncrementalState(state_path) if state_path else None
+        # When set, per-call LLM metrics of each run are also written here in
+        # Prometheus text format
+        self.metrics_path = metrics_path
+        # When set, the BIAN, ACCORD and relation prompts only carry this many
+        # entities per query: those most similar to what the prompt is about,
+        # found in a vector index kept next to the catalog
+        self.retrieval_top_k = retrieval_top_k
+        self.embedder = embedder or HashingEmbedder()
+        data_path = getattr(vertex_db_client, "data_path", None)
+        if vector_index_path is None and data_path is not None:
+            vector_index_path = Path(data_path).with_name(Path(data_path).name + ".vectors.npz")
+        self.vector_index_path = vector_index_path
+        self._retriever_lock = threading.Lock()
+        self._retriever_entry: Optional[Tuple[Dict[str, Any], EntityRetriever]] = None
+        
+        # Define prompts for entity and relationship analysis
+        self.entity_prompt = """
+        Analyze these integrated data sources and suggest comprehensive entities:
+        
+        Datapedia Analysis: {datapedia}
+        BIAN Analysis: {bian}
+        ACCORD Analysis: {accord}
+        
+        For each entity, provide in this exact format:
+        Entity: [entity name]
+        Description: [detailed description integrating all sources]
+        Attributes: [comma-separated list of all attributes]
+        Source: [primary source framework]
+        Confidence: [score between 0 and 1]
+        
+        Consider:
+        - Merge similar entities from different sources
+        - Include all relevant attributes
+        - Maintain data consistency
+        - Follow industry standards
+        - Consider both banking and insurance domains
+        """
+        
+        self.relation_prompt = """
+        Analyze and suggest relationships between the entities:
+        
+        Available Entities: {entities}
+        
+        Source Data:
+        Datapedia: {datapedia}
+        BIAN Framework: {bian}
+        ACCORD Standards: {accord}
+        
+        For each relationship, provide in this exact format:
+        Relation: [relationship name]
+        Source: [source entity]
+        Target: [target entity]
+        Type: [relationship type]
+        Cardinality: [cardinality]
+        Confidence: [score between 0 and 1]
+        Description: [detailed description]
+        
+        Consider:
+        - Business rules from all sources
+        - Industry standard patterns
+        - Data integrity requirements
+        - Cross-domain relationships
+        """
+
+    async def analyze_and_suggest(
+        self,
+        on_entity: Optional[Callable[[EntitySuggestion], Any]] = None
+    ) -> Dict[str, Any]:
+        """Run the full pipeline; ``on_entity`` is called with each entity suggestion as soon as it is parsed"""
+        # Every stage reads the catalog version the run started with, even if
+        # a newer one is swapped in meanwhile
+        pinned = getattr(self.vertex_db, "pinned", None)
+        with pinned() if pinned else contextlib.nullcontext():
+            return await self._analyze_and_suggest(on_entity)
+
+    async def _analyze_and_suggest(
+        self,
+        on_entity: Optional[Callable[[EntitySuggestion], Any]] = None
+    ) -> Dict[str, Any]:
+        try:
+            logging.info("Starting MapperAgent analysis")
+            
+            # Reject a broken catalog before any tokens are spent on it; the
+            # walk is blocking, so it runs off the event loop
+            aget_data = getattr(self.vertex_db, "aget_data", None)
+            vertex_data = await aget_data() if aget_data else self.vertex_db.get_data()
+            validate = getattr(self.vertex_db, "validate", None)
+            report = await (run_blocking(validate) if validate else run_blocking(validate_catalog, vertex_data))
+            if not report.valid:
+                raise CatalogValidationError(report)
+            
+            plan = None
+            if self.incremental:
+                name_index = getattr(self.vertex_db, "name_index", None)
+                salt = self._pipeline_salt()
+                plan = await run_blocking(
+                    lambda: self.incremental.plan(vertex_data, salt, name_index() if name_index else None)
+                )
+                logging.info(
+                    f"Incremental run: {len(plan.changed)} changed, {len(plan.removed)} removed, "
+                    f"{len(plan.scope)} of {len(plan.fingerprints)} entities to re-analyze"
+                )
+                if not plan.scope:
+                    self.incremental.commit(plan, [], [], self._pipeline_salt())
+                    entity_suggestions = self.incremental.entity_suggestions()
+                    self._emit_reused(on_entity, entity_suggestions, [])
+                    return {
+                        "entity_suggestions": entity_suggestions,
+                        "relation_suggestions": self.incremental.relation_suggestions(),
+                        "source_analyses": {"timings": {}, "incremental": plan.summary()},
+                        "metrics": self._report_metrics(MetricsCollector())
+                    }
+            
+            # BIAN and ACCORD only need the datapedia result, so the DAG
+            # runs them side by side before the suggestion stages.
+            stages = [
+                Stage("datapedia", functools.partial(self._run_datapedia, scope=plan.scope if plan else None)),
+                Stage("bian", self._run_bian, ("datapedia",)),
+                Stage("accord", self._run_accord, ("datapedia",)),
+            ]
+            if self.relation_batch_size:
+                stages.append(Stage(
+                    "suggestions",
+                    functools.partial(self._suggest_pipelined, on_entity=on_entity),
+                    ("datapedia", "bian", "accord")
+                ))
+            else:
+                stages.extend([
+                    Stage(
+                        "entities",
+                        functools.partial(self._suggest_entities, on_entity=on_entity),
+                        ("datapedia", "bian", "accord")
+                    ),
+                    Stage("relations", self._suggest_relations, ("datapedia", "bian", "accord", "entities")),
+                ])
+            parse_seconds = [0.0]
+            failed: Set[str] = set()
+            collector = MetricsCollector()
+            token = _parse_seconds.set(parse_seconds)
+            failed_token = _failed_entities.set(failed)
+            try:
+                # Calls not made by a sub-agent are the mapper's own prompts
+                with collecting(collector), tagged(agent="MapperAgent"):
+                    results, timings = await StageDAG(stages).run()
+            finally:
+                _parse_seconds.reset(token)
+                _failed_entities.reset(failed_token)
+            timings["parse"] = parse_seconds[0]
+            suggestions = results.get("suggestions", results)
+            entity_suggestions = suggestions["entities"]
+            relation_suggestions = suggestions["relations"]
+            
+            source_analyses = {
+                "datapedia": results["datapedia"],
+                "bian": results["bian"],
+                "accord": results["accord"],
+                "timings": timings
+            }
+            if plan:
+                # Combine the fresh outputs with those reused from earlier runs;
+                # entities whose prompts failed stay due for the next run
+                if failed:
+                    logging.warning(f"{len(failed)} entities left for re-analysis after failed LLM calls")
+                self.incremental.commit(
+                    plan, entity_suggestions, relation_suggestions, self._pipeline_salt(), failed=failed
+                )
+                fresh = entity_suggestions
+                entity_suggestions = self.incremental.entity_suggestions()
+                self._emit_reused(on_entity, entity_suggestions, fresh)
+                relation_suggestions = self.incremental.relation_suggestions()
+                source_analyses["incremental"] = {**plan.summary(), "failed": sorted(failed & plan.scope)}
+            
+            return {
+                "entity_suggestions": entity_suggestions,
+                "relation_suggestions": relation_suggestions,
+                "source_analyses": source_analyses,
+                "metrics": self._report_metrics(collector)
+            }
+            
+        except Exception as e:
+            logging.error(f"Error in MapperAgent analyze_and_suggest: {str(e)}")
+            raise
+
+    @staticmethod
+    def _emit_reused(
+        on_entity: Optional[Callable[[EntitySuggestion], Any]],
+        suggestions: List[EntitySuggestion],
+        fresh: List[EntitySuggestion]
+    ) -> None:
+        """Stream the suggestions reused from earlier runs, which no stage parsed"""
+        if not on_entity:
+            return
+        streamed = {suggestion.name for suggestion in fresh}
+        for suggestion in suggestions:
+            if suggestion.name not in streamed:
+                on_entity(suggestion)
+
+    def _report_metrics(self, collector: MetricsCollector) -> Dict[str, Any]:
+        if self.metrics_path:
+            try:
+                write_prometheus(collector, self.metrics_path)
+            except Exception as e:
+                logging.error(f"Error writing LLM metrics to {self.metrics_path}: {str(e)}")
+        return collector.to_dict()
+
+    def _pipeline_salt(self) -> str:
+        # Stored outputs are only reusable while the prompts and model are unchanged
+        return fingerprint([
+            getattr(self.llm, "model", ""),
+            self.datapedia_agent.analysis_prompt,
+            self.bian_agent.bian_prompt,
+            self.accord_agent.accord_prompt,
+            self.entity_prompt,
+            self.relation_prompt,
+            self.retrieval_top_k and [
+                self.retrieval_top_k,
+                self.embedder.name,
+                self.bian_agent.retrieval_query,
+                self.accord_agent.retrieval_query
+            ]
+        ])
+
+    async def _run_datapedia(self, scope: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        return await self.datapedia_agent.process(scope)
+
+    async def _run_bian(self, datapedia: Dict[str, Any]) -> Dict[str, Any]:
+        return await self.bian_agent.process(await self._retrieve(datapedia, [self.bian_agent.retrieval_query]))
+
+    async def _run_accord(self, datapedia: Dict[str, Any]) -> Dict[str, Any]:
+        return await self.accord_agent.process(await self._retrieve(datapedia, [self.accord_agent.retrieval_query]))
+
+    def _retriever(self, entities: Dict[str, Any]) -> EntityRetriever:
+        # Stages of one run share the index; it is only rebuilt (or reloaded
+        # from vector_index_path) when the datapedia entities change
+        with self._retriever_lock:
+            entry = self._retriever_entry
+            if entry is None or entry[0] is not entities:
+                retriever = EntityRetriever(entities, self.embedder, self.vector_index_path)
+                self._retriever_entry = entry = (entities, retriever)
+            return entry[1]
+
+    async def _retrieve(self, datapedia: Dict[str, Any], queries: List[str]) -> Dict[str, Any]:
+        """``datapedia`` limited to the top-k entities for ``queries`` when retrieval is on"""
+        entities = datapedia.get("entities", {})
+        if not self.retrieval_top_k or not queries or len(entities) <= self.retrieval_top_k:
+            return datapedia
+        retriever = await run_blocking(self._retriever, entities)
+        names = await run_blocking(retriever.top_k, queries, self.retrieval_top_k)
+        return retriever.restrict(datapedia, names)
+
+    async def _suggest_entities(
+        self,
+        datapedia: Dict,
+        bian: Dict,
+        accord: Dict,
+        on_entity: Optional[Callable[[EntitySuggestion], Any]] = None
+    ) -> List[EntitySuggestion]:
+        if self.shard_token_budget:
+            shards = shard_datapedia_result(datapedia, self.shard_token_budget)
+            partials = await asyncio.gather(*(
+                self._suggest_entities_for(shard, bian, accord, on_entity) for shard in shards
+            ))
+            entity_suggestions = merge_suggestion_lists(partials)
+            logging.info(f"Merged entity suggestions from {len(shards)} shards")
+        else:
+            entity_suggestions = await self._suggest_entities_for(datapedia, bian, accord, on_entity)
+        logging.info(f"Generated {len(entity_suggestions)} entity suggestions")
+        return entity_suggestions
+
+    async def _suggest_entities_for(
+        self,
+        datapedia: Dict,
+        bian: Dict,
+        accord: Dict,
+        on_entity: Optional[Callable[[EntitySuggestion], Any]] = None
+    ) -> List[EntitySuggestion]:
+        entity_suggestions = []
+        async for suggestion in self._stream_entities_for(datapedia, bian, accord):
+            entity_suggestions.append(suggestion)
+            if on_entity:
+                on_entity(suggestion)
+        return entity_suggestions
+
+    async def _stream_entities_for(self, datapedia: Dict, bian: Dict, accord: Dict) -> AsyncIterator[EntitySuggestion]:
+        chunks = self._stream_llm_response(
+            self.entity_prompt,
+            label="entity",
+            covers=datapedia,
+            datapedia=self._datapedia_context(datapedia),
+            bian=bian.get("raw_analysis", ""),
+            accord=accord.get("raw_analysis", "")
+        )
+        parser = entity_parser()
+        async for chunk in chunks:
+            for suggestion in self._timed_parse(parser.feed, chunk):
+                yield suggestion
+        for suggestion in self._timed_parse(parser.close):
+            yield suggestion
+
+    async def _suggest_relations(
+        self,
+        datapedia: Dict,
+        bian: Dict,
+        accord: Dict,
+        entities: List[EntitySuggestion]
+    ) -> List[RelationSuggestion]:
+        relation_suggestions = await self._suggest_relations_for(datapedia, bian, accord, entities)
+        logging.info(f"Generated {len(relation_suggestions)} relation suggestions")
+        return relation_suggestions
+
+    async def _suggest_relations_for(self, datapedia: Dict, bian: Dict, accord: Dict, entities: Any) -> List[RelationSuggestion]:
+        suggestions = entities["new"] if isinstance(entities, dict) else entities
+        datapedia = await self._retrieve(datapedia, [
+            " ".join([suggestion.name, suggestion.description, *suggestion.attributes])
+            for suggestion in suggestions
+        ])
+        relation_response = await self._get_llm_response(
+            self.relation_prompt,
+            label="relation",
+            covers=datapedia,
+            entities=entities,
+            datapedia=self._datapedia_context(datapedia),
+            bian=bian.get("raw_analysis", ""),
+            accord=accord.get("raw_analysis", "")
+        )
+        return self._timed_parse(self._parse_relation_suggestions, relation_response)
+
+    async def _suggest_pipelined(
+        self,
+        datapedia: Dict,
+        bian: Dict,
+        accord: Dict,
+        on_entity: Optional[Callable[[EntitySuggestion], Any]] = None
+    ) -> Dict[str, List]:
+        """Overlap relation generation with entity generation.
+
+        Entity producers (one per shard) queue a relation job for every
+        ``relation_batch_size`` parsed entities; relation workers drain the
+        bounded queue while the remaining entities are still being generated.
+        Each job covers its batch in full plus the names of all entities
+        emitted before it, so relations across batches can still be found.
+        """
+        if self.shard_token_budget:
+            contexts = shard_datapedia_result(datapedia, self.shard_token_budget)
+        else:
+            contexts = [datapedia]
+
+        jobs: asyncio.Queue = asyncio.Queue(maxsize=self.relation_workers * 2)
+        partials: List[List[EntitySuggestion]] = [[] for _ in contexts]
+        emitted: Dict[str, None] = {}
+        # Keyed by (shard index, batch number) so the merge below sees the
+        # batches in shard order, not in the order the workers finished them
+        relation_results: Dict[Tuple[int, int], List[RelationSuggestion]] = {}
+
+        async def enqueue(key: Tuple[int, int], batch: List[EntitySuggestion], context: Dict) -> None:
+            earlier = list(emitted)
+            emitted.update(dict.fromkeys(suggestion.name for suggestion in batch))
+            await jobs.put((key, batch, earlier, context))
+
+        async def produce(index: int, context: Dict) -> None:
+            batch = []
+            batches = 0
+            async for suggestion in self._stream_entities_for(context, bian, accord):
+                partials[index].append(suggestion)
+                if on_entity:
+                    on_entity(suggestion)
+                batch.append(suggestion)
+                if len(batch) >= self.relation_batch_size:
+                    await enqueue((index, batches), batch, context)
+                    batches += 1
+                    batch = []
+            if batch:
+                await enqueue((index, batches), batch, context)
+
+        async def produce_all() -> None:
+            await asyncio.gather(*(produce(index, context) for index, context in enumerate(contexts)))
+            for _ in range(self.relation_workers):
+                await jobs.put(None)
+
+        async def consume() -> None:
+            while (job := await jobs.get()) is not None:
+                key, batch, earlier, context = job
+                # Retrieval picks the relevant entities from the whole catalog,
+                # so it replaces the shard as the prompt's scope
+                relation_results[key] = await self._suggest_relations_for(
+                    datapedia if self.retrieval_top_k else context, bian, accord, {"new": batch, "known": earlier}
+                )
+
+        tasks = [asyncio.ensure_future(produce_all())]
+        tasks += [asyncio.ensure_future(consume()) for _ in range(self.relation_workers)]
+        try:
+            await asyncio.gather(*tasks)
+        except Exception:
+            # A failed worker must not leave producers blocked on a full queue
+            for task in tasks:
+                task.cancel()
+            raise
+
+        entity_suggestions = merge_suggestion_lists(partials)
+        relation_lists = [relation_results[key] for key in sorted(relation_results)]
+        relation_suggestions = merge_relation_lists(relation_lists)
+        logging.info(
+            f"Generated {len(entity_suggestions)} entity and {len(relation_suggestions)} "
+            f"relation suggestions from {len(relation_lists)} relation batches"
+        )
+        return {"entities": entity_suggestions, "relations": relation_suggestions}
+
+    @staticmethod
+    def _datapedia_context(datapedia: Dict) -> Dict[str, Any]:
+        # raw_data repeats the catalog that entities/relationships were
+        # derived from, and the structured BIAN/ACCORD fields are parsed out of
+        # raw_analysis, so prompts carry only one copy of each.
+        return {
+            "entities": datapedia.get("entities", {}),
+            "relationships": datapedia.get("relationships", []),
+            "analysis": datapedia.get("analysis", "")
+        }
+
+    @staticmethod
+    def _record_failure(covers: Optional[Dict]) -> None:
+        """Remember the catalog entities behind a failed prompt (keys and their aliases)"""
+        failed = _failed_entities.get()
+        if failed is None or not covers:
+            return
+        for name, entity in covers.get("entities", {}).items():
+            failed.add(name)
+            aliases = entity.get("aliases") if isinstance(entity, dict) else None
+            for names in (aliases or {}).values():
+                failed.update(names)
+
+    async def _get_llm_response(
+        self,
+        prompt: str,
+        label: str = "mapper",
+        covers: Optional[Dict] = None,
+        **kwargs
+    ) -> str:
+        """The model's answer, or "" on failure; ``covers`` is the datapedia
+        result the prompt was about, recorded as failed in that case"""
+        try:
+            messages = [HumanMessage(content=render_prompt(prompt, label=label, **kwargs).text)]
+            response = await self.llm.ainvoke(messages)
+            return response.content
+        except Exception as e:
+            logging.error(f"Error in LLM response: {str(e)}")
+            self._record_failure(covers)
+            return ""
+
+    async def _stream_llm_response(
+        self,
+        prompt: str,
+        label: str = "mapper",
+        covers: Optional[Dict] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        try:
+            messages = [HumanMessage(content=render_prompt(prompt, label=label, **kwargs).text)]
+            if not hasattr(self.llm, "astream"):
+                response = await self.llm.ainvoke(messages)
+                yield response.content
+                return
+            async for chunk in self.llm.astream(messages):
+                yield getattr(chunk, "content", chunk)
+        except Exception as e:
+            logging.error(f"Error in LLM stream: {str(e)}")
+            self._record_failure(covers)
+
+    @staticmethod
+    def _timed_parse(parse: Callable, *args) -> Any:
+        start = time.perf_counter()
+        try:
+            return parse(*args)
+        finally:
+            spent = _parse_seconds.get()
+            if spent is not None:
+                spent[0] += time.perf_counter() - start
+
+    def _parse_entity_suggestions(self, text: str) -> List[EntitySuggestion]:
+        try:
+            parser = entity_parser()
+            return parser.feed(text) + parser.close()
+        except Exception as e:
+            logging.error(f"Error parsing entity suggestions: {str(e)}")
+            return []
+
+    def _parse_relation_suggestions(self, text: str) -> List[RelationSuggestion]:
+        try:
+            parser = relation_parser()
+            return parser.feed(text) + parser.close()
+        except Exception as e:
+            logging.error(f"Error parsing relation suggestions: {str(e)}")
+            return []
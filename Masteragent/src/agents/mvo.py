@@ -1,160 +1,160 @@
-from typing import Dict, Any, List
-from dataclasses import dataclass
-from enum import Enum
-import logging
-from langchain_google_genai import ChatGoogleGenerativeAI
-from .BIANAgent import BIANAgent
-from .AccordAgent import AccordAgent
-from .DatapediaAgent import DatapediaAgent
-from ..types.suggestions import EntitySuggestion, RelationSuggestion
-
-
-@dataclass
-class EntitySuggestion:
-    name: str
-    attributes: List[str]
-    source: str
-    confidence: float
-    description: str
-
-@dataclass
-class RelationSuggestion:
-    source_entity: str
-    target_entity: str
-    relation_type: str
-    cardinality: str
-    confidence: float
-    description: str
-
-class MapperAgent:
-    def __init__(self, vertex_db_client):
-        self.datapedia_agent = DatapediaAgent(vertex_db_client)
-        self.bian_agent = BIANAgent()
-        self.accord_agent = AccordAgent()
-        
-        self.llm = ChatGoogleGenerativeAI(
-            model="gemini-pro",
-            temperature=0.3
-        )
-        
-    async def analyze_and_suggest(self) -> Dict[str, Any]:
-        try:
-            # Get results from all agents
-            datapedia_result = await self.datapedia_agent.process()
-            bian_result = await self.bian_agent.process(datapedia_result)
-            accord_result = await self.accord_agent.process(datapedia_result)
-            
-            # Generate entity suggestions
-            entity_suggestions = await self._suggest_entities(
-                datapedia_result,
-                bian_result,
-                accord_result
-            )
-            
-            # Generate relation suggestions
-            relation_suggestions = await self._suggest_relations(
-                datapedia_result,
-                bian_result,
-                accord_result,
-                entity_suggestions
-            )
-            
-            return {
-                "entity_suggestions": entity_suggestions,
-                "relation_suggestions": relation_suggestions,
-                "source_analyses": {
-                    "datapedia": datapedia_result,
-                    "bian": bian_result,
-                    "accord": accord_result
-                }
-            }
-            
-    async def _suggest_entities(
-        self,
-        datapedia_result: Dict,
-        bian_result: Dict,
-        accord_result: Dict
-    ) -> List[EntitySuggestion]:
-        entity_prompt = """
-        Analyze these data sources and suggest comprehensive entities:
-        
-        Datapedia Analysis: {datapedia}
-        BIAN Analysis: {bian}
-        ACCORD Analysis: {accord}
-        
-        For each entity, provide:
-        1. Name and description
-        2. Key attributes
-        3. Source framework/standard
-        4. Confidence level
-        
-        Consider:
-        - Business relevance
-        - Industry standards
-        - Data consistency
-        - Implementation feasibility
-        """
-        
-        response = await self.llm.agenerate([
-            entity_prompt.format(
-                datapedia=datapedia_result,
-                bian=bian_result,
-                accord=accord_result
-            )
-        ])
-        
-        return self._parse_entity_suggestions(response.generations[0].text)
-        
-    async def _suggest_relations(
-        self,
-        datapedia_result: Dict,
-        bian_result: Dict,
-        accord_result: Dict,
-        entity_suggestions: List[EntitySuggestion]
-    ) -> List[RelationSuggestion]:
-        relation_prompt = """
-        Suggest relationships between the following entities:
-        
-        Entities: {entities}
-        
-        Source Analyses:
-        Datapedia: {datapedia}
-        BIAN: {bian}
-        ACCORD: {accord}
-        
-        For each relationship, specify:
-        1. Source and target entities
-        2. Relationship type
-        3. Cardinality
-        4. Business justification
-        5. Confidence level
-        
-        Consider:
-        - Business rules
-        - Industry standards
-        - Data integrity
-        - Implementation feasibility
-        """
-        
-        response = await self.llm.agenerate([
-            relation_prompt.format(
-                entities=entity_suggestions,
-                datapedia=datapedia_result,
-                bian=bian_result,
-                accord=accord_result
-            )
-        ])
-        
-        return self._parse_relation_suggestions(response.generations[0].text)
-
-    def _parse_entity_suggestions(self, text: str) -> List[EntitySuggestion]:
-        # Parse LLM response into EntitySuggestion objects
-        # Implementation details...
-        pass
-        
-    def _parse_relation_suggestions(self, text: str) -> List[RelationSuggestion]:
-        # Parse LLM response into RelationSuggestion objects
-        # Implementation details...
-        pass
-
-
+from typing import Dict, Any, List
+from dataclasses import dataclass
+from enum import Enum
+import logging
+from langchain_google_genai import ChatGoogleGenerativeAI
+from .BIANAgent import BIANAgent
+from .AccordAgent import AccordAgent
+from .DatapediaAgent import DatapediaAgent
+from ..types.suggestions import EntitySuggestion, RelationSuggestion
+
+
+@dataclass
+class EntitySuggestion:
+    name: str
+    attributes: List[str]
+    source: str
+    confidence: float
+    description: str
+
+@dataclass
+class RelationSuggestion:
+    source_entity: str
+    target_entity: str
+    relation_type: str
+    cardinality: str
+    confidence: float
+    description: str
+
+class MapperAgent:
+    def __init__(self, vertex_db_client):
+        self.datapedia_agent = DatapediaAgent(vertex_db_client)
+        self.bian_agent = BIANAgent()
+        self.accord_agent = AccordAgent()
+        
+        self.llm = ChatGoogleGenerativeAI(
+            model="gemini-pro",
+            temperature=0.3
+        )
+        
+    async def analyze_and_suggest(self) -> Dict[str, Any]:
+        try:
+            # Get results from all agents
+            datapedia_result = await self.datapedia_agent.process()
+            bian_result = await self.bian_agent.process(datapedia_result)
+            accord_result = await self.accord_agent.process(datapedia_result)
+            
+            # Generate entity suggestions
+            entity_suggestions = await self._suggest_entities(
+                datapedia_result,
+                bian_result,
+                accord_result
+            )
+            
+            # Generate relation suggestions
+            relation_suggestions = await self._suggest_relations(
+                datapedia_result,
+                bian_result,
+                accord_result,
+                entity_suggestions
+            )
+            
+            return {
+                "entity_suggestions": entity_suggestions,
+                "relation_suggestions": relation_suggestions,
+                "source_analyses": {
+                    "datapedia": datapedia_result,
+                    "bian": bian_result,
+                    "accord": accord_result
+                }
+            }
+            
+    async def _suggest_entities(
+        self,
+        datapedia_result: Dict,
+        bian_result: Dict,
+        accord_result: Dict
+    ) -> List[EntitySuggestion]:
+        entity_prompt = """
+        Analyze these data sources and suggest comprehensive entities:
+        
+        Datapedia Analysis: {datapedia}
+        BIAN Analysis: {bian}
+        ACCORD Analysis: {accord}
+        
+        For each entity, provide:
+        1. Name and description
+        2. Key attributes
+        3. Source framework/standard
+        4. Confidence level
+        
+        Consider:
+        - Business relevance
+        - Industry standards
+        - Data consistency
+        - Implementation feasibility
+        """
+        
+        response = await self.llm.agenerate([
+            entity_prompt.format(
+                datapedia=datapedia_result,
+                bian=bian_result,
+                accord=accord_result
+            )
+        ])
+        
+        return self._parse_entity_suggestions(response.generations[0].text)
+        
+    async def _suggest_relations(
+        self,
+        datapedia_result: Dict,
+        bian_result: Dict,
+        accord_result: Dict,
+        entity_suggestions: List[EntitySuggestion]
+    ) -> List[RelationSuggestion]:
+        relation_prompt = """
+        Suggest relationships between the following entities:
+        
+        Entities: {entities}
+        
+        Source Analyses:
+        Datapedia: {datapedia}
+        BIAN: {bian}
+        ACCORD: {accord}
+        
+        For each relationship, specify:
+        1. Source and target entities
+        2. Relationship type
+        3. Cardinality
+        4. Business justification
+        5. Confidence level
+        
+        Consider:
+        - Business rules
+        - Industry standards
+        - Data integrity
+        - Implementation feasibility
+        """
+        
+        response = await self.llm.agenerate([
+            relation_prompt.format(
+                entities=entity_suggestions,
+                datapedia=datapedia_result,
+                bian=bian_result,
+                accord=accord_result
+            )
+        ])
+        
+        return self._parse_relation_suggestions(response.generations[0].text)
+
+    def _parse_entity_suggestions(self, text: str) -> List[EntitySuggestion]:
+        # Parse LLM response into EntitySuggestion objects
+        # Implementation details...
+        pass
+        
+    def _parse_relation_suggestions(self, text: str) -> List[RelationSuggestion]:
+        # Parse LLM response into RelationSuggestion objects
+        # Implementation details...
+        pass
+
+
@@ -0,0 +1,145 @@
+from typing import Any, Callable, Dict, Generic, List, Optional, TypeVar
+from src.types.suggestions import EntitySuggestion, RelationSuggestion
+
+T = TypeVar("T")
+
+
+def _parse_confidence(value: str) -> float:
+    try:
+        return min(max(float(value), 0.0), 1.0)
+    except ValueError:
+        return 0.0
+
+
+def _parse_list(value: str) -> List[str]:
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+class SuggestionStreamParser(Generic[T]):
+    """Resumable parser for the 'Field: value' blocks the mapper prompts ask for.
+
+    Text can be fed in arbitrary chunks. A block is emitted as soon as all of
+    its fields have been seen, or when the next block header (or the end of
+    the stream) arrives, so callers get each suggestion without waiting for
+    the whole response.
+    """
+
+    def __init__(
+        self,
+        header: str,
+        fields: Dict[str, tuple],
+        defaults: Dict[str, Any],
+        build: Callable[[Dict[str, Any]], Optional[T]],
+        header_field: Optional[str] = None
+    ):
+        self.header = header
+        self.fields = fields
+        self.defaults = defaults
+        self.build = build
+        self.header_field = header_field
+        self._buffer = ""
+        self._current: Optional[Dict[str, Any]] = None
+        self._seen: set = set()
+
+    def feed(self, chunk: str) -> List[T]:
+        """Consume a chunk of text and return the suggestions it completed"""
+        self._buffer += chunk
+        *lines, self._buffer = self._buffer.split('\n')
+        completed: List[T] = []
+        for line in lines:
+            self._parse_line(line, completed)
+        return completed
+
+    def close(self) -> List[T]:
+        """Flush the trailing partial line and any open block"""
+        completed: List[T] = []
+        if self._buffer:
+            self._parse_line(self._buffer, completed)
+            self._buffer = ""
+        self._emit(completed)
+        return completed
+
+    def _parse_line(self, line: str, completed: List[T]) -> None:
+        line = line.strip()
+        if not line:
+            return
+
+        if line.startswith(self.header):
+            self._emit(completed)
+            self._current = dict(self.defaults)
+            self._seen = set()
+            if self.header_field:
+                self._current[self.header_field] = line.split(self.header, 1)[1].strip()
+            return
+
+        if self._current is None:
+            return
+
+        for prefix, (key, convert) in self.fields.items():
+            if line.startswith(prefix):
+                self._current[key] = convert(line.split(prefix, 1)[1].strip())
+                self._seen.add(prefix)
+                break
+
+        if len(self._seen) == len(self.fields):
+            self._emit(completed)
+
+    def _emit(self, completed: List[T]) -> None:
+        if self._current is None:
+            return
+        suggestion = self.build(self._current)
+        if suggestion is not None:
+            completed.append(suggestion)
+        self._current = None
+        self._seen = set()
+
+
+def _build_relation(data: Dict[str, Any]) -> Optional[RelationSuggestion]:
+    # Ensure required fields exist
+    if not data['source_entity'] or not data['target_entity']:
+        return None
+    return RelationSuggestion(**data)
+
+
+def entity_parser() -> SuggestionStreamParser[EntitySuggestion]:
+    return SuggestionStreamParser(
+        header='Entity:',
+        header_field='name',
+        fields={
+            'Description:': ('description', str),
+            'Attributes:': ('attributes', _parse_list),
+            'Source:': ('source', str),
+            'Confidence:': ('confidence', _parse_confidence)
+        },
+        defaults={
+            'name': '',
+            'attributes': [],
+            'description': '',
+            'source': '',
+            'confidence': 0.0
+        },
+        build=lambda data: EntitySuggestion(**data)
+    )
+
+
+def relation_parser() -> SuggestionStreamParser[RelationSuggestion]:
+    return SuggestionStreamParser(
+        header='Relation:',
+        fields={
+            'Source:': ('source_entity', str),
+            'Target:': ('target_entity', str),
+            'Type:': ('relation_type', str),
+            'Cardinality:': ('cardinality', str),
+            'Confidence:': ('confidence', _parse_confidence),
+            'Description:': ('description', str)
+        },
+        defaults={
+            'source_entity': '',
+            'target_entity': '',
+            'relation_type': '',
+            'cardinality': '',
+            'confidence': 0.0,
+            'description': ''
+        },
+        build=_build_relation
+    )
@@ -0,0 +1,167 @@
+"""Memory benchmark for the logical model and suggestion classes.
+
+Reports traced bytes per attribute when the generator builds a model of
+``--attributes`` attributes (entities ``--width`` attributes wide, each
+merged from a datapedia entry and an overlapping schema table), to size
+worker memory:
+
+    python -m src.benchmarks.memory_bench --attributes 1000000
+
+Catalogs are decoded from JSON first, so every type and description is
+its own string object as in a real load. The bare attribute objects are
+also compared with the plain, unslotted dataclass they replaced, and
+suggestions are measured per instance.
+"""
+import argparse
+import gc
+import json
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from src.logicalmodel.generator import Attribute, LogicalModelGenerator
+from src.types.suggestions import EntitySuggestion, RelationSuggestion
+
+_TYPES = ["string", "integer", "date", "decimal(18,2)", "boolean"]
+
+
+@dataclass
+class _PlainAttribute:
+    """Attribute as it was before slots, interning and packed flags"""
+    name: str
+    data_type: str
+    is_primary: bool = False
+    is_foreign: bool = False
+    is_nullable: bool = True
+    description: str = ""
+
+
+def _catalog(attributes: int, width: int) -> Dict[str, Any]:
+    entities = max(1, attributes // width)
+    datapedia = {
+        "entities": {
+            f"entity_{i}": {
+                "definition": f"Entity {i}",
+                "attributes": {
+                    f"attr_{j}": {"type": _TYPES[j % len(_TYPES)], "description": "Business attribute" if j % 2 else ""}
+                    for j in range(width * 3 // 4)
+                }
+            }
+            for i in range(entities)
+        }
+    }
+    # Half of each table overlaps its entity, half adds the last columns
+    schema = {
+        "tables": {
+            f"entity_{i}": {
+                "columns": [
+                    {"name": f"attr_{j}", "type": "varchar(36)", "nullable": j % 3 != 0, "primary_key": j == 0}
+                    for j in range(width // 2, width)
+                ]
+            }
+            for i in range(entities)
+        }
+    }
+    # Round-trip so strings are separate objects, as after json.load
+    return json.loads(json.dumps({"datapedia": datapedia, "schema": schema}))
+
+
+def _traced(build: Callable[[], Any]) -> int:
+    """Bytes still allocated by ``build``'s result"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        gc.collect()
+        used = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del result
+    return used
+
+
+def _model_bytes(catalog: Dict[str, Any]) -> int:
+    def build():
+        generator = LogicalModelGenerator()
+        generator.analyze_datapedia(catalog["datapedia"])
+        generator.analyze_existing_schema(catalog["schema"])
+        return generator
+    return _traced(build)
+
+
+def _attribute_bytes(cls: type, rows: List[tuple]) -> int:
+    return _traced(lambda: [
+        cls(name, data_type, is_primary=primary, is_nullable=nullable, description=description)
+        for name, data_type, primary, nullable, description in rows
+    ])
+
+
+def run_benchmark(attributes: int, width: int = 20, suggestions: int = 100000) -> Dict[str, Any]:
+    catalog = _catalog(attributes, width)
+    model = _model_bytes(catalog)
+    model_attributes = len(catalog["datapedia"]["entities"]) * width
+
+    rows = [
+        (name, spec["type"], j == 0, j % 3 != 0, spec["description"])
+        for entity in catalog["datapedia"]["entities"].values()
+        for j, (name, spec) in enumerate(entity["attributes"].items())
+    ]
+    del catalog
+    slotted = _attribute_bytes(Attribute, rows)
+    plain = _attribute_bytes(_PlainAttribute, rows)
+    plain_instance = _PlainAttribute("a", "string")
+
+    suggestion_rows = json.loads(json.dumps([
+        {"name": f"entity_{i}", "source": "BIAN", "attributes": [f"attr_{j}" for j in range(8)], "cardinality": "1:N"}
+        for i in range(suggestions)
+    ]))
+    entity_suggestions = _traced(lambda: [
+        EntitySuggestion(row["name"], row["attributes"], row["source"], 0.9, "Suggested entity")
+        for row in suggestion_rows
+    ])
+    relation_suggestions = _traced(lambda: [
+        RelationSuggestion(row["name"], f"entity_{i + 1}", "has", row["cardinality"], 0.8, "Suggested relation")
+        for i, row in enumerate(suggestion_rows)
+    ])
+
+    return {
+        "attributes": model_attributes,
+        "model_bytes_per_attribute": model / model_attributes,
+        "model_mb": model / 2**20,
+        "attribute": {
+            "count": len(rows),
+            "bytes_per_attribute": slotted / len(rows),
+            "plain_bytes_per_attribute": plain / len(rows),
+            "instance_bytes": sys.getsizeof(Attribute("a", "string")),
+            # The instance plus its __dict__
+            "plain_instance_bytes": sys.getsizeof(plain_instance) + sys.getsizeof(plain_instance.__dict__)
+        },
+        "suggestions": {
+            "count": suggestions,
+            "entity_bytes_each": entity_suggestions / suggestions,
+            "relation_bytes_each": relation_suggestions / suggestions
+        },
+        "python": sys.version.split()[0]
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--attributes", type=int, default=1000000, help="Attributes in the built model")
+    parser.add_argument("--width", type=int, default=20, help="Attributes per entity")
+    parser.add_argument("--suggestions", type=int, default=100000)
+    parser.add_argument("--output", type=Path, help="Also write the report as JSON here")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.attributes, width=args.width, suggestions=args.suggestions)
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        args.output.write_text(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Scaling benchmark for LogicalModelGenerator's schema/datapedia attribute merge.
+
+Each size builds one datapedia entity and one schema table of that many
+columns, half of which overlap, and times ``analyze_existing_schema``
+merging the table into the entity:
+
+    python -m src.benchmarks.merge_bench --sizes 500,1000,2000,5000,10000
+
+The reference quadratic merge is timed too, up to ``--reference-max``
+columns, and ``exponent`` is the log-log slope of time against size (1.0
+is linear, 2.0 quadratic).
+"""
+import argparse
+import json
+import math
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from src.logicalmodel.generator import Attribute, Entity, LogicalModelGenerator
+
+
+def _catalog(columns: int) -> Dict[str, Any]:
+    # Datapedia columns 0..n-1 and schema columns n/2..3n/2-1: half overlap
+    offset = columns // 2
+    datapedia = {
+        "entities": {
+            "wide": {
+                "definition": "Wide entity",
+                "attributes": {f"col_{i}": {"type": "string"} for i in range(columns)}
+            }
+        }
+    }
+    schema = {
+        "tables": {
+            "wide": {
+                "columns": [
+                    {"name": f"col_{i}", "type": "varchar(36)", "nullable": i % 2 == 0, "primary_key": i == offset}
+                    for i in range(offset, offset + columns)
+                ]
+            }
+        }
+    }
+    return {"datapedia": datapedia, "schema": schema}
+
+
+def _reference_merge(entity: Entity, new_attributes: List[Attribute]) -> None:
+    """The merge before indexing: a scan of the entity per matching attribute"""
+    existing_names = {attr.name for attr in entity.attributes}
+    for new_attr in new_attributes:
+        if new_attr.name not in existing_names:
+            entity.attributes.append(new_attr)
+        else:
+            for existing_attr in entity.attributes:
+                if existing_attr.name == new_attr.name:
+                    existing_attr.data_type = new_attr.data_type
+                    existing_attr.is_primary = existing_attr.is_primary or new_attr.is_primary
+                    existing_attr.is_foreign = existing_attr.is_foreign or new_attr.is_foreign
+                    existing_attr.is_nullable = existing_attr.is_nullable and new_attr.is_nullable
+
+
+def _time_merge(catalog: Dict[str, Any], reference: bool, repeats: int) -> Dict[str, Any]:
+    timings = []
+    for _ in range(repeats):
+        generator = LogicalModelGenerator()
+        if reference:
+            generator._merge_attributes = _reference_merge
+        generator.analyze_datapedia(catalog["datapedia"])
+        start = time.perf_counter()
+        generator.analyze_existing_schema(catalog["schema"])
+        timings.append(time.perf_counter() - start)
+    return {"seconds": statistics.median(timings), "model": generator.generate_logical_model()}
+
+
+def _exponent(points: List[Dict[str, Any]], key: str) -> float:
+    """Least-squares slope of log(seconds) against log(columns)"""
+    pairs = [(math.log(p["columns"]), math.log(p[key])) for p in points if p.get(key)]
+    if len(pairs) < 2:
+        return float("nan")
+    mean_x = statistics.fmean(x for x, _ in pairs)
+    mean_y = statistics.fmean(y for _, y in pairs)
+    numerator = sum((x - mean_x) * (y - mean_y) for x, y in pairs)
+    denominator = sum((x - mean_x) ** 2 for x, _ in pairs)
+    return numerator / denominator
+
+
+def run_benchmark(sizes: List[int], reference_max: int = 5000, repeats: int = 3) -> Dict[str, Any]:
+    points = []
+    for columns in sizes:
+        catalog = _catalog(columns)
+        indexed = _time_merge(catalog, reference=False, repeats=repeats)
+        point = {
+            "columns": columns,
+            "indexed_seconds": indexed["seconds"],
+            "indexed_us_per_column": indexed["seconds"] / columns * 1e6
+        }
+        if columns <= reference_max:
+            reference = _time_merge(catalog, reference=True, repeats=1)
+            if reference["model"] != indexed["model"]:
+                raise AssertionError(f"Indexed merge differs from the reference at {columns} columns")
+            point["reference_seconds"] = reference["seconds"]
+            point["speedup"] = reference["seconds"] / indexed["seconds"]
+        points.append(point)
+    return {
+        "points": points,
+        "exponent": {
+            "indexed": _exponent(points, "indexed_seconds"),
+            "reference": _exponent(points, "reference_seconds")
+        }
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="500,1000,2000,5000,10000", help="Comma-separated column counts")
+    parser.add_argument("--reference-max", type=int, default=5000, help="Largest size to also time the quadratic merge at")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", type=Path, help="Also write the report as JSON here")
+    args = parser.parse_args()
+
+    report = run_benchmark(
+        [int(size) for size in args.sizes.split(",")],
+        reference_max=args.reference_max,
+        repeats=args.repeats
+    )
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        args.output.write_text(text)
+
+
+if __name__ == "__main__":
+    main()
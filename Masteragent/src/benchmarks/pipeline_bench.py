@@ -0,0 +1,130 @@
+"""End-to-end MapperAgent benchmark against recorded LLM exchanges.
+
+Record once against Gemini, then replay offline:
+
+    python -m src.benchmarks.pipeline_bench --record runs/exchanges.jsonl
+    python -m src.benchmarks.pipeline_bench --replay runs/exchanges.jsonl --latency lognormal:1.5,0.4
+"""
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.agents.MapperAgent import MapperAgent
+from src.llm.backends import GeminiBackend, LatencyModel, RecordingBackend, ReplayBackend
+from src.llm.gateway import LLMGateway
+from src.vertex.vertex_client import VertexDBClient
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _summarize(values: List[float]) -> Dict[str, float]:
+    return {
+        "mean": statistics.fmean(values),
+        "p50": _percentile(values, 50),
+        "p95": _percentile(values, 95),
+        "max": max(values)
+    }
+
+
+async def run_benchmark(
+    backend,
+    catalog: Optional[Path] = None,
+    iterations: int = 5,
+    mapper_options: Optional[Dict[str, Any]] = None,
+    max_concurrency: int = 8
+) -> Dict[str, Any]:
+    """Drive analyze_and_suggest ``iterations`` times and report latencies"""
+    vertex_db = VertexDBClient(catalog)
+    # No response cache and no rate limit: every iteration pays the backend latency
+    gateway = LLMGateway(
+        llm=backend,
+        max_concurrency=max_concurrency,
+        requests_per_minute=1_000_000
+    )
+
+    walls: List[float] = []
+    stages: Dict[str, List[float]] = {}
+    counts = {"entities": 0, "relations": 0}
+    llm_stages: Dict[str, Dict[str, Any]] = {}
+    for _ in range(iterations):
+        mapper = MapperAgent(vertex_db, llm=gateway, **(mapper_options or {}))
+        start = time.perf_counter()
+        result = await mapper.analyze_and_suggest()
+        walls.append(time.perf_counter() - start)
+        for stage, seconds in result["source_analyses"]["timings"].items():
+            stages.setdefault(stage, []).append(seconds)
+        counts = {
+            "entities": len(result["entity_suggestions"]),
+            "relations": len(result["relation_suggestions"])
+        }
+        llm_stages = result["metrics"]["stages"]
+
+    report = {
+        "iterations": iterations,
+        "wall_seconds": _summarize(walls),
+        "stage_seconds": {stage: _summarize(values) for stage, values in stages.items()},
+        "suggestions": counts,
+        "llm_requests": gateway.get_stats()["requests"],
+        # Token and latency accounting of the last iteration, per stage
+        "llm_stages": llm_stages
+    }
+    if isinstance(backend, ReplayBackend):
+        report["replay"] = dict(backend.stats)
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--replay", type=Path, help="JSONL file of recorded exchanges to serve")
+    source.add_argument("--record", type=Path, help="Call Gemini and append exchanges to this JSONL file")
+    parser.add_argument("--catalog", type=Path, help="vertex.json to analyze (defaults to the bundled one)")
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--latency", default="recorded", help="none | recorded | fixed:S | uniform:LO,HI | lognormal:MEDIAN,SIGMA")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--on-miss", default="error", choices=["error", "empty", "template"])
+    parser.add_argument("--shard-token-budget", type=int)
+    parser.add_argument("--relation-batch-size", type=int)
+    parser.add_argument("--max-concurrency", type=int, default=8)
+    parser.add_argument("--output", type=Path, help="Also write the report as JSON here")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    if args.record:
+        backend = RecordingBackend(GeminiBackend(), args.record)
+        iterations = 1
+    else:
+        backend = ReplayBackend(
+            args.replay,
+            latency=LatencyModel(args.latency, seed=args.seed),
+            on_miss=args.on_miss
+        )
+        iterations = args.iterations
+
+    report = asyncio.run(run_benchmark(
+        backend,
+        catalog=args.catalog,
+        iterations=iterations,
+        mapper_options={
+            "shard_token_budget": args.shard_token_budget,
+            "relation_batch_size": args.relation_batch_size
+        },
+        max_concurrency=args.max_concurrency
+    ))
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        args.output.write_text(text)
+
+
+if __name__ == "__main__":
+    main()
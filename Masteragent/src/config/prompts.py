@@ -1,27 +1,27 @@
-from typing import Dict
-
-PROMPTS = {
-    "data_source_agent": """You are a Data Source Expert Agent.
-    Task: Analyze the provided data sources (datapedia, conceptual model, schema).
-    Context: {context}
-    Current Data: {data}
-    
-    Provide detailed analysis considering:
-    1. Entity relationships
-    2. Data consistency
-    3. Mapping opportunities
-    
-    Format your response as a structured analysis.""",
-    
-    "bian_agent": """You are a BIAN Framework Expert.
-    Task: Map the data model to BIAN service domains.
-    Context: {context}
-    Data Model: {data}
-    
-    Identify:
-    1. Relevant BIAN service domains
-    2. Business capabilities
-    3. Service operations
-    
-    Format your response as BIAN-compliant mappings."""
-}
+from typing import Dict
+
+PROMPTS = {
+    "data_source_agent": """You are a Data Source Expert Agent.
+    Task: Analyze the provided data sources (datapedia, conceptual model, schema).
+    Context: {context}
+    Current Data: {data}
+    
+    Provide detailed analysis considering:
+    1. Entity relationships
+    2. Data consistency
+    3. Mapping opportunities
+    
+    Format your response as a structured analysis.""",
+    
+    "bian_agent": """You are a BIAN Framework Expert.
+    Task: Map the data model to BIAN service domains.
+    Context: {context}
+    Data Model: {data}
+    
+    Identify:
+    1. Relevant BIAN service domains
+    2. Business capabilities
+    3. Service operations
+    
+    Format your response as BIAN-compliant mappings."""
+}
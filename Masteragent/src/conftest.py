@@ -0,0 +1,20 @@
+import pytest
+
+from src import test_agents
+
+
+# test_agents.py chains its steps through arguments (see its main());
+# these fixtures feed each step the result of the one before it
+@pytest.fixture
+def datapedia_result():
+    return test_agents.test_datapedia_agent()
+
+
+@pytest.fixture
+def bian_result(datapedia_result):
+    return test_agents.test_bian_agent(datapedia_result)
+
+
+@pytest.fixture
+def accord_result(datapedia_result):
+    return test_agents.test_accord_agent(datapedia_result)
@@ -0,0 +1,235 @@
+import asyncio
+import json
+import logging
+import math
+import random
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+
+from .cache import LLMResponseCache, render_messages
+
+# "human: " and the like, as render_messages writes them
+_ROLE_PREFIX = re.compile(r"^\w+: ")
+
+
+class LLMBackend(ABC):
+    """Minimal chat model interface the gateway drives"""
+    model: str = ""
+    temperature: Optional[float] = None
+
+    @abstractmethod
+    async def ainvoke(self, messages: List[BaseMessage], **kwargs) -> BaseMessage:
+        pass
+
+    async def astream(self, messages: List[BaseMessage], **kwargs) -> AsyncIterator[AIMessageChunk]:
+        response = await self.ainvoke(messages, **kwargs)
+        yield AIMessageChunk(content=response.content)
+
+    def key(self, messages: List[BaseMessage]) -> str:
+        return LLMResponseCache.make_key(self.model, self.temperature, render_messages(messages))
+
+
+class GeminiBackend(LLMBackend):
+    """Live Gemini calls through langchain"""
+
+    def __init__(self, model: str = "gemini-pro", temperature: float = 0.3):
+        from langchain_google_genai import ChatGoogleGenerativeAI
+
+        self.model = model
+        self.temperature = temperature
+        self.llm = ChatGoogleGenerativeAI(model=model, temperature=temperature)
+
+    async def ainvoke(self, messages: List[BaseMessage], **kwargs) -> BaseMessage:
+        return await self.llm.ainvoke(messages, **kwargs)
+
+    async def astream(self, messages: List[BaseMessage], **kwargs) -> AsyncIterator[AIMessageChunk]:
+        async for chunk in self.llm.astream(messages, **kwargs):
+            yield chunk
+
+
+class RecordingBackend(LLMBackend):
+    """Passes calls through to another backend and appends each exchange to a JSONL file"""
+
+    def __init__(self, inner: LLMBackend, path: Path):
+        self.inner = inner
+        self.path = Path(path)
+        self.model = inner.model
+        self.temperature = inner.temperature
+        self._lock = threading.Lock()
+
+    def _record(self, messages: List[BaseMessage], response: str, ttft: float, latency: float) -> None:
+        exchange = {
+            "key": self.key(messages),
+            "model": self.model,
+            "temperature": self.temperature,
+            "prompt": render_messages(messages),
+            "response": response,
+            "ttft": ttft,
+            "latency": latency
+        }
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a") as f:
+                f.write(json.dumps(exchange, ensure_ascii=False) + "\n")
+
+    async def ainvoke(self, messages: List[BaseMessage], **kwargs) -> BaseMessage:
+        start = time.perf_counter()
+        response = await self.inner.ainvoke(messages, **kwargs)
+        latency = time.perf_counter() - start
+        self._record(messages, response.content, latency, latency)
+        return response
+
+    async def astream(self, messages: List[BaseMessage], **kwargs) -> AsyncIterator[AIMessageChunk]:
+        start = time.perf_counter()
+        ttft = None
+        chunks = []
+        async for chunk in self.inner.astream(messages, **kwargs):
+            if ttft is None:
+                ttft = time.perf_counter() - start
+            chunks.append(chunk.content)
+            yield chunk
+        latency = time.perf_counter() - start
+        self._record(messages, "".join(chunks), ttft if ttft is not None else latency, latency)
+
+
+class LatencyModel:
+    """Samples (time to first token, total latency) for replayed calls.
+
+    Specs: ``none``, ``recorded``, ``fixed:SECONDS``, ``uniform:LOW,HIGH`` or
+    ``lognormal:MEDIAN,SIGMA``. ``first_token_share`` is the fraction of the
+    total spent before the first chunk when the recording has no ttft.
+    """
+
+    def __init__(self, spec: str = "none", seed: int = 0, first_token_share: float = 0.3):
+        self.spec = spec
+        self.random = random.Random(seed)
+        self.first_token_share = first_token_share
+        kind, _, params = spec.partition(":")
+        self.kind = kind
+        self.params = [float(value) for value in params.split(",") if value]
+        if kind not in ("none", "recorded", "fixed", "uniform", "lognormal"):
+            raise ValueError(f"Unknown latency spec: {spec}")
+
+    def sample(self, exchange: Dict[str, Any]) -> tuple:
+        if self.kind == "none":
+            return 0.0, 0.0
+        if self.kind == "recorded":
+            latency = exchange.get("latency", 0.0)
+            return exchange.get("ttft", latency * self.first_token_share), latency
+        if self.kind == "fixed":
+            latency = self.params[0]
+        elif self.kind == "uniform":
+            latency = self.random.uniform(self.params[0], self.params[1])
+        else:
+            latency = self.random.lognormvariate(math.log(self.params[0]), self.params[1])
+        return latency * self.first_token_share, latency
+
+
+class ReplayBackend(LLMBackend):
+    """Serves recorded exchanges deterministically, without network access.
+
+    Prompts are matched exactly by key. On a miss, ``on_miss`` decides:
+    ``error`` raises, ``empty`` returns an empty response and ``template``
+    replays the recorded responses for prompts that start with the same
+    line, in round-robin order (useful when batch composition varies).
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        latency: Optional[LatencyModel] = None,
+        on_miss: str = "error",
+        chunk_chars: int = 64,
+        model: str = "gemini-pro",
+        temperature: float = 0.3
+    ):
+        self.path = Path(path)
+        self.latency = latency or LatencyModel()
+        self.on_miss = on_miss
+        self.chunk_chars = chunk_chars
+        self.model = model
+        self.temperature = temperature
+        self.exchanges: Dict[str, Dict[str, Any]] = {}
+        self.by_template: Dict[str, List[Dict[str, Any]]] = {}
+        self._template_cursor: Dict[str, int] = {}
+        self.stats = {"hits": 0, "template_hits": 0, "misses": 0}
+        self._load()
+
+    @staticmethod
+    def _template(prompt: str) -> str:
+        """First non-blank line of the first message's content
+
+        Prompts start with a newline, so the role prefix of the rendered
+        messages ("human: ") is dropped rather than taken as the line.
+        """
+        content = _ROLE_PREFIX.sub("", prompt, count=1)
+        for line in content.splitlines():
+            if line.strip():
+                return line.strip()
+        return ""
+
+    def _load(self) -> None:
+        with open(self.path, "r") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                exchange = json.loads(line)
+                self.exchanges[exchange["key"]] = exchange
+                self.by_template.setdefault(self._template(exchange["prompt"]), []).append(exchange)
+        logging.info(f"Loaded {len(self.exchanges)} recorded LLM exchanges from {self.path}")
+
+    def _lookup(self, messages: List[BaseMessage]) -> Dict[str, Any]:
+        exchange = self.exchanges.get(self.key(messages))
+        if exchange is not None:
+            self.stats["hits"] += 1
+            return exchange
+
+        template = self._template(render_messages(messages))
+        candidates = self.by_template.get(template)
+        if self.on_miss == "template" and candidates:
+            cursor = self._template_cursor.get(template, 0)
+            self._template_cursor[template] = cursor + 1
+            self.stats["template_hits"] += 1
+            return candidates[cursor % len(candidates)]
+
+        self.stats["misses"] += 1
+        if self.on_miss == "error":
+            raise KeyError(f"No recorded exchange for prompt starting: {template[:80]}")
+        return {"response": "", "latency": 0.0, "ttft": 0.0}
+
+    async def ainvoke(self, messages: List[BaseMessage], **kwargs) -> BaseMessage:
+        exchange = self._lookup(messages)
+        _, latency = self.latency.sample(exchange)
+        await asyncio.sleep(latency)
+        return AIMessage(content=exchange["response"])
+
+    async def astream(self, messages: List[BaseMessage], **kwargs) -> AsyncIterator[AIMessageChunk]:
+        exchange = self._lookup(messages)
+        ttft, latency = self.latency.sample(exchange)
+        text = exchange["response"]
+        chunks = [text[i:i + self.chunk_chars] for i in range(0, len(text), self.chunk_chars)] or [""]
+        gap = max(latency - ttft, 0.0) / max(len(chunks) - 1, 1)
+
+        await asyncio.sleep(ttft)
+        for index, chunk in enumerate(chunks):
+            if index:
+                await asyncio.sleep(gap)
+            yield AIMessageChunk(content=chunk)
+
+
+def create_backend(spec: str = "gemini", latency: str = "recorded", on_miss: str = "error") -> LLMBackend:
+    """Build a backend from ``gemini``, ``record:PATH`` or ``replay:PATH``"""
+    kind, _, path = spec.partition(":")
+    if kind == "gemini":
+        return GeminiBackend()
+    if kind == "record":
+        return RecordingBackend(GeminiBackend(), Path(path))
+    if kind == "replay":
+        return ReplayBackend(Path(path), latency=LatencyModel(latency), on_miss=on_miss)
+    raise ValueError(f"Unknown LLM backend: {spec}")
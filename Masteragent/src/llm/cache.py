@@ -0,0 +1,256 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from langchain_core.messages import BaseMessage
+
+# Per-user cache directory rather than the (possibly read-only) package
+DEFAULT_CACHE_PATH = (
+    Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache") / "masteragent" / "llm_cache.sqlite3"
+)
+# Access times of disk hits are written in batches of this many
+_TOUCH_BATCH = 64
+
+
+def render_messages(messages: List[BaseMessage]) -> str:
+    """Render a message list to the exact text sent to the model"""
+    return "\n".join(f"{message.type}: {message.content}" for message in messages)
+
+
+class LLMResponseCache:
+    """Content-addressed LLM response cache.
+
+    An in-memory LRU sits in front of a SQLite table. Entries expire after
+    ``max_age`` seconds in both tiers, and the least recently used disk
+    entries are evicted once the stored responses exceed ``max_bytes``.
+
+    Reads never write on their own: access times of disk hits are batched
+    and written with the next put, eviction or full batch. SQLite errors,
+    such as another process holding the lock, are logged and turn reads
+    into misses, so the cache never fails an LLM call.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        memory_items: int = 256,
+        max_bytes: int = 256 * 1024 * 1024,
+        max_age: float = 7 * 24 * 3600
+    ):
+        self.path = Path(path) if path else None
+        self.memory_items = memory_items
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        # key -> (value, created_at)
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        # Access times of disk hits not yet written
+        self._touched: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._disk_bytes = 0
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+
+        if self.path:
+            self._open()
+
+    def _open(self) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at)"
+            )
+            self._conn.commit()
+            self._disk_bytes = self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()[0]
+            self._evict_disk()
+        except sqlite3.Error as e:
+            logging.error(f"Error opening LLM cache at {self.path}: {e}")
+            self._conn = None
+
+    @staticmethod
+    def make_key(model: str, temperature: Any, prompt: str) -> str:
+        """Hash the inputs that fully determine a response"""
+        payload = json.dumps([model, temperature, prompt], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if time.time() - entry[1] <= self.max_age:
+                    self._memory.move_to_end(key)
+                    self.stats["memory_hits"] += 1
+                    return entry[0]
+                del self._memory[key]
+
+            entry = self._disk_get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+
+            self.stats["disk_hits"] += 1
+            self._memory_put(key, *entry)
+            return entry[0]
+
+    def put(self, key: str, value: str) -> None:
+        with self._lock:
+            self._memory_put(key, value, time.time())
+            self._disk_put(key, value)
+
+    def flush(self) -> None:
+        """Write the batched access times"""
+        with self._lock:
+            if self._conn:
+                try:
+                    self._flush_touched()
+                    self._conn.commit()
+                except sqlite3.Error as e:
+                    logging.error(f"Error writing LLM cache access times: {e}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._touched.clear()
+            if self._conn:
+                try:
+                    self._conn.execute("DELETE FROM responses")
+                    self._conn.commit()
+                    self._disk_bytes = 0
+                except sqlite3.Error as e:
+                    logging.error(f"Error clearing LLM cache: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters plus current occupancy"""
+        with self._lock:
+            hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+            lookups = hits + self.stats["misses"]
+            return {
+                **self.stats,
+                "hits": hits,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "disk_bytes": self._disk_bytes
+            }
+
+    def _memory_put(self, key: str, value: str, created_at: float) -> None:
+        self._memory[key] = (value, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def _disk_get(self, key: str) -> Optional[Tuple[str, float]]:
+        """(value, created_at) of a live disk entry; None on a miss or a database error"""
+        if not self._conn:
+            return None
+        try:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            if now - row[1] > self.max_age:
+                self._evict_disk()
+                return None
+            self._touched[key] = now
+            if len(self._touched) >= _TOUCH_BATCH:
+                self._flush_touched()
+                self._conn.commit()
+            return row
+        except sqlite3.Error as e:
+            logging.error(f"Error reading LLM cache entry, treating it as a miss: {e}")
+            return None
+
+    def _flush_touched(self) -> None:
+        """Write the batched access times; the caller commits"""
+        if self._touched:
+            touched = [(accessed_at, key) for key, accessed_at in self._touched.items()]
+            self._touched.clear()
+            self._conn.executemany("UPDATE responses SET accessed_at = ? WHERE key = ?", touched)
+
+    def _disk_put(self, key: str, value: str) -> None:
+        if not self._conn:
+            return
+        size = len(value.encode("utf-8"))
+        now = time.time()
+        try:
+            previous = self._conn.execute(
+                "SELECT size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now, now)
+            )
+            self._touched.pop(key, None)
+            self._flush_touched()
+            self._conn.commit()
+            self._disk_bytes += size - (previous[0] if previous else 0)
+            if self._disk_bytes > self.max_bytes:
+                self._evict_disk()
+        except sqlite3.Error as e:
+            logging.error(f"Error writing LLM cache entry: {e}")
+
+    def _evict_disk(self) -> None:
+        """Drop expired entries, then least recently used ones until under budget"""
+        self._flush_touched()
+        cursor = self._conn.execute(
+            "DELETE FROM responses WHERE created_at < ?", (time.time() - self.max_age,)
+        )
+        evicted = cursor.rowcount
+        self._disk_bytes = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+
+        if self._disk_bytes > self.max_bytes:
+            overflow = self._disk_bytes - self.max_bytes
+            freed = 0
+            victims = []
+            for key, size in self._conn.execute(
+                "SELECT key, size FROM responses ORDER BY accessed_at"
+            ):
+                if freed >= overflow:
+                    break
+                victims.append((key,))
+                freed += size
+            self._conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+            self._disk_bytes -= freed
+            evicted += len(victims)
+
+        self._conn.commit()
+        self.stats["evictions"] += evicted
+
+
+_default_cache: Optional[LLMResponseCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache() -> LLMResponseCache:
+    """Process-wide cache shared by every agent"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            path = os.getenv("LLM_CACHE_PATH", str(DEFAULT_CACHE_PATH))
+            _default_cache = LLMResponseCache(path=Path(path) if path else None)
+        return _default_cache
@@ -0,0 +1,370 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+from langchain_core.messages import AIMessage, BaseMessage
+
+from .backends import GeminiBackend, create_backend
+from .cache import LLMResponseCache, get_default_cache, render_messages
+from .metrics import LLMCallRecord, current_collector, current_tags
+from .tokens import estimate_tokens
+
+
+class TokenBucket:
+    """Refills ``per_minute`` units evenly over a minute, holding at most ``burst``.
+
+    The fill level is plain state, so one bucket can be shared by every
+    event loop in the process.
+    """
+
+    def __init__(self, per_minute: float, burst: Optional[float] = None):
+        self.rate = per_minute / 60.0
+        self.capacity = burst if burst else max(1.0, per_minute / 10.0)
+        self.level = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self, amount: float) -> float:
+        """Take ``amount`` units if available; otherwise return seconds to wait"""
+        amount = min(amount, self.capacity)
+        with self._lock:
+            self._refill()
+            if self.level >= amount:
+                self.level -= amount
+                return 0.0
+            return (amount - self.level) / self.rate
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        while True:
+            wait = self.try_acquire(amount)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+    def consume(self, amount: float) -> None:
+        """Charge usage known only after the fact; the level may go negative"""
+        with self._lock:
+            self._refill()
+            self.level -= amount
+
+
+class ConcurrencyLimit:
+    """At most ``limit`` holders at a time across every event loop in the process.
+
+    Like ``TokenBucket``, the count is plain state behind a thread lock, so
+    Streamlit sessions, each running its own loop, share one cap. Waiters
+    are futures on their own loop, woken first come, first served by
+    whichever thread releases a slot; a released slot is handed straight
+    to the next waiter.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_use = 0
+        self._waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+        self._lock = threading.Lock()
+
+    async def acquire(self) -> None:
+        with self._lock:
+            if self.in_use < self.limit and not self._waiters:
+                self.in_use += 1
+                return
+            loop = asyncio.get_running_loop()
+            waiter = loop.create_future()
+            self._waiters.append((loop, waiter))
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Granted just before the cancellation landed
+                self.release()
+            else:
+                with self._lock:
+                    if (loop, waiter) in self._waiters:
+                        self._waiters.remove((loop, waiter))
+                # Otherwise a grant is on its way and _grant passes it on
+            raise
+
+    def release(self) -> None:
+        with self._lock:
+            while self._waiters:
+                loop, waiter = self._waiters.popleft()
+                try:
+                    loop.call_soon_threadsafe(self._grant, waiter)
+                    return
+                except RuntimeError:
+                    # The waiter's loop is closed
+                    continue
+            self.in_use -= 1
+
+    def _grant(self, waiter: asyncio.Future) -> None:
+        if waiter.cancelled():
+            self.release()
+        else:
+            waiter.set_result(None)
+
+    async def __aenter__(self) -> None:
+        await self.acquire()
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.release()
+
+
+def reported_usage(message: Any) -> Optional[Tuple[int, int]]:
+    """(prompt, completion) tokens the model reported for a response, if any.
+
+    Newer langchain messages carry ``usage_metadata`` (``input_tokens`` /
+    ``output_tokens``); older Gemini integrations put the API's
+    ``usage_metadata`` (``prompt_token_count`` / ``candidates_token_count``)
+    into ``response_metadata``.
+    """
+    usage = getattr(message, "usage_metadata", None)
+    if usage and usage.get("input_tokens") is not None:
+        return int(usage["input_tokens"]), int(usage.get("output_tokens") or 0)
+    metadata = getattr(message, "response_metadata", None) or {}
+    usage = metadata.get("usage_metadata") or {}
+    if usage.get("prompt_token_count") is not None:
+        return int(usage["prompt_token_count"]), int(usage.get("candidates_token_count") or 0)
+    return None
+
+
+def _stream_usage(chunks: List[Any]) -> Optional[Tuple[int, int]]:
+    """Usage of a streamed response: ``usage_metadata`` adds up across chunks
+    as langchain aggregates them; ``response_metadata`` totals come with the
+    last chunk that has them"""
+    totals = None
+    for chunk in chunks:
+        usage = getattr(chunk, "usage_metadata", None)
+        if usage and usage.get("input_tokens") is not None:
+            prompt, completion = totals or (0, 0)
+            totals = (prompt + int(usage["input_tokens"]), completion + int(usage.get("output_tokens") or 0))
+    if totals is not None:
+        return totals
+    for chunk in reversed(chunks):
+        usage = reported_usage(chunk)
+        if usage is not None:
+            return usage
+    return None
+
+
+class LLMGateway:
+    """Single process-wide entry point to the chat model.
+
+    One underlying client is shared so its transport (and connection pool)
+    is reused by every agent. Requests are answered from the response cache
+    when possible; otherwise they wait for a request slot and rate-limit
+    tokens before reaching the model, and failed attempts are retried with
+    exponential backoff. Every call is recorded to the active
+    ``MetricsCollector``, tagged with the current agent and stage, with the
+    token counts the model reports; calls without reported usage (and cache
+    hits) fall back to estimates and are flagged ``tokens_estimated``.
+    """
+
+    def __init__(
+        self,
+        llm=None,
+        cache: Optional[LLMResponseCache] = None,
+        max_concurrency: int = 8,
+        requests_per_minute: float = 60,
+        tokens_per_minute: Optional[float] = None,
+        max_retries: int = 2,
+        retry_backoff: float = 1.0
+    ):
+        self.llm = llm or GeminiBackend()
+        self.cache = cache
+        self.model = getattr(self.llm, "model", type(self.llm).__name__)
+        self.temperature = getattr(self.llm, "temperature", None)
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        # asyncio semaphores are bound to one loop and Streamlit runs one
+        # loop per session, so the cap is a process-wide ConcurrencyLimit
+        self.slots = ConcurrencyLimit(max_concurrency)
+        # Calls finish on every session's loop and thread
+        self._stats_lock = threading.Lock()
+        self.stats = {"requests": 0, "prompt_tokens": 0, "completion_tokens": 0, "retries": 0}
+
+    def _begin(self, prompt: str) -> LLMCallRecord:
+        tags = current_tags()
+        return LLMCallRecord(
+            agent=tags.get("agent", ""),
+            stage=tags.get("stage", ""),
+            model=self.model,
+            prompt_tokens=estimate_tokens(prompt),
+            cache="miss" if self.cache else "off"
+        )
+
+    def _finish(
+        self,
+        call: LLMCallRecord,
+        start: float,
+        completion: Optional[str],
+        usage: Optional[Tuple[int, int]] = None
+    ) -> None:
+        call.latency = time.perf_counter() - start
+        admitted = call.prompt_tokens
+        if completion is None:
+            call.error = True
+        elif usage is not None:
+            call.prompt_tokens, call.completion_tokens = usage
+            call.tokens_estimated = False
+        else:
+            call.completion_tokens = estimate_tokens(completion)
+        if call.cache != "hit":
+            if self.token_bucket:
+                # Admission charged the estimated prompt; settle the difference
+                self.token_bucket.consume(call.prompt_tokens - admitted + call.completion_tokens)
+            with self._stats_lock:
+                self.stats["requests"] += 1
+                self.stats["prompt_tokens"] += call.prompt_tokens
+                self.stats["completion_tokens"] += call.completion_tokens
+                self.stats["retries"] += call.retries
+        collector = current_collector()
+        if collector:
+            collector.record(call)
+
+    def _cached(self, prompt: str, call: LLMCallRecord) -> Tuple[Optional[str], Optional[str]]:
+        if not self.cache:
+            return None, None
+        key = self.cache.make_key(self.model, self.temperature, prompt)
+        cached = self.cache.get(key)
+        if cached is not None:
+            call.cache = "hit"
+        return key, cached
+
+    async def _admit(self, call: LLMCallRecord) -> None:
+        await self.request_bucket.acquire(1)
+        if self.token_bucket:
+            await self.token_bucket.acquire(call.prompt_tokens)
+
+    async def _backoff(self, call: LLMCallRecord, error: Exception) -> None:
+        if call.retries >= self.max_retries:
+            raise error
+        call.retries += 1
+        delay = self.retry_backoff * 2 ** (call.retries - 1)
+        logging.warning(f"LLM call failed ({error}); retry {call.retries} in {delay:.1f}s")
+        await asyncio.sleep(delay)
+
+    async def ainvoke(self, messages: List[BaseMessage], **kwargs) -> BaseMessage:
+        prompt = render_messages(messages)
+        call = self._begin(prompt)
+        start = time.perf_counter()
+        key, cached = self._cached(prompt, call)
+        if cached is not None:
+            call.ttft = time.perf_counter() - start
+            self._finish(call, start, cached)
+            return AIMessage(content=cached)
+
+        try:
+            while True:
+                await self._admit(call)
+                try:
+                    async with self.slots:
+                        response = await self.llm.ainvoke(messages, **kwargs)
+                    break
+                except Exception as e:
+                    await self._backoff(call, e)
+        except Exception:
+            self._finish(call, start, None)
+            raise
+
+        # Without streaming the first token arrives with the whole response
+        call.ttft = time.perf_counter() - start
+        if key:
+            self.cache.put(key, response.content)
+        self._finish(call, start, response.content, reported_usage(response))
+        return response
+
+    async def astream(self, messages: List[BaseMessage], **kwargs) -> AsyncIterator[str]:
+        """Yield the response as text chunks while it is being generated.
+
+        A cached response arrives as a single chunk. Failures are retried only
+        until the first chunk has been yielded.
+        """
+        prompt = render_messages(messages)
+        call = self._begin(prompt)
+        start = time.perf_counter()
+        key, cached = self._cached(prompt, call)
+        if cached is not None:
+            call.ttft = time.perf_counter() - start
+            self._finish(call, start, cached)
+            yield cached
+            return
+
+        chunks: List[str] = []
+        # Kept for the usage metadata the model attaches to them
+        received: List[Any] = []
+        try:
+            while True:
+                await self._admit(call)
+                try:
+                    # The request slot is held until the stream is fully consumed
+                    async with self.slots:
+                        async for chunk in self.llm.astream(messages, **kwargs):
+                            if call.ttft is None:
+                                call.ttft = time.perf_counter() - start
+                            chunks.append(chunk.content)
+                            received.append(chunk)
+                            yield chunk.content
+                    break
+                except Exception as e:
+                    if chunks:
+                        raise
+                    await self._backoff(call, e)
+        except Exception:
+            self._finish(call, start, None)
+            raise
+
+        response = "".join(chunks)
+        # Only complete responses are cached
+        if key:
+            self.cache.put(key, response)
+        self._finish(call, start, response, _stream_usage(received))
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats["in_flight"] = self.slots.in_use
+        if self.cache:
+            stats["cache"] = self.cache.get_stats()
+        return stats
+
+
+_gateway: Optional[LLMGateway] = None
+_gateway_lock = threading.Lock()
+
+
+def get_gateway() -> LLMGateway:
+    """Process-wide gateway configured from the environment.
+
+    ``LLM_BACKEND`` selects ``gemini`` (default), ``record:PATH`` or
+    ``replay:PATH``; see ``llm.backends``.
+    """
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            tokens_per_minute = os.getenv("LLM_TOKENS_PER_MINUTE")
+            _gateway = LLMGateway(
+                llm=create_backend(
+                    os.getenv("LLM_BACKEND", "gemini"),
+                    latency=os.getenv("LLM_REPLAY_LATENCY", "recorded")
+                ),
+                cache=get_default_cache(),
+                max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", "8")),
+                requests_per_minute=float(os.getenv("LLM_REQUESTS_PER_MINUTE", "60")),
+                tokens_per_minute=float(tokens_per_minute) if tokens_per_minute else None,
+                max_retries=int(os.getenv("LLM_MAX_RETRIES", "2"))
+            )
+            logging.info("Created shared LLM gateway")
+        return _gateway
@@ -0,0 +1,173 @@
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+
+@dataclass
+class LLMCallRecord:
+    """Accounting for one gateway call"""
+    agent: str
+    stage: str
+    model: str
+    prompt_tokens: int
+    completion_tokens: int = 0
+    ttft: Optional[float] = None
+    latency: float = 0.0
+    retries: int = 0
+    cache: str = "off"
+    error: bool = False
+    # True when the token counts are estimates (len/4) rather than the
+    # usage the model reported
+    tokens_estimated: bool = True
+    started_at: float = field(default_factory=time.time)
+
+
+class MetricsCollector:
+    """Collects call records for one pipeline run and summarizes them per stage"""
+
+    def __init__(
+        self,
+        prompt_price_per_1k: Optional[float] = None,
+        completion_price_per_1k: Optional[float] = None
+    ):
+        # Prices are deployment-specific, so they come from the caller or environment
+        self.prompt_price_per_1k = (
+            prompt_price_per_1k if prompt_price_per_1k is not None
+            else float(os.getenv("LLM_PROMPT_PRICE_PER_1K", "0"))
+        )
+        self.completion_price_per_1k = (
+            completion_price_per_1k if completion_price_per_1k is not None
+            else float(os.getenv("LLM_COMPLETION_PRICE_PER_1K", "0"))
+        )
+        self.records: List[LLMCallRecord] = []
+
+    def record(self, call: LLMCallRecord) -> None:
+        self.records.append(call)
+
+    def cost(self, call: LLMCallRecord) -> float:
+        # Cache hits are served locally and cost nothing
+        if call.cache == "hit":
+            return 0.0
+        return (
+            call.prompt_tokens / 1000 * self.prompt_price_per_1k
+            + call.completion_tokens / 1000 * self.completion_price_per_1k
+        )
+
+    def _aggregate(self, records: List[LLMCallRecord]) -> Dict[str, Any]:
+        ttfts = [r.ttft for r in records if r.ttft is not None]
+        return {
+            "calls": len(records),
+            "prompt_tokens": sum(r.prompt_tokens for r in records),
+            "completion_tokens": sum(r.completion_tokens for r in records),
+            "latency_seconds": sum(r.latency for r in records),
+            "max_latency_seconds": max((r.latency for r in records), default=0.0),
+            "mean_ttft_seconds": sum(ttfts) / len(ttfts) if ttfts else None,
+            "retries": sum(r.retries for r in records),
+            "errors": sum(1 for r in records if r.error),
+            "estimated_token_calls": sum(1 for r in records if r.tokens_estimated),
+            "cache_hits": sum(1 for r in records if r.cache == "hit"),
+            "cost": sum(self.cost(r) for r in records)
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        by_stage: Dict[str, List[LLMCallRecord]] = {}
+        for call in self.records:
+            by_stage.setdefault(call.stage, []).append(call)
+        return {
+            "totals": self._aggregate(self.records),
+            "stages": {stage: self._aggregate(records) for stage, records in by_stage.items()},
+            "calls": [asdict(call) for call in self.records]
+        }
+
+
+_collector: ContextVar[Optional[MetricsCollector]] = ContextVar("llm_metrics_collector", default=None)
+_tags: ContextVar[Dict[str, str]] = ContextVar("llm_metrics_tags", default={})
+
+
+def current_collector() -> Optional[MetricsCollector]:
+    return _collector.get()
+
+
+def current_tags() -> Dict[str, str]:
+    return _tags.get()
+
+
+@contextmanager
+def collecting(collector: MetricsCollector) -> Iterator[MetricsCollector]:
+    """Route gateway calls made in this context (and tasks it spawns) to ``collector``"""
+    token = _collector.set(collector)
+    try:
+        yield collector
+    finally:
+        _collector.reset(token)
+
+
+@contextmanager
+def tagged(**tags: str) -> Iterator[None]:
+    """Tag gateway calls made in this context, e.g. ``tagged(agent="BIANAgent")``"""
+    token = _tags.set({**_tags.get(), **tags})
+    try:
+        yield
+    finally:
+        _tags.reset(token)
+
+
+def _label_value(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def write_prometheus(collector: MetricsCollector, path: Path, prefix: str = "mapper_llm") -> None:
+    """Write the collector as a Prometheus text-format file (node_exporter textfile style)
+
+    Each run overwrites the file with that run's totals, which go down as
+    well as up between runs, so every series is a gauge.
+    """
+    series: Dict[str, Dict[tuple, float]] = {}
+    help_text = {
+        "calls": "LLM calls in the last run",
+        "prompt_tokens": "Prompt tokens in the last run, as reported by the model where available",
+        "completion_tokens": "Completion tokens in the last run, as reported by the model where available",
+        "estimated_token_calls": "Calls in the last run whose token counts are estimates",
+        "latency_seconds": "Total call latency in the last run",
+        "ttft_seconds": "Total time to first token in the last run",
+        "ttft_calls": "Calls in the last run with a time to first token",
+        "retries": "Retried attempts in the last run",
+        "errors": "Failed calls in the last run",
+        "cost": "Estimated cost of the last run"
+    }
+    for call in collector.records:
+        labels = (("agent", call.agent), ("stage", call.stage), ("model", call.model), ("cache", call.cache))
+        values = {
+            "calls": 1,
+            "prompt_tokens": call.prompt_tokens,
+            "completion_tokens": call.completion_tokens,
+            "estimated_token_calls": 1 if call.tokens_estimated else 0,
+            "latency_seconds": call.latency,
+            "ttft_seconds": call.ttft or 0.0,
+            "ttft_calls": 1 if call.ttft is not None else 0,
+            "retries": call.retries,
+            "errors": 1 if call.error else 0,
+            "cost": collector.cost(call)
+        }
+        for name, value in values.items():
+            bucket = series.setdefault(name, {})
+            bucket[labels] = bucket.get(labels, 0.0) + value
+
+    lines = []
+    for name, description in help_text.items():
+        metric = f"{prefix}_{name}"
+        lines.append(f"# HELP {metric} {description}")
+        lines.append(f"# TYPE {metric} gauge")
+        for labels, value in series.get(name, {}).items():
+            label_text = ",".join(f'{key}="{_label_value(val)}"' for key, val in labels)
+            lines.append(f"{metric}{{{label_text}}} {value}")
+
+    # Write then rename so scrapers never see a partial file
+    path = Path(path)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_text("\n".join(lines) + "\n")
+    tmp_path.replace(path)
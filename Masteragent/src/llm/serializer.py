@@ -0,0 +1,74 @@
+import json
+import logging
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any, Dict
+
+from .tokens import estimate_tokens
+
+# Short forms for the keys that repeat on every entity, column and relationship
+SHORT_KEYS: Dict[str, str] = {
+    "attributes": "attrs",
+    "description": "desc",
+    "definition": "def",
+    "relationships": "rels",
+    "source_entity": "from",
+    "target_entity": "to",
+    "relation_type": "rel",
+    "cardinality": "card",
+    "confidence": "conf",
+    "columns": "cols",
+    "nullable": "null",
+    "primary_key": "pk",
+    "foreign_key": "fk",
+    "business_rules": "rules",
+    "raw_analysis": "analysis"
+}
+
+
+@dataclass
+class RenderedPrompt:
+    text: str
+    tokens: int
+
+
+def compact(value: Any) -> Any:
+    """Canonical prompt form: short keys, sorted mappings, no empty fields
+
+    A key keeps its long form when its short form is also a key of the same
+    mapping (``raw_analysis`` next to ``analysis``), so nothing is overwritten.
+    """
+    if hasattr(value, "to_dict"):
+        value = value.to_dict()
+    if isinstance(value, Mapping):
+        result = {}
+        for key in sorted(value, key=str):
+            item = compact(value[key])
+            if item in (None, "", [], {}):
+                continue
+            short = SHORT_KEYS.get(key, key)
+            if short != key and (short in value or short in result):
+                short = key
+            result[short] = item
+        return result
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = sorted(value, key=str) if isinstance(value, (set, frozenset)) else value
+        return [compact(item) for item in items]
+    if isinstance(value, float):
+        return round(value, 3)
+    return value
+
+
+def serialize(value: Any) -> str:
+    """Serialize a value for a prompt; strings are passed through unchanged"""
+    if isinstance(value, str):
+        return value
+    return json.dumps(compact(value), separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def render_prompt(template: str, label: str = "prompt", **fields: Any) -> RenderedPrompt:
+    """Fill a prompt template with serialized fields and report its token estimate"""
+    text = template.format(**{name: serialize(value) for name, value in fields.items()})
+    tokens = estimate_tokens(text)
+    logging.info(f"Rendered {label} prompt: {len(text)} chars, ~{tokens} tokens")
+    return RenderedPrompt(text=text, tokens=tokens)
@@ -0,0 +1,12 @@
+import math
+
+# Gemini tokenizes English prose at roughly four characters per token; this
+# is only used for budgeting, so a cheap estimate beats a network round-trip.
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of model tokens in a piece of text"""
+    if not text:
+        return 0
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
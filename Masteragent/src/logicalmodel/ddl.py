@@ -0,0 +1,314 @@
+"""DDL export of a LogicalModelGenerator model.
+
+Statements are produced one at a time and written straight to the sink,
+so exporting a 20k-table model holds one statement in memory, plus the
+foreign key plan (a few names per relationship):
+
+    with open("model.sql", "w") as f:
+        write_ddl(generator, f, dialect="postgresql")
+
+Tables are created parents first. PostgreSQL and ANSI add foreign keys
+with ``ALTER TABLE`` once every table exists, so cycles need no special
+handling; SQLite cannot add constraints later and declares them inline,
+which it accepts even when the referenced table comes later.
+"""
+import heapq
+import re
+import zlib
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, NamedTuple, Optional, Set, TextIO, Tuple
+
+from src.vertex.names import canonical_name
+
+from .generator import Attribute, Entity, LogicalModelGenerator, RelationType
+
+# Model types that are already plain SQL (VARCHAR(36), NUMERIC(10, 2), ...)
+_SQL_TYPE = re.compile(r"^[A-Za-z][A-Za-z0-9_ ]*(\(\s*\d+\s*(,\s*\d+\s*)?\))?$")
+
+
+@dataclass(frozen=True)
+class Dialect:
+    name: str
+    # Logical type name -> column type; other SQL-looking types pass through
+    types: Dict[str, str]
+    default_type: str
+    inline_foreign_keys: bool = False
+    max_identifier: int = 128
+
+
+DIALECTS: Dict[str, Dialect] = {
+    "postgresql": Dialect(
+        name="postgresql",
+        types={
+            "string": "TEXT", "text": "TEXT", "int": "INTEGER", "integer": "INTEGER",
+            "long": "BIGINT", "number": "NUMERIC", "decimal": "NUMERIC", "float": "DOUBLE PRECISION",
+            "double": "DOUBLE PRECISION", "boolean": "BOOLEAN", "bool": "BOOLEAN", "date": "DATE",
+            "datetime": "TIMESTAMP", "timestamp": "TIMESTAMP", "uuid": "UUID"
+        },
+        default_type="TEXT",
+        max_identifier=63
+    ),
+    "sqlite": Dialect(
+        name="sqlite",
+        types={
+            "string": "TEXT", "text": "TEXT", "int": "INTEGER", "integer": "INTEGER",
+            "long": "INTEGER", "number": "NUMERIC", "decimal": "NUMERIC", "float": "REAL",
+            "double": "REAL", "boolean": "INTEGER", "bool": "INTEGER", "date": "TEXT",
+            "datetime": "TEXT", "timestamp": "TEXT", "uuid": "TEXT"
+        },
+        default_type="TEXT",
+        inline_foreign_keys=True
+    ),
+    "ansi": Dialect(
+        name="ansi",
+        types={
+            "string": "VARCHAR(255)", "text": "VARCHAR(4000)", "int": "INTEGER", "integer": "INTEGER",
+            "long": "BIGINT", "number": "NUMERIC", "decimal": "NUMERIC", "float": "DOUBLE PRECISION",
+            "double": "DOUBLE PRECISION", "boolean": "BOOLEAN", "bool": "BOOLEAN", "date": "DATE",
+            "datetime": "TIMESTAMP", "timestamp": "TIMESTAMP", "uuid": "CHAR(36)"
+        },
+        default_type="VARCHAR(255)"
+    )
+}
+
+
+class ForeignKey(NamedTuple):
+    table: str
+    column: str
+    ref_table: str
+    ref_column: str
+
+
+@dataclass
+class ExportPlan:
+    """What the export needs to know beyond one entity at a time"""
+    order: List[str]
+    foreign_keys: Dict[str, List[ForeignKey]] = field(default_factory=dict)
+    # Referenced columns that are not the whole primary key of their table
+    unique: Dict[str, Set[str]] = field(default_factory=dict)
+    skipped: List[str] = field(default_factory=list)
+
+
+def _primary_key(entity: Entity) -> List[str]:
+    return list(dict.fromkeys(attr.name for attr in entity.attributes if attr.is_primary))
+
+
+def _referenced_column(entity: Entity) -> Optional[str]:
+    """The key column other tables point at: the one named after the entity, or the only one"""
+    primary = _primary_key(entity)
+    key = canonical_name(entity.name)
+    for name in primary:
+        if canonical_name(name) == key:
+            return name
+    if len(primary) == 1:
+        return primary[0]
+    attr = entity.attribute("id")
+    return attr.name if attr else None
+
+
+def _referencing_column(child: Entity, parent: Entity, ref_column: str) -> Optional[str]:
+    """The child column named after the parent (``customer_id`` for
+    ``customers``), or else one named like the parent's key column
+    (``product_id`` for ``financial_product``); foreign-flagged ones first
+    """
+    key = canonical_name(parent.name)
+    for matches in (
+        lambda attr: canonical_name(attr.name) == key,
+        lambda attr: attr.name == ref_column
+    ):
+        candidates = [
+            attr for attr in child.attributes
+            if matches(attr) and not (child is parent and attr.name == ref_column)
+        ]
+        if candidates:
+            candidates.sort(key=lambda attr: not attr.is_foreign)
+            return candidates[0].name
+    return None
+
+
+def _foreign_key(entities: Dict[str, Entity], child_name: str, parent_name: str) -> Optional[ForeignKey]:
+    child, parent = entities.get(child_name), entities.get(parent_name)
+    if child is None or parent is None:
+        return None
+    ref_column = _referenced_column(parent)
+    if ref_column is None:
+        return None
+    column = _referencing_column(child, parent, ref_column)
+    if column is None:
+        return None
+    return ForeignKey(child.name, column, parent.name, ref_column)
+
+
+def _declared_foreign_keys(entities: Dict[str, Entity], skipped: List[str]) -> Iterator[ForeignKey]:
+    """The foreign keys the schema declares on attributes, where both ends are in the model"""
+    for entity in entities.values():
+        for attr in entity.attributes:
+            if attr.references is None:
+                continue
+            ref_table, ref_column = attr.references
+            parent = entities.get(ref_table)
+            if parent is None or parent.attribute(ref_column) is None:
+                skipped.append(f"{entity.name}.{attr.name} -> {ref_table}.{ref_column}: not in the model")
+                continue
+            yield ForeignKey(entity.name, attr.name, ref_table, ref_column)
+
+
+def plan_export(generator: LogicalModelGenerator) -> ExportPlan:
+    """Resolve relationships to foreign key columns and order tables parents first
+
+    Foreign keys declared in the schema are taken as they are. Each model
+    relationship then adds one more: a one-to-many relationship puts the
+    key on its target, a one-to-one on its source; either falls back to
+    the other direction when that side has no matching column.
+    Relationships that resolve to no column, and many-to-many ones (which
+    need a junction entity in the model), are listed in ``skipped``.
+    """
+    entities = generator.entities
+    foreign_keys: Dict[str, List[ForeignKey]] = {}
+    seen: Set[Tuple[str, str]] = set()
+    unique: Dict[str, Set[str]] = {}
+    skipped: List[str] = []
+
+    def add(fk: ForeignKey) -> None:
+        if (fk.table, fk.column) in seen:
+            return
+        seen.add((fk.table, fk.column))
+        foreign_keys.setdefault(fk.table, []).append(fk)
+        if _primary_key(entities[fk.ref_table]) != [fk.ref_column]:
+            unique.setdefault(fk.ref_table, set()).add(fk.ref_column)
+
+    for fk in _declared_foreign_keys(entities, skipped):
+        add(fk)
+    for rel in generator.relationships:
+        if rel.relation_type == RelationType.MANY_TO_MANY:
+            skipped.append(f"{rel.source_entity} -> {rel.target_entity}: many-to-many needs a junction entity")
+            continue
+        if rel.relation_type == RelationType.ONE_TO_MANY:
+            directions = [(rel.target_entity, rel.source_entity), (rel.source_entity, rel.target_entity)]
+        else:
+            directions = [(rel.source_entity, rel.target_entity), (rel.target_entity, rel.source_entity)]
+        fk = next(filter(None, (_foreign_key(entities, child, parent) for child, parent in directions)), None)
+        if fk is None:
+            skipped.append(f"{rel.source_entity} -> {rel.target_entity}: no matching key column")
+            continue
+        add(fk)
+
+    return ExportPlan(_dependency_order(list(entities), foreign_keys), foreign_keys, unique, skipped)
+
+
+def _dependency_order(names: List[str], foreign_keys: Dict[str, List[ForeignKey]]) -> List[str]:
+    """Parents before children, otherwise in model order; tables in cycles keep model order"""
+    position = {name: i for i, name in enumerate(names)}
+    pending = {name: 0 for name in names}
+    children: Dict[str, List[str]] = {}
+    for table, fks in foreign_keys.items():
+        for parent in {fk.ref_table for fk in fks if fk.ref_table != table}:
+            pending[table] += 1
+            children.setdefault(parent, []).append(table)
+
+    ready = [position[name] for name, count in pending.items() if count == 0]
+    heapq.heapify(ready)
+    order = []
+    while ready:
+        name = names[heapq.heappop(ready)]
+        order.append(name)
+        for child in children.get(name, []):
+            pending[child] -= 1
+            if pending[child] == 0:
+                heapq.heappush(ready, position[child])
+    if len(order) < len(names):
+        placed = set(order)
+        order.extend(name for name in names if name not in placed)
+    return order
+
+
+class DDLExporter:
+    """Renders a model as CREATE TABLE and FOREIGN KEY statements for one dialect"""
+
+    def __init__(self, dialect: str = "postgresql"):
+        if dialect not in DIALECTS:
+            raise ValueError(f"Unknown SQL dialect {dialect!r}; expected one of {sorted(DIALECTS)}")
+        self.dialect = DIALECTS[dialect]
+
+    def quote(self, identifier: str) -> str:
+        return '"' + identifier.replace('"', '""') + '"'
+
+    def column_type(self, attr: Attribute) -> str:
+        data_type = (attr.data_type or "").strip()
+        mapped = self.dialect.types.get(data_type.lower())
+        if mapped:
+            return mapped
+        if _SQL_TYPE.match(data_type):
+            return data_type.upper()
+        return self.dialect.default_type
+
+    def constraint_name(self, fk: ForeignKey) -> str:
+        name = f"fk_{fk.table}_{fk.column}"
+        limit = self.dialect.max_identifier
+        if len(name) > limit:
+            # Truncated names stay unique through a hash of the full name
+            suffix = f"_{zlib.crc32(name.encode('utf-8')):08x}"
+            name = name[:limit - len(suffix)] + suffix
+        return name
+
+    def _references(self, fk: ForeignKey) -> str:
+        return (
+            f"FOREIGN KEY ({self.quote(fk.column)}) "
+            f"REFERENCES {self.quote(fk.ref_table)} ({self.quote(fk.ref_column)})"
+        )
+
+    def create_table(self, entity: Entity, plan: ExportPlan) -> Optional[str]:
+        columns: Dict[str, Attribute] = {}
+        for attr in entity.attributes:
+            # First attribute of each name, as Entity.attribute resolves it
+            columns.setdefault(attr.name, attr)
+        if not columns:
+            return None
+        primary = _primary_key(entity)
+
+        lines = []
+        for attr in columns.values():
+            not_null = " NOT NULL" if attr.is_primary or not attr.is_nullable else ""
+            lines.append(f"{self.quote(attr.name)} {self.column_type(attr)}{not_null}")
+        if primary:
+            lines.append(f"PRIMARY KEY ({', '.join(map(self.quote, primary))})")
+        for column in sorted(plan.unique.get(entity.name, ())):
+            lines.append(f"UNIQUE ({self.quote(column)})")
+        if self.dialect.inline_foreign_keys:
+            for fk in plan.foreign_keys.get(entity.name, []):
+                lines.append(f"CONSTRAINT {self.quote(self.constraint_name(fk))} {self._references(fk)}")
+        body = ",\n    ".join(lines)
+        return f"CREATE TABLE {self.quote(entity.name)} (\n    {body}\n);"
+
+    def add_foreign_key(self, fk: ForeignKey) -> str:
+        return (
+            f"ALTER TABLE {self.quote(fk.table)} "
+            f"ADD CONSTRAINT {self.quote(self.constraint_name(fk))} {self._references(fk)};"
+        )
+
+    def iter_ddl(self, generator: LogicalModelGenerator, plan: Optional[ExportPlan] = None) -> Iterator[str]:
+        """Yield the statements (and comments) of the script, one at a time"""
+        plan = plan or plan_export(generator)
+        yield f"-- Logical model DDL ({self.dialect.name}), {len(plan.order)} tables"
+        for note in plan.skipped:
+            yield f"-- Skipped relationship {note}"
+        for name in plan.order:
+            statement = self.create_table(generator.entities[name], plan)
+            yield statement if statement else f"-- Skipped table {name}: no attributes"
+        if not self.dialect.inline_foreign_keys:
+            for name in plan.order:
+                for fk in plan.foreign_keys.get(name, []):
+                    yield self.add_foreign_key(fk)
+
+    def write(self, generator: LogicalModelGenerator, sink: TextIO) -> int:
+        """Write the script to ``sink``; returns the number of statements"""
+        count = 0
+        for statement in self.iter_ddl(generator):
+            sink.write(statement)
+            sink.write("\n\n" if not statement.startswith("--") else "\n")
+            count += not statement.startswith("--")
+        return count
+
+
+def write_ddl(generator: LogicalModelGenerator, sink: TextIO, dialect: str = "postgresql") -> int:
+    return DDLExporter(dialect).write(generator, sink)
@@ -1,182 +1,596 @@
-# src/logical_model/generator.py
-from typing import Dict, List, Any
-from dataclasses import dataclass
-from enum import Enum
-
-class RelationType(Enum):
-    ONE_TO_ONE = "1:1"
-    ONE_TO_MANY = "1:N"
-    MANY_TO_MANY = "M:N"
-
-@dataclass
-class Attribute:
-    name: str
-    data_type: str
-    is_primary: bool = False
-    is_foreign: bool = False
-    is_nullable: bool = True
-    description: str = ""
-
-@dataclass
-class Entity:
-    name: str
-    attributes: List[Attribute]
-    description: str = ""
-
-@dataclass
-class Relationship:
-    source_entity: str
-    target_entity: str
-    relation_type: RelationType
-    description: str = ""
-
-class LogicalModelGenerator:
-    def __init__(self):
-        self.entities: Dict[str, Entity] = {}
-        self.relationships: List[Relationship] = []
-
-    def analyze_datapedia(self, datapedia_data: Dict) -> None:
-        """Extract entities and relationships from datapedia"""
-        for entity_name, entity_data in datapedia_data.get("entities", {}).items():
-            attributes = []
-            
-            # Process attributes
-            for attr_name, attr_data in entity_data.get("attributes", {}).items():
-                attributes.append(
-                    Attribute(
-                        name=attr_name,
-                        data_type=attr_data.get("type", "string"),
-                        is_primary=attr_name.endswith("_id"),
-                        description=attr_data.get("description", "")
-                    )
-                )
-            
-            # Create entity
-            self.entities[entity_name] = Entity(
-                name=entity_name,
-                attributes=attributes,
-                description=entity_data.get("definition", "")
-            )
-            
-            # Process relationships
-            for rel in entity_data.get("relationships", []):
-                self.relationships.append(
-                    Relationship(
-                        source_entity=entity_name,
-                        target_entity=rel["target"],
-                        relation_type=RelationType.ONE_TO_MANY if rel["type"] == "has_many" else RelationType.ONE_TO_ONE,
-                        description=rel.get("description", "")
-                    )
-                )
-
-    def analyze_conceptual_model(self, conceptual_model: Dict) -> None:
-        """Enhance logical model with conceptual model information"""
-        for concept_name, concept_data in conceptual_model.get("business_concepts", {}).items():
-            # Update existing entities or create new ones
-            if concept_name in self.entities:
-                entity = self.entities[concept_name]
-                entity.description = f"{entity.description}\nBusiness Concept: {concept_data['description']}"
-            else:
-                attributes = [
-                    Attribute(
-                        name=attr,
-                        data_type="string",
-                        description="From conceptual model"
-                    )
-                    for attr in concept_data.get("attributes", [])
-                ]
-                self.entities[concept_name] = Entity(
-                    name=concept_name,
-                    attributes=attributes,
-                    description=concept_data.get("description", "")
-                )
-
-    def analyze_existing_schema(self, schema: Dict) -> None:
-        """Incorporate existing schema details"""
-        for table_name, table_data in schema.get("tables", {}).items():
-            attributes = []
-            
-            # Process columns
-            for column in table_data.get("columns", []):
-                attributes.append(
-                    Attribute(
-                        name=column["name"],
-                        data_type=column["type"],
-                        is_primary=column.get("primary_key", False),
-                        is_foreign="foreign_key" in column,
-                        is_nullable=column.get("nullable", True)
-                    )
-                )
-            
-            # Update existing entities or create new ones
-            if table_name in self.entities:
-                entity = self.entities[table_name]
-                self._merge_attributes(entity, attributes)
-            else:
-                self.entities[table_name] = Entity(
-                    name=table_name,
-                    attributes=attributes
-                )
-
-    def _merge_attributes(self, entity: Entity, new_attributes: List[Attribute]) -> None:
-        """Merge attributes while preserving existing information"""
-        existing_names = {attr.name for attr in entity.attributes}
-        
-        for new_attr in new_attributes:
-            if new_attr.name not in existing_names:
-                entity.attributes.append(new_attr)
-            else:
-                # Update existing attribute with additional information
-                for existing_attr in entity.attributes:
-                    if existing_attr.name == new_attr.name:
-                        existing_attr.data_type = new_attr.data_type
-                        existing_attr.is_primary = existing_attr.is_primary or new_attr.is_primary
-                        existing_attr.is_foreign = existing_attr.is_foreign or new_attr.is_foreign
-                        existing_attr.is_nullable = existing_attr.is_nullable and new_attr.is_nullable
-
-    def generate_logical_model(self) -> Dict[str, Any]:
-        """Generate the final logical model"""
-        return {
-            "entities": {
-                name: {
-                    "description": entity.description,
-                    "attributes": [
-                        {
-                            "name": attr.name,
-                            "type": attr.data_type,
-                            "is_primary": attr.is_primary,
-                            "is_foreign": attr.is_foreign,
-                            "is_nullable": attr.is_nullable,
-                            "description": attr.description
-                        }
-                        for attr in entity.attributes
-                    ]
-                }
-                for name, entity in self.entities.items()
-            },
-            "relationships": [
-                {
-                    "source": rel.source_entity,
-                    "target": rel.target_entity,
-                    "type": rel.relation_type.value,
-                    "description": rel.description
-                }
-                for rel in self.relationships
-            ]
-        }
-
-# Example usage
-def create_logical_model(
-    datapedia_data: Dict,
-    conceptual_model: Dict,
-    existing_schema: Dict
-) -> Dict[str, Any]:
-    generator = LogicalModelGenerator()
-    
-    # Process each input source
-    generator.analyze_datapedia(datapedia_data)
-    generator.analyze_conceptual_model(conceptual_model)
-    generator.analyze_existing_schema(existing_schema)
-    
-    # Generate final model
+# src/logical_model/generator.py
+import itertools
+import os
+import sys
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+from dataclasses import dataclass, field
+from enum import Enum, IntFlag
+from src.vertex.columnar import ColumnarTables
+
+class RelationType(Enum):
+    ONE_TO_ONE = "1:1"
+    ONE_TO_MANY = "1:N"
+    MANY_TO_MANY = "M:N"
+
+
+class AttributeFlag(IntFlag):
+    PRIMARY = 1
+    FOREIGN = 2
+    NULLABLE = 4
+
+
+# Plain ints for the hot paths; IntFlag operators run in Python
+_PRIMARY, _FOREIGN, _NULLABLE = (int(flag) for flag in AttributeFlag)
+
+# Descriptions up to this long are boilerplate ("From conceptual model")
+# repeated across attributes, so they are interned like names and types
+_INTERN_MAX = 64
+
+
+def _intern(value: str) -> str:
+    return sys.intern(value) if type(value) is str and len(value) <= _INTERN_MAX else value
+
+
+class Attribute:
+    """One column of an entity.
+
+    Models reach millions of attributes, so instances are slotted, names,
+    types and short descriptions are interned, and the three flags share
+    one small int (``AttributeFlag`` bits) behind boolean properties.
+    ``references`` is the (table, column) a schema foreign key declares.
+    """
+    __slots__ = ("name", "data_type", "description", "flags", "references")
+
+    def __init__(
+        self,
+        name: str,
+        data_type: str,
+        is_primary: bool = False,
+        is_foreign: bool = False,
+        is_nullable: bool = True,
+        description: str = "",
+        references: Optional[Tuple[str, str]] = None
+    ):
+        self.name = _intern(name)
+        self.data_type = _intern(data_type)
+        self.description = _intern(description)
+        self.references = (_intern(references[0]), _intern(references[1])) if references else None
+        self.flags = (
+            (_PRIMARY if is_primary else 0)
+            | (_FOREIGN if is_foreign else 0)
+            | (_NULLABLE if is_nullable else 0)
+        )
+
+    def _set_flag(self, flag: int, value: bool) -> None:
+        self.flags = self.flags | flag if value else self.flags & ~flag
+
+    @property
+    def is_primary(self) -> bool:
+        return bool(self.flags & _PRIMARY)
+
+    @is_primary.setter
+    def is_primary(self, value: bool) -> None:
+        self._set_flag(_PRIMARY, value)
+
+    @property
+    def is_foreign(self) -> bool:
+        return bool(self.flags & _FOREIGN)
+
+    @is_foreign.setter
+    def is_foreign(self, value: bool) -> None:
+        self._set_flag(_FOREIGN, value)
+
+    @property
+    def is_nullable(self) -> bool:
+        return bool(self.flags & _NULLABLE)
+
+    @is_nullable.setter
+    def is_nullable(self, value: bool) -> None:
+        self._set_flag(_NULLABLE, value)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Attribute):
+            return NotImplemented
+        return (self.name, self.data_type, self.flags, self.description, self.references) == (
+            other.name, other.data_type, other.flags, other.description, other.references
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"Attribute(name={self.name!r}, data_type={self.data_type!r}, is_primary={self.is_primary}, "
+            f"is_foreign={self.is_foreign}, is_nullable={self.is_nullable}, description={self.description!r}, "
+            f"references={self.references!r})"
+        )
+
+@dataclass(slots=True)
+class Entity:
+    """A logical entity; change its attributes through ``add_attribute`` and
+    ``set_attributes``, which keep the name index in step with the list
+    """
+    name: str
+    attributes: List[Attribute]
+    description: str = ""
+    # First attribute of each name
+    _by_name: Dict[str, Attribute] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.name = _intern(self.name)
+        self._reindex()
+
+    def _reindex(self) -> None:
+        self._by_name = {}
+        for attr in self.attributes:
+            self._by_name.setdefault(attr.name, attr)
+
+    def attribute(self, name: str) -> Optional[Attribute]:
+        """The attribute called ``name``, in O(1)"""
+        return self._by_name.get(name)
+
+    def add_attribute(self, attr: Attribute) -> None:
+        self.attributes.append(attr)
+        self._by_name.setdefault(attr.name, attr)
+
+    def set_attributes(self, attributes: List[Attribute]) -> None:
+        self.attributes = attributes
+        self._reindex()
+
+@dataclass(slots=True)
+class Relationship:
+    source_entity: str
+    target_entity: str
+    relation_type: RelationType
+    description: str = ""
+
+    def __post_init__(self):
+        self.source_entity = _intern(self.source_entity)
+        self.target_entity = _intern(self.target_entity)
+        self.description = _intern(self.description)
+
+class LogicalModelGenerator:
+    """Builds the logical model from datapedia, conceptual and schema sources.
+
+    ``generate_logical_model`` serializes the model once and afterwards
+    only re-serializes the entities marked dirty since the last call. The
+    analyze_* methods and the delta API (``upsert_entity``,
+    ``upsert_table``, ``remove_table``, ``add_relationship``,
+    ``remove_relationship``) mark what they touch; code that edits an
+    ``Entity`` in place, or adds or removes one in ``entities`` directly,
+    must call ``mark_dirty`` itself. Relationships only change through
+    ``add_relationship`` and the removal methods, which find them through
+    an index of their endpoints.
+    """
+
+    def __init__(self):
+        self._entities: Dict[str, Entity] = {}
+        # By id, in the order added; ids are never reused
+        self._relationships: Dict[int, Relationship] = {}
+        self._relationship_ids = itertools.count()
+        # Entity name -> ids of the relationships it is an endpoint of
+        self._by_endpoint: Dict[str, Set[int]] = {}
+        # Serialized model ({"entities": ..., "relationships": {id: ...}}),
+        # patched in place and never handed out; None until first generated
+        self._model: Optional[Dict[str, Any]] = None
+        # The last result, returned again until something changes
+        self._result: Optional[Dict[str, Any]] = None
+        # Entities changed since the last generate, in the order first marked
+        self._dirty: Dict[str, None] = {}
+
+    @property
+    def entities(self) -> Dict[str, Entity]:
+        return self._entities
+
+    @entities.setter
+    def entities(self, entities: Dict[str, Entity]) -> None:
+        self._entities = entities
+        self._model = self._result = None
+
+    @property
+    def relationships(self) -> List[Relationship]:
+        """A new list of the relationships, in the order added"""
+        return list(self._relationships.values())
+
+    @relationships.setter
+    def relationships(self, relationships: Iterable[Relationship]) -> None:
+        self._relationships = {}
+        self._by_endpoint = {}
+        self._model = self._result = None
+        for relationship in relationships:
+            self.add_relationship(relationship)
+
+    def mark_dirty(self, entity_name: str) -> None:
+        """Re-serialize ``entity_name`` on the next generate (or drop it there, if gone)"""
+        self._dirty[entity_name] = None
+        self._result = None
+
+    def analyze_datapedia(self, datapedia_data: Dict) -> None:
+        """Extract entities and relationships from datapedia"""
+        for entity_name, entity_data in datapedia_data.get("entities", {}).items():
+            self._add_datapedia_entity(entity_name, entity_data)
+
+    def _add_datapedia_entity(self, entity_name: str, entity_data: Dict) -> None:
+        attributes = []
+        
+        # Process attributes
+        for attr_name, attr_data in entity_data.get("attributes", {}).items():
+            attributes.append(
+                Attribute(
+                    name=attr_name,
+                    data_type=attr_data.get("type", "string"),
+                    is_primary=attr_name.endswith("_id"),
+                    description=attr_data.get("description", "")
+                )
+            )
+        
+        # Create entity
+        self.entities[entity_name] = Entity(
+            name=entity_name,
+            attributes=attributes,
+            description=entity_data.get("definition", "")
+        )
+        self.mark_dirty(entity_name)
+        
+        # Process relationships
+        for rel in entity_data.get("relationships", []):
+            self.add_relationship(
+                Relationship(
+                    source_entity=entity_name,
+                    target_entity=rel["target"],
+                    relation_type=RelationType.ONE_TO_MANY if rel["type"] == "has_many" else RelationType.ONE_TO_ONE,
+                    description=rel.get("description", "")
+                )
+            )
+
+    def analyze_conceptual_model(self, conceptual_model: Dict) -> None:
+        """Enhance logical model with conceptual model information"""
+        for concept_name, concept_data in conceptual_model.get("business_concepts", {}).items():
+            # Update existing entities or create new ones
+            if concept_name in self.entities:
+                entity = self.entities[concept_name]
+                entity.description = f"{entity.description}\nBusiness Concept: {concept_data['description']}"
+            else:
+                attributes = [
+                    Attribute(
+                        name=attr,
+                        data_type="string",
+                        description="From conceptual model"
+                    )
+                    for attr in concept_data.get("attributes", [])
+                ]
+                self.entities[concept_name] = Entity(
+                    name=concept_name,
+                    attributes=attributes,
+                    description=concept_data.get("description", "")
+                )
+            self.mark_dirty(concept_name)
+
+    def analyze_existing_schema(self, schema: Dict) -> None:
+        """Incorporate existing schema details"""
+        tables = schema.get("tables", {})
+        # Columnar catalogs are read straight from their arrays, without
+        # building a dict per column
+        columnar = isinstance(tables, ColumnarTables)
+        for table_name in tables:
+            # Process columns
+            if columnar:
+                attributes = [
+                    Attribute(
+                        name=name,
+                        data_type=data_type,
+                        is_primary=bool(primary),
+                        is_foreign=fk_table is not None,
+                        is_nullable=nullable is not False,
+                        references=(fk_table, fk_column or name) if fk_table is not None else None
+                    )
+                    for name, data_type, primary, nullable, fk_table, fk_column in tables.iter_columns(table_name)
+                ]
+            else:
+                attributes = self._table_attributes(tables[table_name])
+            self._add_table(table_name, attributes)
+
+    @staticmethod
+    def _table_attributes(table: Dict) -> List[Attribute]:
+        return [
+            Attribute(
+                name=column["name"],
+                data_type=column["type"],
+                is_primary=column.get("primary_key", False),
+                is_foreign="foreign_key" in column,
+                is_nullable=column.get("nullable", True),
+                references=(
+                    (column["foreign_key"]["table"], column["foreign_key"].get("column", column["name"]))
+                    if "foreign_key" in column else None
+                )
+            )
+            for column in table.get("columns", [])
+        ]
+
+    def _add_table(self, table_name: str, attributes: List[Attribute]) -> None:
+        # Update existing entities or create new ones
+        if table_name in self.entities:
+            entity = self.entities[table_name]
+            self._merge_attributes(entity, attributes)
+        else:
+            self.entities[table_name] = Entity(
+                name=table_name,
+                attributes=attributes
+            )
+        self.mark_dirty(table_name)
+
+    def _merge_attributes(self, entity: Entity, new_attributes: List[Attribute]) -> None:
+        """Merge attributes while preserving existing information
+
+        Each incoming attribute is one index lookup, so merging is linear in
+        the incoming columns whatever the width of the entity.
+        """
+        for new_attr in new_attributes:
+            existing_attr = entity.attribute(new_attr.name)
+            if existing_attr is None:
+                entity.add_attribute(new_attr)
+            else:
+                # Update existing attribute with additional information
+                existing_attr.data_type = new_attr.data_type
+                existing_attr.is_primary = existing_attr.is_primary or new_attr.is_primary
+                existing_attr.is_foreign = existing_attr.is_foreign or new_attr.is_foreign
+                existing_attr.is_nullable = existing_attr.is_nullable and new_attr.is_nullable
+                existing_attr.references = new_attr.references or existing_attr.references
+
+    # Delta API
+
+    def upsert_entity(self, entity_name: str, entity_data: Dict) -> None:
+        """Replace ``entity_name`` with a datapedia entry, including its outgoing relationships"""
+        self._remove_relationships(
+            rel_id for rel_id in self._by_endpoint.get(entity_name, ())
+            if self._relationships[rel_id].source_entity == entity_name
+        )
+        self._drop_entity(entity_name)
+        self._add_datapedia_entity(entity_name, entity_data)
+
+    def upsert_table(self, table_name: str, table: Dict, replace: bool = False) -> None:
+        """Merge a schema table (``{"columns": [...]}``) as analyze_existing_schema does
+
+        Merging only adds and updates attributes, so a column dropped from
+        the table stays in the model. With ``replace`` the entity first
+        loses every attribute the table no longer has a column for.
+        """
+        attributes = self._table_attributes(table)
+        entity = self.entities.get(table_name)
+        if replace and entity is not None:
+            columns = {attr.name for attr in attributes}
+            entity.set_attributes([attr for attr in entity.attributes if attr.name in columns])
+        self._add_table(table_name, attributes)
+
+    def remove_table(self, table_name: str) -> None:
+        """Drop the entity of ``table_name`` and every relationship touching it"""
+        self._remove_relationships(self._by_endpoint.get(table_name, ()))
+        self._drop_entity(table_name)
+
+    def add_relationship(self, relationship: Relationship) -> None:
+        rel_id = next(self._relationship_ids)
+        self._relationships[rel_id] = relationship
+        self._by_endpoint.setdefault(relationship.source_entity, set()).add(rel_id)
+        self._by_endpoint.setdefault(relationship.target_entity, set()).add(rel_id)
+        if self._model is not None:
+            self._model["relationships"][rel_id] = self._serialize_relationship(relationship)
+        self._result = None
+
+    def remove_relationship(self, source_entity: str, target_entity: str) -> int:
+        """Remove the relationships from ``source_entity`` to ``target_entity``; returns how many"""
+        return self._remove_relationships(
+            rel_id for rel_id in self._by_endpoint.get(source_entity, ())
+            if self._relationships[rel_id].source_entity == source_entity
+            and self._relationships[rel_id].target_entity == target_entity
+        )
+
+    def _remove_relationships(self, rel_ids: Iterable[int]) -> int:
+        """Remove relationships by id; costs O(1) each, whatever the model size"""
+        # Collected first: removal edits the endpoint sets being iterated
+        rel_ids = list(rel_ids)
+        for rel_id in rel_ids:
+            rel = self._relationships.pop(rel_id)
+            for name in (rel.source_entity, rel.target_entity):
+                ids = self._by_endpoint.get(name)
+                if ids is not None:
+                    ids.discard(rel_id)
+                    if not ids:
+                        del self._by_endpoint[name]
+            if self._model is not None:
+                del self._model["relationships"][rel_id]
+        if rel_ids:
+            self._result = None
+        return len(rel_ids)
+
+    def _drop_entity(self, entity_name: str) -> None:
+        # Dropped from the serialized model at once, so a re-added entity
+        # moves to the end there as it does in self.entities
+        self.entities.pop(entity_name, None)
+        self._dirty.pop(entity_name, None)
+        if self._model is not None:
+            self._model["entities"].pop(entity_name, None)
+        self._result = None
+
+    # Serialization
+
+    @staticmethod
+    def _serialize_entity(entity: Entity) -> Dict[str, Any]:
+        return {
+            "description": entity.description,
+            "attributes": [
+                {
+                    "name": attr.name,
+                    "type": attr.data_type,
+                    "is_primary": attr.is_primary,
+                    "is_foreign": attr.is_foreign,
+                    "is_nullable": attr.is_nullable,
+                    "description": attr.description
+                }
+                for attr in entity.attributes
+            ]
+        }
+
+    @staticmethod
+    def _serialize_relationship(rel: Relationship) -> Dict[str, Any]:
+        return {
+            "source": rel.source_entity,
+            "target": rel.target_entity,
+            "type": rel.relation_type.value,
+            "description": rel.description
+        }
+
+    def generate_logical_model(self) -> Dict[str, Any]:
+        """Generate the final logical model
+
+        The first call serializes everything; later calls re-serialize only
+        the dirty entities. Results are shared rather than copied: until the
+        model changes, every call returns the same result, and the first
+        call after a change builds a new one (one reference per entity and
+        relationship) without touching those handed out before. Treat
+        results as read-only.
+        """
+        if self._result is not None:
+            return self._result
+        model = self._model
+        if model is None:
+            model = {
+                "entities": {
+                    name: self._serialize_entity(entity)
+                    for name, entity in self.entities.items()
+                },
+                "relationships": {
+                    rel_id: self._serialize_relationship(rel)
+                    for rel_id, rel in self._relationships.items()
+                }
+            }
+        else:
+            for name in self._dirty:
+                entity = self.entities.get(name)
+                if entity is None:
+                    model["entities"].pop(name, None)
+                else:
+                    model["entities"][name] = self._serialize_entity(entity)
+        self._dirty.clear()
+        self._model = model
+        self._result = {
+            "entities": dict(model["entities"]),
+            "relationships": list(model["relationships"].values())
+        }
+        return self._result
+
+# Catalog sources of a parallel build, set once in each worker process
+_partition_sources: Optional[Tuple[Mapping, Mapping, Mapping]] = None
+
+# (first-appearance rank, name, serialized entity) and (rank, serialized relationship)
+RankedEntity = Tuple[Tuple[int, int], str, Dict[str, Any]]
+RankedRelationship = Tuple[Tuple[int, int], Dict[str, Any]]
+
+
+def _init_partition_worker(entities: Mapping, concepts: Mapping, tables: Mapping) -> None:
+    global _partition_sources
+    _partition_sources = (entities, concepts, tables)
+
+
+def _build_partition(
+    partition: Tuple[List[Tuple[int, str]], ...]
+) -> Tuple[List[RankedEntity], List[RankedRelationship]]:
+    """Run the sequential build over one partition of entity names.
+
+    Every source's entries for a name are in the same partition, so the
+    usual datapedia -> conceptual -> schema precedence applies unchanged;
+    ranks record where each entity and relationship sits in the sequential
+    output.
+    """
+    entities, concepts, tables = _partition_sources
+    datapedia_part, conceptual_part, schema_part = partition
+    generator = LogicalModelGenerator()
+    generator.analyze_datapedia({"entities": {name: entities[name] for _, name in datapedia_part}})
+    generator.analyze_conceptual_model({"business_concepts": {name: concepts[name] for _, name in conceptual_part}})
+    generator.analyze_existing_schema({"tables": {name: tables[name] for _, name in schema_part}})
+    model = generator.generate_logical_model()
+
+    ranks: Dict[str, Tuple[int, int]] = {}
+    for source_rank, part in enumerate(partition):
+        for position, name in part:
+            ranks.setdefault(name, (source_rank, position))
+    # Relationships come from datapedia entities, appended in entity order
+    datapedia_positions = {name: position for position, name in datapedia_part}
+    return (
+        [(ranks[name], name, entity) for name, entity in model["entities"].items()],
+        [
+            ((datapedia_positions[rel["source"]], index), rel)
+            for index, rel in enumerate(model["relationships"])
+        ]
+    )
+
+
+def _partition_names(sources: Tuple[Mapping, Mapping, Mapping], partitions: int) -> List[Tuple[List[Tuple[int, str]], ...]]:
+    """Split the names of every source by a stable hash of the name"""
+    parts = [([], [], []) for _ in range(partitions)]
+    for source_rank, source in enumerate(sources):
+        for position, name in enumerate(source):
+            parts[zlib.crc32(name.encode("utf-8")) % partitions][source_rank].append((position, name))
+    return [part for part in parts if any(part)]
+
+
+def create_logical_model_parallel(
+    datapedia_data: Dict,
+    conceptual_model: Dict,
+    existing_schema: Dict,
+    workers: Optional[int] = None,
+    partitions: Optional[int] = None
+) -> Dict[str, Any]:
+    """Build the logical model in a process pool; the result equals the sequential build.
+
+    Entity names are hash-partitioned across all three sources, each
+    partition is built and serialized in a worker, and the partial models
+    are reduced in sequential order by the ranks the workers attach. The
+    sources are handed to each worker once (inherited where processes are
+    forked, pickled where they are spawned).
+    """
+    workers = workers or os.cpu_count() or 1
+    sources = (
+        datapedia_data.get("entities", {}),
+        conceptual_model.get("business_concepts", {}),
+        existing_schema.get("tables", {})
+    )
+    # Several partitions per worker even out uneven entity sizes
+    parts = _partition_names(sources, partitions or workers * 4)
+
+    entities: List[RankedEntity] = []
+    relationships: List[RankedRelationship] = []
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_partition_worker,
+        initargs=sources
+    ) as pool:
+        for part_entities, part_relationships in pool.map(_build_partition, parts):
+            entities.extend(part_entities)
+            relationships.extend(part_relationships)
+
+    entities.sort(key=lambda entry: entry[0])
+    relationships.sort(key=lambda entry: entry[0])
+    return {
+        "entities": {name: entity for _, name, entity in entities},
+        "relationships": [rel for _, rel in relationships]
+    }
+
+
+# Example usage
+def create_logical_model(
+    datapedia_data: Dict,
+    conceptual_model: Dict,
+    existing_schema: Dict,
+    workers: Optional[int] = None
+) -> Dict[str, Any]:
+    if workers and workers > 1:
+        return create_logical_model_parallel(datapedia_data, conceptual_model, existing_schema, workers)
+
+    generator = LogicalModelGenerator()
+    
+    # Process each input source
+    generator.analyze_datapedia(datapedia_data)
+    generator.analyze_conceptual_model(conceptual_model)
+    generator.analyze_existing_schema(existing_schema)
+    
+    # Generate final model
     return generator.generate_logical_model()
\ No newline at end of file
@@ -0,0 +1,86 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+from src.llm.metrics import tagged
+
+
+@dataclass
+class Stage:
+    """A named pipeline step and the stages whose results it consumes"""
+    name: str
+    func: Callable[..., Awaitable[Any]]
+    inputs: Tuple[str, ...] = field(default_factory=tuple)
+
+
+class StageDAG:
+    """Runs stages as soon as their inputs are ready.
+
+    Each stage is called with the results of its ``inputs`` as keyword
+    arguments, so stages that do not depend on each other run concurrently.
+    """
+
+    def __init__(self, stages: List[Stage]):
+        self.stages: Dict[str, Stage] = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Duplicate stage: {stage.name}")
+            self.stages[stage.name] = stage
+        self.order = self._topological_order()
+
+    def _topological_order(self) -> List[str]:
+        order = []
+        state: Dict[str, str] = {}
+
+        def visit(name: str, path: Tuple[str, ...]) -> None:
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                raise ValueError(f"Cycle in stage graph: {' -> '.join(path + (name,))}")
+            if name not in self.stages:
+                raise ValueError(f"Unknown stage input: {name}")
+            state[name] = "visiting"
+            for dependency in self.stages[name].inputs:
+                visit(dependency, path + (name,))
+            state[name] = "done"
+            order.append(name)
+
+        for name in self.stages:
+            visit(name, ())
+        return order
+
+    async def run(self) -> Tuple[Dict[str, Any], Dict[str, float]]:
+        """Execute the graph and return (results, seconds per stage)"""
+        results: Dict[str, Any] = {}
+        timings: Dict[str, float] = {}
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def run_stage(stage: Stage) -> Any:
+            if stage.inputs:
+                await asyncio.gather(*(tasks[name] for name in stage.inputs))
+            kwargs = {name: results[name] for name in stage.inputs}
+            start = time.perf_counter()
+            # LLM calls made by the stage are accounted to it
+            with tagged(stage=stage.name):
+                result = await stage.func(**kwargs)
+            timings[stage.name] = time.perf_counter() - start
+            results[stage.name] = result
+            logging.info(f"Stage {stage.name} complete in {timings[stage.name]:.2f}s")
+            return result
+
+        # Tasks are created in topological order so every dependency exists
+        # before a dependent stage starts waiting on it.
+        for name in self.order:
+            tasks[name] = asyncio.ensure_future(run_stage(self.stages[name]))
+
+        try:
+            await asyncio.gather(*tasks.values())
+        except Exception:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+
+        return results, timings
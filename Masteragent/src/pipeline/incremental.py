@@ -0,0 +1,284 @@
+import hashlib
+import json
+import logging
+import re
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from src.types.suggestions import (
+    EntitySuggestion,
+    RelationSuggestion,
+    merge_relation_lists,
+    merge_suggestion_lists
+)
+from src.vertex.names import NameIndex, canonical_name, conceptual_entities
+
+_WORDS = re.compile(r"[A-Za-z][A-Za-z0-9_]*")
+
+
+def fingerprint(value: Any) -> str:
+    """Stable hash of a JSON-compatible value"""
+    payload = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def catalog_names(vertex_data: Dict[str, Any]) -> NameIndex:
+    return NameIndex.from_catalog(
+        vertex_data.get("datapedia", {}),
+        vertex_data.get("conceptual_model", {}),
+        vertex_data.get("schema", {})
+    )
+
+
+def _key(names: NameIndex, name: str) -> str:
+    # Relationship endpoints may name entities the catalog does not define
+    return names.resolve(name) or name
+
+
+def catalog_entities(
+    vertex_data: Dict[str, Any],
+    names: Optional[NameIndex] = None
+) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """Entity key -> {section: {name: definition}} across all catalog sections
+
+    Entries are grouped by their NameIndex key, so a schema table
+    ``customers`` belongs to the datapedia entity ``Customer``.
+    """
+    names = names or catalog_names(vertex_data)
+    entities: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    sections = (
+        ("datapedia", vertex_data.get("datapedia", {}).get("entities", {}).items()),
+        ("conceptual_model", conceptual_entities(vertex_data.get("conceptual_model", {}))),
+        ("schema", vertex_data.get("schema", {}).get("tables", {}).items())
+    )
+    for section, definitions in sections:
+        for name, definition in definitions:
+            entities.setdefault(_key(names, name), {}).setdefault(section, {})[name] = definition
+    return entities
+
+
+def catalog_edges(
+    vertex_data: Dict[str, Any],
+    names: Optional[NameIndex] = None
+) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+    """Yield (source key, target key, record) for every relationship in the catalog"""
+    names = names or catalog_names(vertex_data)
+    datapedia = vertex_data.get("datapedia", {})
+    for name, entity in datapedia.get("entities", {}).items():
+        for rel in entity.get("relationships", []):
+            if isinstance(rel, dict) and rel.get("target"):
+                yield _key(names, name), _key(names, rel["target"]), rel
+    for section in (datapedia, vertex_data.get("conceptual_model", {})):
+        for rel in section.get("relationships", []):
+            if rel.get("source") and rel.get("target"):
+                yield _key(names, rel["source"]), _key(names, rel["target"]), rel
+    for table_name, table in vertex_data.get("schema", {}).get("tables", {}).items():
+        for column in table.get("columns", []):
+            if "foreign_key" in column:
+                record = {"table": table_name, "column": column["name"], "foreign_key": column["foreign_key"]}
+                yield _key(names, table_name), _key(names, column["foreign_key"]["table"]), record
+
+
+def scope_catalog(
+    vertex_data: Dict[str, Any],
+    keys: Iterable[str],
+    names: Optional[NameIndex] = None
+) -> Dict[str, Any]:
+    """Copy of the catalog restricted to the entities filed under ``keys``
+    (every spelling of them) and the relationships touching them
+    """
+    keys = set(keys)
+    names = names or catalog_names(vertex_data)
+    scoped: Dict[str, Any] = {}
+    for section_name, section in vertex_data.items():
+        if not isinstance(section, Mapping):
+            scoped[section_name] = section
+            continue
+        scoped_section = dict(section)
+        for key in ("entities", "business_concepts", "tables"):
+            if key in section:
+                scoped_section[key] = {
+                    name: data for name, data in section[key].items() if _key(names, name) in keys
+                }
+        if "relationships" in section:
+            scoped_section["relationships"] = [
+                rel for rel in section["relationships"]
+                if _key(names, rel.get("source") or "") in keys or _key(names, rel.get("target") or "") in keys
+            ]
+        scoped[section_name] = scoped_section
+    return scoped
+
+
+@dataclass
+class IncrementalPlan:
+    """What has to be re-sent to the LLM for the current catalog"""
+    fingerprints: Dict[str, str]
+    edges: Dict[str, List[str]]
+    changed: Set[str] = field(default_factory=set)
+    removed: Set[str] = field(default_factory=set)
+    scope: Set[str] = field(default_factory=set)
+    full: bool = False
+    names: NameIndex = field(default_factory=NameIndex, repr=False)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "full": self.full,
+            "changed": sorted(self.changed),
+            "removed": sorted(self.removed),
+            "reanalyzed": len(self.scope),
+            "total_entities": len(self.fingerprints)
+        }
+
+
+class IncrementalState:
+    """Per-entity fingerprints and suggestion outputs from the previous run.
+
+    Each stored suggestion records the catalog entities it was derived from.
+    When those entities (or their graph neighbors) change, the suggestion is
+    dropped and regenerated; everything else is reused as-is.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.state = self._load()
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            if self.path.exists():
+                with open(self.path, "r") as f:
+                    return json.load(f)
+        except Exception as e:
+            logging.error(f"Error loading incremental state from {self.path}: {e}")
+        return {"salt": None, "fingerprints": {}, "edges": {}, "entities": [], "relations": []}
+
+    def save(self) -> None:
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self.state, f)
+        tmp_path.replace(self.path)
+
+    def plan(
+        self,
+        vertex_data: Dict[str, Any],
+        salt: str = "",
+        names: Optional[NameIndex] = None
+    ) -> IncrementalPlan:
+        """Entities to re-analyze, keyed (like the scope) by NameIndex key"""
+        names = names or catalog_names(vertex_data)
+        fingerprints = {
+            key: fingerprint(definitions)
+            for key, definitions in catalog_entities(vertex_data, names).items()
+        }
+        edges: Dict[str, Set[str]] = {}
+        edge_fingerprints: Dict[str, Set[str]] = {}
+        for source, target, record in catalog_edges(vertex_data, names):
+            edges.setdefault(source, set()).add(target)
+            edges.setdefault(target, set()).add(source)
+            edge_hash = fingerprint([source, target, record])
+            edge_fingerprints.setdefault(source, set()).add(edge_hash)
+            edge_fingerprints.setdefault(target, set()).add(edge_hash)
+        # An entity also changes when a relationship touching it changes
+        for name, hashes in edge_fingerprints.items():
+            if name in fingerprints:
+                fingerprints[name] = fingerprint([fingerprints[name], sorted(hashes)])
+
+        plan = IncrementalPlan(
+            fingerprints=fingerprints,
+            edges={name: sorted(neighbors) for name, neighbors in edges.items()},
+            names=names
+        )
+        previous = self.state["fingerprints"]
+        if self.state.get("salt") != salt or not previous:
+            plan.full = True
+            plan.changed = set(fingerprints)
+            plan.removed = set(previous) - set(fingerprints)
+            plan.scope = set(fingerprints)
+            return plan
+
+        plan.changed = {
+            name for name, value in fingerprints.items() if previous.get(name) != value
+        }
+        plan.removed = set(previous) - set(fingerprints)
+        scope = set(plan.changed)
+        for name in plan.changed | plan.removed:
+            scope.update(plan.edges.get(name, []))
+            scope.update(self.state["edges"].get(name, []))
+        plan.scope = scope & set(fingerprints)
+        return plan
+
+    def commit(
+        self,
+        plan: IncrementalPlan,
+        entity_suggestions: List[EntitySuggestion],
+        relation_suggestions: List[RelationSuggestion],
+        salt: str = "",
+        failed: Iterable[str] = ()
+    ) -> None:
+        """Replace the outputs derived from the plan's scope and persist.
+
+        Each suggestion is tied to the catalog entities it was derived from,
+        resolved through the plan's NameIndex: the entity its name refers
+        to or, for a suggestion the model invented, the entities named in
+        its attributes and description (a relation between invented
+        entities inherits theirs). It is dropped and regenerated when any
+        of them is re-analyzed; one tied to nothing lives until the next
+        full run.
+
+        ``failed`` names entities whose prompts failed: their fingerprints
+        are not stored, so the next run treats them as changed and analyzes
+        them again instead of reusing this run's empty result.
+        """
+        names = plan.names
+        stale = plan.scope | plan.removed
+
+        def is_current(record: Dict[str, Any]) -> bool:
+            # Records from the earlier run-wide scope layout carry "scope"
+            return not plan.full and "scope" not in record and not stale.intersection(record["derived_from"])
+
+        def resolve(*mentions: str) -> Set[str]:
+            return {key for mention in mentions if (key := names.resolve(mention)) in plan.fingerprints}
+
+        entities = [r for r in self.state["entities"] if is_current(r)]
+        for suggestion in entity_suggestions:
+            derived_from = resolve(suggestion.name) or resolve(
+                *suggestion.attributes, *_WORDS.findall(suggestion.description)
+            )
+            entities.append({"derived_from": sorted(derived_from), "suggestion": suggestion.to_dict()})
+
+        # Entities the model invented, by canonical name, for their relations
+        invented: Dict[str, Set[str]] = {}
+        for record in entities:
+            name = record["suggestion"]["name"]
+            if not resolve(name):
+                invented.setdefault(canonical_name(name), set()).update(record["derived_from"])
+
+        relations = [r for r in self.state["relations"] if is_current(r)]
+        for suggestion in relation_suggestions:
+            derived_from: Set[str] = set()
+            for name in (suggestion.source_entity, suggestion.target_entity):
+                derived_from |= resolve(name) or invented.get(canonical_name(name), set())
+            relations.append({"derived_from": sorted(derived_from), "suggestion": suggestion.to_dict()})
+
+        failed = {_key(names, name) for name in failed} & plan.scope
+        self.state = {
+            "salt": salt,
+            "fingerprints": {
+                name: value for name, value in plan.fingerprints.items() if name not in failed
+            },
+            "edges": plan.edges,
+            "entities": entities,
+            "relations": relations
+        }
+        self.save()
+
+    def entity_suggestions(self) -> List[EntitySuggestion]:
+        return merge_suggestion_lists([
+            [EntitySuggestion.from_dict(record["suggestion"]) for record in self.state["entities"]]
+        ])
+
+    def relation_suggestions(self) -> List[RelationSuggestion]:
+        return merge_relation_lists([
+            [RelationSuggestion.from_dict(record["suggestion"]) for record in self.state["relations"]]
+        ])
@@ -0,0 +1,70 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.llm.serializer import serialize
+from src.llm.tokens import estimate_tokens
+
+
+def relationship_endpoints(relationship: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+    """Return (source, target) entity names for any relationship record shape"""
+    source = relationship.get("source_entity", relationship.get("source"))
+    target = relationship.get("target_entity", relationship.get("target"))
+    return source, target
+
+
+def shard_entities(
+    entities: Dict[str, Any],
+    token_budget: int,
+    measure: Callable[[str, Any], int] = lambda name, data: estimate_tokens(serialize({name: data}))
+) -> List[Dict[str, Any]]:
+    """Greedily pack entities, in order, into shards of at most ``token_budget`` tokens.
+
+    An entity that is larger than the budget on its own gets a shard of its
+    own rather than being split.
+    """
+    shards: List[Dict[str, Any]] = []
+    current: Dict[str, Any] = {}
+    used = 0
+    for name, data in entities.items():
+        size = measure(name, data)
+        if current and used + size > token_budget:
+            shards.append(current)
+            current, used = {}, 0
+        current[name] = data
+        used += size
+    if current:
+        shards.append(current)
+    return shards
+
+
+def shard_datapedia_result(datapedia_result: Dict[str, Any], token_budget: int) -> List[Dict[str, Any]]:
+    """Split a DatapediaAgent result into per-shard results of bounded size.
+
+    Relationships are bucketed by endpoint in a single pass and counted
+    against the budget of the entities they touch, so each shard carries
+    its own relationships without exceeding the budget.
+    """
+    entities = datapedia_result.get("entities", {})
+    touching: Dict[str, List[Dict[str, Any]]] = {}
+    for rel in datapedia_result.get("relationships", []):
+        for endpoint in set(relationship_endpoints(rel)):
+            if endpoint in entities:
+                touching.setdefault(endpoint, []).append(rel)
+
+    shards = shard_entities(
+        entities,
+        token_budget,
+        measure=lambda name, data: estimate_tokens(serialize([{name: data}, touching.get(name, [])]))
+    )
+
+    results = []
+    for shard in shards:
+        relationships = {}
+        for name in shard:
+            for rel in touching.get(name, []):
+                relationships[id(rel)] = rel
+        results.append({
+            "entities": shard,
+            "relationships": list(relationships.values()),
+            "analysis": datapedia_result.get("analysis", "")
+        })
+    return results
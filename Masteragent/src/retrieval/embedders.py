@@ -0,0 +1,88 @@
+import functools
+import re
+import zlib
+from abc import ABC, abstractmethod
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from src.vertex.names import canonical_name
+
+_WORDS = re.compile(r"[A-Za-z][a-z]*|[A-Z]+(?![a-z])|[0-9]+")
+
+
+class Embedder(ABC):
+    """Turns texts into L2-normalized float32 row vectors"""
+    dim: int
+    # Stored with persisted indexes; vectors from different embedders never mix
+    name: str
+
+    @abstractmethod
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        pass
+
+
+class HashingEmbedder(Embedder):
+    """Deterministic, offline embedder using the hashing trick.
+
+    Each text contributes its words (canonicalized, so ``Accounts`` and
+    ``account_id`` share a feature) and the character trigrams of those
+    words, hashed into ``dim`` signed buckets. Similar names and vocabularies
+    land close together without any model or network access.
+    """
+
+    def __init__(self, dim: int = 256, trigram_weight: float = 0.5):
+        self.dim = dim
+        self.trigram_weight = trigram_weight
+        self.name = f"hashing-{dim}-{trigram_weight}"
+        # Per instance: a cache on the method would be shared by every
+        # embedder and keep each of them alive through its keys
+        self._features = functools.lru_cache(maxsize=65536)(self._word_features)
+
+    def _word_features(self, word: str) -> Tuple[Tuple[int, float], ...]:
+        word = canonical_name(word)
+        features = [(word, 1.0)]
+        padded = f"^{word}$"
+        features += [(padded[i:i + 3], self.trigram_weight) for i in range(len(padded) - 2)]
+        buckets = []
+        for feature, weight in features:
+            digest = zlib.crc32(feature.encode("utf-8"))
+            sign = 1.0 if (digest >> 31) & 1 else -1.0
+            buckets.append((digest % self.dim, sign * weight))
+        return tuple(buckets)
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        rows: List[int] = []
+        columns: List[int] = []
+        values: List[float] = []
+        for row, text in enumerate(texts):
+            for word in _WORDS.findall(text):
+                for column, value in self._features(word):
+                    rows.append(row)
+                    columns.append(column)
+                    values.append(value)
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        np.add.at(vectors, (np.array(rows, dtype=np.intp), np.array(columns, dtype=np.intp)), np.array(values, dtype=np.float32))
+        return _normalize(vectors)
+
+
+class GeminiEmbedder(Embedder):
+    """Embeddings from the Gemini embedding model through langchain"""
+
+    def __init__(self, model: str = "models/embedding-001", dim: int = 768):
+        from langchain_google_genai import GoogleGenerativeAIEmbeddings
+
+        self.dim = dim
+        self.name = f"gemini-{model}"
+        self.embeddings = GoogleGenerativeAIEmbeddings(model=model)
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return _normalize(np.asarray(self.embeddings.embed_documents(list(texts)), dtype=np.float32))
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
@@ -0,0 +1,97 @@
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from src.pipeline.incremental import fingerprint
+from src.pipeline.sharding import relationship_endpoints
+from src.vertex.names import attribute_names
+
+from .embedders import Embedder, HashingEmbedder
+from .index import VectorIndex
+
+
+def entity_documents(entities: Dict[str, Any]) -> List[tuple]:
+    """(document key, entity name, text) for each entity and each of its attributes
+
+    Attributes are indexed on their own so a query about ``iban`` finds the
+    account entity even when its description never mentions it.
+    """
+    documents = []
+    for name, entity in entities.items():
+        entity = entity if isinstance(entity, dict) else {}
+        attributes = attribute_names(entity.get("attributes", []))
+        aliases = [alias for names in (entity.get("aliases") or {}).values() for alias in names]
+        documents.append((name, name, " ".join([name, *aliases, str(entity.get("description", "")), *attributes])))
+        for attribute in attributes:
+            documents.append((f"{name}.{attribute}", name, f"{name} {attribute}"))
+    return documents
+
+
+class EntityRetriever:
+    """Vector index over the entities of a DatapediaAgent result.
+
+    ``index_path`` keeps the index across runs; it is rebuilt when the
+    entities or the embedder change.
+    """
+
+    def __init__(
+        self,
+        entities: Dict[str, Any],
+        embedder: Optional[Embedder] = None,
+        index_path: Optional[Path] = None,
+        backend: str = "auto"
+    ):
+        self.entities = entities
+        self.embedder = embedder or HashingEmbedder()
+        documents = entity_documents(entities)
+        self._owners = {key: owner for key, owner, _ in documents}
+        meta = {"embedder": self.embedder.name, "entities": fingerprint(entities)}
+
+        index = VectorIndex.load(index_path) if index_path else None
+        if index is None or index.meta != meta:
+            index = VectorIndex(
+                [key for key, _, _ in documents],
+                self.embedder.embed([text for _, _, text in documents]),
+                backend=backend,
+                meta=meta
+            )
+            if index_path:
+                try:
+                    index.save(index_path)
+                except OSError as e:
+                    logging.error(f"Error saving vector index to {index_path}: {e}")
+            logging.info(f"Built vector index over {len(entities)} entities ({len(documents)} documents)")
+        self.index = index
+
+    def top_k(self, queries: Sequence[str], k: int) -> List[str]:
+        """Up to ``k`` entities per query, best matches first, without duplicates"""
+        if not queries:
+            return []
+        # Attribute documents share their entity, so over-fetch before collapsing
+        hits = self.index.search(self.embedder.embed(queries), k * 4)
+        names: Dict[str, float] = {}
+        for query_hits in hits:
+            found: Dict[str, float] = {}
+            for key, score in query_hits:
+                owner = self._owners[key]
+                if owner not in found:
+                    found[owner] = score
+                    if len(found) == k:
+                        break
+            for owner, score in found.items():
+                names[owner] = max(score, names.get(owner, score))
+        return sorted(names, key=lambda name: -names[name])
+
+    def restrict(self, datapedia_result: Dict[str, Any], names: Iterable[str]) -> Dict[str, Any]:
+        """The result limited to ``names`` and the relationships touching them"""
+        names = set(names)
+        return {
+            **datapedia_result,
+            "entities": {
+                name: entity for name, entity in datapedia_result.get("entities", {}).items() if name in names
+            },
+            "relationships": [
+                rel for rel in datapedia_result.get("relationships", [])
+                if names.intersection(relationship_endpoints(rel))
+            ]
+        }
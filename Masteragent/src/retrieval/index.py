@@ -0,0 +1,140 @@
+import json
+import logging
+import math
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Below this many vectors a brute-force scan beats probing IVF lists
+IVF_MIN_VECTORS = 20000
+
+
+class VectorIndex:
+    """Cosine-similarity search over L2-normalized vectors.
+
+    ``backend`` is ``"brute"`` (one matrix product per query batch),
+    ``"ivf"`` (k-means lists, only ``nprobe`` of which are scanned per
+    query) or ``"auto"``, which picks IVF for large indexes. Keys are
+    arbitrary strings returned with the scores.
+    """
+
+    def __init__(
+        self,
+        keys: Sequence[str],
+        vectors: np.ndarray,
+        backend: str = "auto",
+        nlist: Optional[int] = None,
+        nprobe: int = 8,
+        meta: Optional[Dict[str, Any]] = None
+    ):
+        if len(keys) != len(vectors):
+            raise ValueError(f"{len(keys)} keys for {len(vectors)} vectors")
+        self.keys = list(keys)
+        self.vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        self.nprobe = nprobe
+        self.meta = meta or {}
+        if backend == "auto":
+            backend = "ivf" if len(self.keys) >= IVF_MIN_VECTORS else "brute"
+        self.backend = backend
+        self.centroids: Optional[np.ndarray] = None
+        self.lists: List[np.ndarray] = []
+        if backend == "ivf" and len(self.keys):
+            self._train(nlist or max(1, int(math.sqrt(len(self.keys)))))
+
+    def _train(self, nlist: int, iterations: int = 10) -> None:
+        """Spherical k-means; seeded, so the same vectors give the same lists"""
+        vectors = self.vectors
+        nlist = min(nlist, len(vectors))
+        rng = np.random.default_rng(0)
+        centroids = vectors[rng.choice(len(vectors), nlist, replace=False)].copy()
+        for _ in range(iterations):
+            assignment = np.argmax(vectors @ centroids.T, axis=1)
+            order = np.argsort(assignment, kind="stable")
+            counts = np.bincount(assignment, minlength=nlist)
+            starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+            filled = counts > 0
+            sums = np.add.reduceat(vectors[order], starts[filled], axis=0)
+            centroids[filled] = sums
+            norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            centroids /= norms
+        assignment = np.argmax(vectors @ centroids.T, axis=1)
+        self.centroids = centroids
+        self._set_lists(assignment)
+
+    def _set_lists(self, assignment: np.ndarray) -> None:
+        self.assignment = assignment.astype(np.int32)
+        order = np.argsort(assignment, kind="stable")
+        bounds = np.cumsum(np.bincount(assignment, minlength=len(self.centroids)))
+        self.lists = np.split(order, bounds[:-1])
+
+    def search(self, queries: np.ndarray, k: int) -> List[List[Tuple[str, float]]]:
+        """Top ``k`` (key, score) pairs for each query row, best first"""
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        if not self.keys or k <= 0:
+            return [[] for _ in queries]
+        if self.backend == "ivf":
+            return [self._search_ivf(query, k) for query in queries]
+        scores = queries @ self.vectors.T
+        return [self._top(row, np.arange(len(self.keys)), k) for row in scores]
+
+    def _search_ivf(self, query: np.ndarray, k: int) -> List[Tuple[str, float]]:
+        probes = np.argsort(-(self.centroids @ query))[:self.nprobe]
+        candidates = np.concatenate([self.lists[probe] for probe in probes])
+        if not len(candidates):
+            return []
+        return self._top(self.vectors[candidates] @ query, candidates, k)
+
+    def _top(self, scores: np.ndarray, positions: np.ndarray, k: int) -> List[Tuple[str, float]]:
+        if k < len(scores):
+            best = np.argpartition(-scores, k - 1)[:k]
+        else:
+            best = np.arange(len(scores))
+        # Ties break on position so results are stable across runs
+        best = best[np.lexsort((positions[best], -scores[best]))]
+        return [(self.keys[positions[i]], float(scores[i])) for i in best]
+
+    def save(self, path: Path) -> None:
+        """Write the index to ``path`` (.npz) atomically"""
+        path = Path(path)
+        arrays = {
+            "keys": np.array(self.keys, dtype=str),
+            "vectors": self.vectors,
+            "meta": np.array(json.dumps({**self.meta, "backend": self.backend, "nprobe": self.nprobe}))
+        }
+        if self.centroids is not None:
+            arrays["centroids"] = self.centroids
+            arrays["assignment"] = self.assignment
+        # A unique name per writer, so concurrent saves never share a file
+        with tempfile.NamedTemporaryFile(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp", delete=False) as f:
+            tmp_path = Path(f.name)
+            try:
+                np.savez(f, **arrays)
+            except BaseException:
+                f.close()
+                tmp_path.unlink()
+                raise
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["VectorIndex"]:
+        """Read an index written by ``save``; None if missing or unreadable"""
+        path = Path(path)
+        if not path.exists():
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                meta = json.loads(str(data["meta"]))
+                backend, nprobe = meta.pop("backend"), meta.pop("nprobe")
+                # Trained lists are restored below rather than retrained
+                index = cls(data["keys"].tolist(), data["vectors"], backend="brute", nprobe=nprobe, meta=meta)
+                if backend == "ivf":
+                    index.backend = "ivf"
+                    index.centroids = data["centroids"]
+                    index._set_lists(data["assignment"])
+                return index
+        except Exception as e:
+            logging.error(f"Error loading vector index from {path}: {e}")
+            return None
@@ -0,0 +1,60 @@
+import asyncio
+import threading
+
+from src.vertex.async_api import AsyncCatalogAPI, run_blocking
+from src.vertex.vertex_client import VertexDBClient
+
+CATALOG = {
+    "datapedia": {"entities": {"Customer": {"attributes": []}}, "relationships": []},
+    "conceptual_model": {"entities": {}, "relationships": []},
+    "schema": {"tables": {"accounts": {"columns": []}}}
+}
+
+
+class SlowCatalog(AsyncCatalogAPI):
+    """A blocking backend that answers only once the test lets it"""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.threads = set()
+
+    def get_entity(self, entity_name):
+        self.threads.add(threading.current_thread().name)
+        assert self.release.wait(timeout=5)
+        return {"source": "slow", "data": entity_name}
+
+
+def test_blocking_backend_does_not_stall_the_event_loop():
+    catalog = SlowCatalog()
+
+    async def run():
+        lookup = asyncio.ensure_future(catalog.aget_entity("Customer"))
+        # The loop keeps running other work while the lookup blocks a worker
+        for _ in range(3):
+            await asyncio.sleep(0.01)
+        assert not lookup.done()
+        catalog.release.set()
+        return await lookup
+
+    assert asyncio.run(run()) == {"source": "slow", "data": "Customer"}
+    assert all(name.startswith("vertex-io") for name in catalog.threads)
+
+
+def test_offloaded_reads_see_the_pinned_snapshot(tmp_path):
+    client = VertexDBClient(tmp_path / "missing.json")
+    client.set_data(CATALOG)
+
+    async def run():
+        with client.pinned():
+            client.set_data({**CATALOG, "datapedia": {"entities": {}, "relationships": []}})
+            return await client.aget_entities(["Customer", "accounts", "Missing"])
+
+    found = asyncio.run(run())
+    assert found["Customer"]["source"] == "datapedia"
+    assert found["accounts"]["source"] == "schema"
+    assert found["Missing"] is None
+    assert asyncio.run(client.aget_entity("Customer")) is None
+
+
+def test_run_blocking_passes_arguments():
+    assert asyncio.run(run_blocking(divmod, 7, 2)) == (3, 1)
@@ -0,0 +1,55 @@
+import asyncio
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src.agents.BIANAgent import BIANAgent
+from src.agents.MapperAgent import MapperAgent
+from src.llm.backends import LLMBackend, RecordingBackend, ReplayBackend
+from src.llm.cache import render_messages
+from src.llm.serializer import render_prompt
+
+
+class EchoBackend(LLMBackend):
+    model = "stub"
+
+    def __init__(self, answers):
+        self.answers = answers
+
+    async def ainvoke(self, messages, **kwargs):
+        return AIMessage(content=self.answers[messages[0].content])
+
+
+def _bian_prompt(entities) -> str:
+    return render_prompt(BIANAgent(llm=object()).bian_prompt, data={"entities": entities}).text
+
+
+def _relation_prompt(entities) -> str:
+    mapper = MapperAgent(vertex_db_client=None, llm=object())
+    return render_prompt(mapper.relation_prompt, entities=entities, datapedia={}, bian="", accord="").text
+
+
+def test_template_key_skips_role_prefix():
+    messages = [HumanMessage(content=_bian_prompt({"Customer": {}}))]
+    assert ReplayBackend._template(render_messages(messages)) == "Map this data model to BIAN service domains:"
+
+
+def test_template_replay_keeps_stages_apart(tmp_path):
+    recorded = {
+        _bian_prompt({"Customer": {}}): "bian answer",
+        _relation_prompt(["Customer"]): "relation answer"
+    }
+    path = tmp_path / "exchanges.jsonl"
+    recorder = RecordingBackend(EchoBackend(recorded), path)
+    for prompt in recorded:
+        asyncio.run(recorder.ainvoke([HumanMessage(content=prompt)]))
+
+    replay = ReplayBackend(path, on_miss="template")
+
+    async def ask(prompt: str) -> str:
+        return (await replay.ainvoke([HumanMessage(content=prompt)])).content
+
+    # Different catalogs than recorded, so only the template can match
+    for _ in range(3):
+        assert asyncio.run(ask(_relation_prompt(["Account", "Branch"]))) == "relation answer"
+        assert asyncio.run(ask(_bian_prompt({"Account": {}}))) == "bian answer"
+    assert replay.stats == {"hits": 0, "template_hits": 6, "misses": 0}
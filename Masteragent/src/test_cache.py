@@ -0,0 +1,71 @@
+import sqlite3
+import time
+
+from src.llm import cache as cache_module
+from src.llm.cache import LLMResponseCache
+
+
+def test_round_trip_through_memory_and_disk(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    cache = LLMResponseCache(path=path)
+    key = cache.make_key("model", 0.1, "prompt")
+    assert key == LLMResponseCache.make_key("model", 0.1, "prompt") != cache.make_key("model", 0.2, "prompt")
+    assert cache.get(key) is None
+    cache.put(key, "answer")
+    assert cache.get(key) == "answer"
+
+    # A second process finds the entry on disk
+    other = LLMResponseCache(path=path)
+    assert other.get(key) == "answer"
+    assert other.get(key) == "answer"
+    stats = other.get_stats()
+    assert (stats["disk_hits"], stats["memory_hits"], stats["misses"]) == (1, 1, 0)
+
+
+def test_memory_entries_expire(tmp_path, monkeypatch):
+    cache = LLMResponseCache(max_age=60)
+    cache.put("key", "answer")
+    assert cache.get("key") == "answer"
+    now = time.time()
+    monkeypatch.setattr(cache_module.time, "time", lambda: now + 61)
+    assert cache.get("key") is None
+    assert cache.get_stats()["memory_entries"] == 0
+
+
+def test_disk_hits_batch_their_access_times(tmp_path, monkeypatch):
+    path = tmp_path / "cache.sqlite3"
+    cache = LLMResponseCache(path=path, memory_items=0)
+    cache.put("key", "answer")
+    written = sqlite3.connect(path).execute("SELECT accessed_at FROM responses").fetchone()[0]
+    for _ in range(cache_module._TOUCH_BATCH - 1):
+        assert cache.get("key") == "answer"
+    assert sqlite3.connect(path).execute("SELECT accessed_at FROM responses").fetchone()[0] == written
+    cache.flush()
+    assert sqlite3.connect(path).execute("SELECT accessed_at FROM responses").fetchone()[0] > written
+
+
+def test_database_errors_do_not_escape(tmp_path, caplog):
+    path = tmp_path / "cache.sqlite3"
+    cache = LLMResponseCache(path=path, memory_items=0)
+    cache.put("key", "answer")
+    cache._conn.execute("PRAGMA busy_timeout = 0")
+
+    # Another process holds the write lock: reads still hit, writes are dropped
+    other = sqlite3.connect(path, isolation_level=None)
+    other.execute("BEGIN EXCLUSIVE")
+    try:
+        for _ in range(cache_module._TOUCH_BATCH + 1):
+            assert cache.get("key") == "answer"
+        cache.put("other", "answer")
+    finally:
+        other.execute("ROLLBACK")
+    assert "database is locked" in caplog.text
+
+    # A read that fails is a miss
+    cache._conn.close()
+    assert cache.get("key") is None
+    assert cache.get_stats()["misses"] == 1
+
+
+def test_default_path_is_outside_the_package():
+    assert cache_module.Path(cache_module.__file__).parent not in cache_module.DEFAULT_CACHE_PATH.parents
@@ -0,0 +1,98 @@
+import json
+from pathlib import Path
+
+from src.test_loader import materialize
+from src.vertex.columnar import ColumnarTables, columnar_catalog
+from src.vertex.loader import open_catalog
+
+VERTEX_JSON = Path(__file__).parent / "vertex" / "vertex.json"
+CATALOG = json.loads(VERTEX_JSON.read_text())
+
+TABLES = {
+    "plain": {
+        "columns": [
+            {"name": "id", "type": "varchar(36)", "primary_key": True, "nullable": False},
+            {"nullable": True, "name": "parent_id", "foreign_key": {"column": "id", "table": "plain"}},
+            {"name": "code", "type": "char(1)", "valid_values": ["A", "B"], "description": "extra keys"}
+        ],
+        "description": "table keys after the columns",
+        "indexes": [{"columns": ["code"]}]
+    },
+    # Malformed columns are stored as they are
+    "malformed": {
+        "columns": [
+            "just a string",
+            {"type": "int"},
+            {"name": "flag", "primary_key": "yes"},
+            {"name": "fk", "foreign_key": {"table": "plain", "on_delete": "cascade"}},
+            {"name": 7},
+            None
+        ]
+    },
+    # Tables without a column list are raw as a whole
+    "raw_string": "not a table",
+    "raw_columns": {"columns": {"id": "int"}},
+    "raw_missing": {"description": "no columns"},
+    "empty": {"columns": []}
+}
+
+
+def test_dict_parity():
+    tables = ColumnarTables.from_tables(TABLES)
+    assert list(tables) == list(TABLES)
+    assert len(tables) == len(TABLES)
+    for name, table in TABLES.items():
+        assert name in tables
+        assert tables[name] == table
+        # Key order is kept, for tables and columns alike
+        assert json.dumps(tables[name]) == json.dumps(table)
+    assert "missing" not in tables
+
+
+def test_vertex_json_parity():
+    tables = ColumnarTables.from_tables(open_catalog(VERTEX_JSON)["schema"]["tables"])
+    assert materialize(tables) == CATALOG["schema"]["tables"]
+    assert tables.column_count == sum(len(table["columns"]) for table in CATALOG["schema"]["tables"].values())
+    assert tables.nbytes > 0
+
+
+def test_reads_are_copies():
+    tables = ColumnarTables.from_tables(TABLES)
+    tables["plain"]["columns"][2]["valid_values"].append("C")
+    tables["malformed"]["columns"].append("more")
+    tables["raw_columns"]["columns"]["name"] = "text"
+    assert tables["plain"] == TABLES["plain"]
+    assert tables["malformed"] == TABLES["malformed"]
+    assert tables["raw_columns"] == TABLES["raw_columns"]
+
+
+def test_iter_columns():
+    tables = ColumnarTables.from_tables(TABLES)
+    assert list(tables.iter_columns("plain")) == [
+        ("id", "varchar(36)", True, False, None, None),
+        ("parent_id", None, None, True, "plain", "id"),
+        ("code", "char(1)", None, None, None, None)
+    ]
+    assert list(tables.iter_columns("malformed")) == [
+        (None, None, None, None, None, None),
+        (None, "int", None, None, None, None),
+        ("flag", None, "yes", None, None, None),
+        ("fk", None, None, None, "plain", None),
+        (7, None, None, None, None, None),
+        (None, None, None, None, None, None)
+    ]
+    assert list(tables.iter_columns("raw_string")) == []
+    assert list(tables.iter_columns("raw_columns")) == []
+    assert list(tables.iter_columns("empty")) == []
+
+
+def test_foreign_keys():
+    tables = ColumnarTables.from_tables(TABLES)
+    assert list(tables.foreign_keys()) == [("plain", "plain", "parent_id"), ("malformed", "plain", "fk")]
+
+
+def test_columnar_catalog_keeps_other_sections():
+    catalog = columnar_catalog(CATALOG)
+    assert isinstance(catalog["schema"]["tables"], ColumnarTables)
+    assert materialize(catalog) == CATALOG
+    assert columnar_catalog({"datapedia": {}}) == {"datapedia": {}}
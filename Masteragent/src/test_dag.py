@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+
+from src.pipeline.dag import Stage, StageDAG
+
+
+def test_independent_stages_run_concurrently():
+    events = []
+    async def main():
+        started = asyncio.Event()
+        running = set()
+
+        async def source():
+            return 1
+
+        def branch(name):
+            async def run(source):
+                running.add(name)
+                if len(running) == 2:
+                    started.set()
+                # Only finishes if the other branch started meanwhile
+                await asyncio.wait_for(started.wait(), timeout=1)
+                events.append(name)
+                return source + 1
+            return run
+
+        async def join(bian, accord):
+            return bian + accord
+
+        dag = StageDAG([
+            Stage("join", join, ("bian", "accord")),
+            Stage("bian", branch("bian"), ("source",)),
+            Stage("accord", branch("accord"), ("source",)),
+            Stage("source", source)
+        ])
+        assert dag.order.index("source") < dag.order.index("bian") < dag.order.index("join")
+        return await dag.run()
+
+    results, timings = asyncio.run(main())
+    assert results == {"source": 1, "bian": 2, "accord": 2, "join": 4}
+    assert set(timings) == set(results)
+    assert sorted(events) == ["accord", "bian"]
+
+
+def test_invalid_graphs_are_rejected():
+    async def noop(**kwargs):
+        return None
+
+    with pytest.raises(ValueError, match="Duplicate stage"):
+        StageDAG([Stage("a", noop), Stage("a", noop)])
+    with pytest.raises(ValueError, match="Unknown stage input"):
+        StageDAG([Stage("a", noop, ("missing",))])
+    with pytest.raises(ValueError, match="Cycle in stage graph: a -> b -> a"):
+        StageDAG([Stage("a", noop, ("b",)), Stage("b", noop, ("a",))])
+
+
+def test_failure_cancels_the_other_stages():
+    cancelled = []
+
+    async def fail():
+        raise RuntimeError("stage failed")
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append("slow")
+            raise
+
+    async def dependent(fail):
+        return fail
+
+    with pytest.raises(RuntimeError, match="stage failed"):
+        asyncio.run(StageDAG([Stage("fail", fail), Stage("slow", slow), Stage("dependent", dependent, ("fail",))]).run())
+    assert cancelled == ["slow"]
@@ -0,0 +1,41 @@
+import copy
+
+from src.agents.DatapediaAgent import DatapediaAgent
+
+CATALOG = {
+    "datapedia": {
+        "entities": {"Customer": {"definition": "A bank customer", "attributes": ["customer_id", "name"]}},
+        "relationships": [{"source": "customers", "target": "Accounts", "type": "owns"}]
+    },
+    "conceptual_model": {
+        "entities": {"Account": {"description": "A deposit account", "attributes": {"account_id": {}}}},
+        "relationships": [{"source": "Account", "target": "customer", "type": "held_by"}]
+    },
+    "schema": {"tables": {
+        "customers": {"columns": [{"name": "customer_id"}, {"name": "email"}]},
+        "accounts": {"columns": [{"name": "account_id"}, {"name": "balance"}]}
+    }}
+}
+
+
+def _prepare(catalog):
+    agent = DatapediaAgent(None, llm=object())
+    return agent._prepare(catalog, None)
+
+
+def test_entities_merge_across_spellings_without_touching_the_catalog():
+    catalog = copy.deepcopy(CATALOG)
+    entities = _prepare(catalog)["entities"]
+
+    assert entities["Customer"]["attributes"] == ["customer_id", "name", "email"]
+    assert entities["Customer"]["aliases"] == {"schema": ["customers"]}
+    assert entities["Account"]["attributes"] == {"account_id": {}, "balance": {"source": "schema"}}
+    assert catalog == CATALOG
+
+
+def test_relationships_are_named_after_merged_entities():
+    relationships = _prepare(copy.deepcopy(CATALOG))["relationships"]
+    assert [(r["source_entity"], r["target_entity"]) for r in relationships] == [
+        ("Customer", "Account"),
+        ("Account", "Customer")
+    ]
@@ -0,0 +1,105 @@
+import io
+import sqlite3
+
+import pytest
+
+from src.logicalmodel.ddl import DDLExporter, plan_export, write_ddl
+from src.logicalmodel.generator import Attribute, LogicalModelGenerator, Relationship, RelationType
+from src.test_generator import CATALOG, build
+
+
+def schema_generator(tables, relationships=()):
+    generator = LogicalModelGenerator()
+    generator.analyze_existing_schema({"tables": tables})
+    for relationship in relationships:
+        generator.add_relationship(relationship)
+    return generator
+
+
+def key(name):
+    return {"name": name, "type": "varchar(36)", "primary_key": True}
+
+
+def test_declared_foreign_keys_are_exported():
+    plan = plan_export(build(CATALOG))
+    (fk,) = plan.foreign_keys["accounts"]
+    assert (fk.column, fk.ref_table, fk.ref_column) == ("customer_id", "customers", "customer_id")
+    assert plan.order.index("customers") < plan.order.index("accounts")
+
+
+@pytest.mark.parametrize("dialect, expected", [
+    ("postgresql", ["TEXT", "DOUBLE PRECISION", "TIMESTAMP", "VARCHAR(36)", "TEXT"]),
+    ("sqlite", ["TEXT", "REAL", "TEXT", "VARCHAR(36)", "TEXT"]),
+    ("ansi", ["VARCHAR(255)", "DOUBLE PRECISION", "TIMESTAMP", "VARCHAR(36)", "VARCHAR(255)"]),
+])
+def test_dialect_column_types(dialect, expected):
+    exporter = DDLExporter(dialect)
+    types = ["string", "Float", "datetime", "varchar(36)", "list<string>"]
+    assert [exporter.column_type(Attribute("a", data_type)) for data_type in types] == expected
+
+
+def test_unknown_dialect_is_rejected():
+    with pytest.raises(ValueError):
+        DDLExporter("oracle")
+
+
+def test_tables_are_ordered_parents_first():
+    generator = schema_generator(
+        {
+            "accounts": {"columns": [key("account_id"), {"name": "customer_id", "type": "varchar(36)"}]},
+            "customers": {"columns": [key("customer_id"), {"name": "branch_id", "type": "varchar(36)"}]},
+            "branches": {"columns": [key("branch_id")]},
+        },
+        [
+            Relationship("customers", "accounts", RelationType.ONE_TO_MANY),
+            Relationship("branches", "customers", RelationType.ONE_TO_MANY),
+        ]
+    )
+    plan = plan_export(generator)
+    assert plan.order == ["branches", "customers", "accounts"]
+    assert not plan.skipped
+
+
+def test_cycles_keep_model_order_and_every_key():
+    generator = schema_generator(
+        {
+            "employees": {"columns": [key("employee_id"), {"name": "department_id", "type": "varchar(36)"}]},
+            "departments": {"columns": [key("department_id"), {"name": "employee_id", "type": "varchar(36)"}]},
+        },
+        [
+            Relationship("departments", "employees", RelationType.ONE_TO_MANY),
+            Relationship("employees", "departments", RelationType.ONE_TO_MANY),
+        ]
+    )
+    plan = plan_export(generator)
+    assert plan.order == ["employees", "departments"]
+    sink = io.StringIO()
+    assert write_ddl(generator, sink) == 4
+    assert sink.getvalue().count("ALTER TABLE") == 2
+
+
+def test_key_named_like_the_parent_key_is_a_fallback():
+    generator = schema_generator(
+        {
+            "financial_product": {"columns": [key("product_id")]},
+            "holdings": {"columns": [key("holding_id"), {"name": "product_id", "type": "varchar(36)"}]},
+        },
+        [Relationship("financial_product", "holdings", RelationType.ONE_TO_MANY)]
+    )
+    (fk,) = plan_export(generator).foreign_keys["holdings"]
+    assert (fk.column, fk.ref_table, fk.ref_column) == ("product_id", "financial_product", "product_id")
+
+
+def test_sqlite_script_executes():
+    sink = io.StringIO()
+    write_ddl(build(CATALOG), sink, dialect="sqlite")
+    connection = sqlite3.connect(":memory:")
+    connection.execute("PRAGMA foreign_keys = ON")
+    connection.executescript(sink.getvalue())
+    tables = {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert {"customers", "accounts"} <= tables
+    assert connection.execute("PRAGMA foreign_key_list(accounts)").fetchone()[2] == "customers"
+    connection.execute("INSERT INTO customers VALUES ('c1', 'P', 'A')")
+    connection.execute("INSERT INTO accounts VALUES ('a1', 'c1', 'SV')")
+    with pytest.raises(sqlite3.IntegrityError):
+        connection.execute("INSERT INTO accounts VALUES ('a2', 'missing', 'SV')")
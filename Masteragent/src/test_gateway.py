@@ -0,0 +1,126 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+
+from langchain_core.messages import HumanMessage
+
+from src.llm.gateway import ConcurrencyLimit, LLMGateway
+from src.llm.metrics import LLMCallRecord, MetricsCollector, collecting, write_prometheus
+
+
+class UsageBackend:
+    """Answers "pong"; reports usage only when ``usage`` is given"""
+    model = "stub"
+
+    def __init__(self, usage=None):
+        self.usage = usage
+
+    def _message(self, content, usage):
+        return SimpleNamespace(content=content, usage_metadata=usage)
+
+    async def ainvoke(self, messages, **kwargs):
+        return self._message("pong", self.usage)
+
+    async def astream(self, messages, **kwargs):
+        # Usage arrives with the last chunk, as Gemini streams report it
+        yield self._message("po", None)
+        yield self._message("ng", self.usage)
+
+
+def _calls(gateway: LLMGateway, stream: bool):
+    collector = MetricsCollector()
+
+    async def run():
+        messages = [HumanMessage(content="ping " * 100)]
+        with collecting(collector):
+            if stream:
+                async for _ in gateway.astream(messages):
+                    pass
+            else:
+                await gateway.ainvoke(messages)
+
+    asyncio.run(run())
+    return collector.records
+
+
+def test_reported_usage_is_recorded():
+    for stream in (False, True):
+        gateway = LLMGateway(UsageBackend({"input_tokens": 101, "output_tokens": 2}), requests_per_minute=6000)
+        [call] = _calls(gateway, stream)
+        assert (call.prompt_tokens, call.completion_tokens, call.tokens_estimated) == (101, 2, False)
+
+
+def test_missing_usage_falls_back_to_estimates():
+    gateway = LLMGateway(UsageBackend(), requests_per_minute=6000)
+    [call] = _calls(gateway, stream=False)
+    assert call.tokens_estimated
+    assert call.prompt_tokens > 0 and call.completion_tokens == 1
+
+
+class SlowBackend:
+    """Tracks how many calls are inside the model at once, across threads"""
+    model = "stub"
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+
+    async def ainvoke(self, messages, **kwargs):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.02)
+        with self.lock:
+            self.active -= 1
+        return SimpleNamespace(content="pong", usage_metadata=None)
+
+
+def test_concurrency_cap_is_shared_by_every_event_loop():
+    backend = SlowBackend()
+    gateway = LLMGateway(backend, max_concurrency=2, requests_per_minute=60000)
+
+    def session():
+        # Each Streamlit session runs its own loop
+        async def run():
+            await asyncio.gather(*(gateway.ainvoke([HumanMessage(content="ping")]) for _ in range(5)))
+        asyncio.run(run())
+
+    threads = [threading.Thread(target=session) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert backend.peak == 2
+    stats = gateway.get_stats()
+    assert (stats["requests"], stats["in_flight"]) == (20, 0)
+
+
+def test_cancelled_waiters_do_not_leak_slots():
+    limit = ConcurrencyLimit(1)
+
+    async def run():
+        await limit.acquire()
+        waiter = asyncio.ensure_future(limit.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        limit.release()
+        await asyncio.gather(waiter, return_exceptions=True)
+        # The slot went back, not to the cancelled waiter
+        await asyncio.wait_for(limit.acquire(), timeout=1)
+        limit.release()
+
+    asyncio.run(run())
+    assert limit.in_use == 0
+
+
+def test_prometheus_export_is_per_run_gauges(tmp_path):
+    collector = MetricsCollector(prompt_price_per_1k=0, completion_price_per_1k=0)
+    collector.record(LLMCallRecord(agent="MapperAgent", stage="entity", model="m", prompt_tokens=10, latency=0.5))
+    path = tmp_path / "llm.prom"
+    write_prometheus(collector, path)
+
+    lines = path.read_text().splitlines()
+    types = [line for line in lines if line.startswith("# TYPE")]
+    assert types and all(line.endswith(" gauge") for line in types)
+    assert 'mapper_llm_prompt_tokens{agent="MapperAgent",stage="entity",model="m",cache="off"} 10.0' in lines
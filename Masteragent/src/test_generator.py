@@ -0,0 +1,180 @@
+import copy
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.benchmarks.memory_bench import run_benchmark
+from src.logicalmodel.generator import (
+    Attribute,
+    AttributeFlag,
+    Entity,
+    LogicalModelGenerator,
+    Relationship,
+    RelationType,
+    create_logical_model,
+    create_logical_model_parallel
+)
+from src.test_loader import materialize
+from src.vertex.loader import open_catalog
+
+CATALOG = materialize(open_catalog(Path(__file__).parent / "data"))
+
+
+def build(catalog):
+    generator = LogicalModelGenerator()
+    generator.analyze_datapedia(catalog["datapedia"])
+    generator.analyze_conceptual_model(catalog["conceptual_model"])
+    generator.analyze_existing_schema(catalog["schema"])
+    return generator
+
+
+def edits(generator):
+    """One of each delta, with results read in between"""
+    catalog = copy.deepcopy(CATALOG)
+    customer = catalog["datapedia"]["entities"]["customer"]
+    customer["definition"] = "Changed definition"
+    customer["attributes"]["loyalty_tier"] = {"type": "string", "description": "New attribute"}
+    generator.upsert_entity("customer", customer)
+    yield
+    table = catalog["schema"]["tables"]["accounts"]
+    table["columns"].append({"name": "closed_on", "type": "date", "nullable": True})
+    generator.upsert_table("accounts", table)
+    generator.upsert_table("branches", {"columns": [{"name": "branch_id", "type": "varchar(36)", "primary_key": True}]})
+    yield
+    generator.add_relationship(Relationship("branches", "accounts", RelationType.ONE_TO_MANY, "Branch accounts"))
+    generator.remove_relationship("customer", "account")
+    yield
+    generator.remove_table("customers")
+    yield
+
+
+def test_incremental_generate_matches_full_rebuild():
+    incremental, rebuilt = build(CATALOG), build(CATALOG)
+    assert incremental.generate_logical_model() == rebuilt.generate_logical_model()
+    for _ in zip(edits(incremental), edits(rebuilt)):
+        patched = incremental.generate_logical_model()
+        # A fresh generator over the edited state serializes everything
+        full = LogicalModelGenerator()
+        full.entities, full.relationships = rebuilt.entities, rebuilt.relationships
+        assert json.dumps(patched) == json.dumps(full.generate_logical_model())
+
+
+def test_results_are_not_patched_by_later_calls():
+    generator = build(CATALOG)
+    first = generator.generate_logical_model()
+    before = json.dumps(first)
+    # Nothing changed, so nothing is copied
+    assert generator.generate_logical_model() is first
+
+    for _ in edits(generator):
+        second = generator.generate_logical_model()
+        assert second is not first
+    # Unchanged entities are shared rather than serialized again
+    assert second["entities"]["party"] is first["entities"]["party"]
+    assert json.dumps(first) == before
+
+
+def test_relationships_are_removed_by_endpoint():
+    generator = build(CATALOG)
+    generator.generate_logical_model()
+    generator.add_relationship(Relationship("branches", "accounts", RelationType.ONE_TO_MANY))
+    generator.add_relationship(Relationship("accounts", "branches", RelationType.ONE_TO_ONE))
+    assert generator.remove_relationship("branches", "accounts") == 1
+    generator.remove_table("branches")
+    expected = [
+        rel for rel in build(CATALOG).relationships
+        if "branches" not in (rel.source_entity, rel.target_entity)
+    ]
+    assert generator.relationships == expected
+    assert generator.generate_logical_model()["relationships"] == build(CATALOG).generate_logical_model()["relationships"]
+
+
+@pytest.mark.parametrize("replace, expected", [(False, True), (True, False)])
+def test_upsert_table_replace_drops_removed_columns(replace, expected):
+    generator = build(CATALOG)
+    generator.generate_logical_model()
+    table = copy.deepcopy(CATALOG["schema"]["tables"]["accounts"])
+    dropped = table["columns"].pop()["name"]
+    generator.upsert_table("accounts", table, replace=replace)
+    names = [attr["name"] for attr in generator.generate_logical_model()["entities"]["accounts"]["attributes"]]
+    assert (dropped in names) is expected
+    assert names[:len(table["columns"])] == [column["name"] for column in table["columns"]]
+    assert (generator.entities["accounts"].attribute(dropped) is None) is replace
+
+
+def test_schema_merge_updates_known_columns_and_appends_new_ones():
+    generator = LogicalModelGenerator()
+    generator.analyze_datapedia({"entities": {"wide": {"attributes": {
+        f"col_{i}": {"type": "string"} for i in range(600)
+    }}}})
+    columns = [{"name": f"col_{i}", "type": "integer", "nullable": False} for i in range(300, 900)]
+    columns[0]["foreign_key"] = {"table": "other", "column": "id"}
+    generator.analyze_existing_schema({"tables": {"wide": {"columns": columns}}})
+
+    entity = generator.entities["wide"]
+    assert [attr.name for attr in entity.attributes] == [f"col_{i}" for i in range(900)]
+    assert entity.attribute("col_0").data_type == "string"
+    merged = entity.attribute("col_300")
+    assert (merged.data_type, merged.is_foreign, merged.is_nullable) == ("integer", True, False)
+    # Appended columns are indexed as they are added
+    assert entity.attribute("col_899") is entity.attributes[-1]
+
+
+def synthetic_catalog(size):
+    """Names overlap across sources so partitions must keep their precedence"""
+    return {
+        "datapedia": {"entities": {
+            f"e{i}": {
+                "definition": f"Entity {i}",
+                "attributes": {f"e{i}_id": {"type": "string"}, "value": {"type": "decimal"}},
+                "relationships": [{"target": f"e{(i + 1) % size}", "type": "has_many"}]
+            }
+            for i in range(0, size, 2)
+        }},
+        "conceptual_model": {"business_concepts": {
+            f"e{i}": {"description": f"Concept {i}", "attributes": ["label"]} for i in range(0, size, 3)
+        }},
+        "schema": {"tables": {
+            f"e{i}": {"columns": [{"name": f"e{i}_id", "type": "varchar(36)", "primary_key": True}]}
+            for i in range(size - 1, -1, -5)
+        }}
+    }
+
+
+@pytest.mark.parametrize("catalog", [CATALOG, synthetic_catalog(60)], ids=["data", "synthetic"])
+def test_parallel_build_matches_sequential(catalog):
+    sources = (catalog["datapedia"], catalog["conceptual_model"], catalog["schema"])
+    sequential = create_logical_model(*sources)
+    parallel = create_logical_model_parallel(*sources, workers=2, partitions=5)
+    # Same content and the same order of entities and relationships
+    assert json.dumps(parallel) == json.dumps(sequential)
+
+
+def test_model_classes_are_slotted_and_interned():
+    prefix = "customer"
+    attr = Attribute(prefix + "_id", "str" + "ing", is_primary=True, description="From conceptual" + " model")
+    entity = Entity(prefix + "s", [attr])
+    relationship = Relationship(prefix + "s", "accounts", RelationType.ONE_TO_MANY)
+    for instance in (attr, entity, relationship):
+        assert not hasattr(instance, "__dict__")
+    assert attr.name is sys.intern("customer_id")
+    assert attr.data_type is sys.intern("string")
+    assert attr.description is sys.intern("From conceptual model")
+    assert entity.name is relationship.source_entity
+
+    # The flags share one int and read back as booleans
+    assert attr.flags == AttributeFlag.PRIMARY | AttributeFlag.NULLABLE
+    attr.is_nullable = False
+    attr.is_foreign = True
+    assert (attr.is_primary, attr.is_foreign, attr.is_nullable) == (True, True, False)
+    assert attr == Attribute("customer_id", "string", True, True, False, "From conceptual model")
+
+
+def test_memory_benchmark_reports_slotted_attributes_smaller():
+    report = run_benchmark(2000, width=10, suggestions=100)
+    assert report["attributes"] == 2000
+    sizes = report["attribute"]
+    assert sizes["bytes_per_attribute"] < sizes["plain_bytes_per_attribute"]
+    assert sizes["instance_bytes"] < sizes["plain_instance_bytes"]
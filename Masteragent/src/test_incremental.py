@@ -0,0 +1,151 @@
+import asyncio
+import copy
+import json
+from pathlib import Path
+
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+from src.agents.MapperAgent import MapperAgent
+from src.pipeline.incremental import IncrementalState
+from src.types.suggestions import EntitySuggestion, RelationSuggestion
+from src.vertex.validation import validate_catalog
+
+CATALOG = json.loads((Path(__file__).parent / "vertex" / "vertex.json").read_text())
+
+ENTITY_TEXT = """Entity: Customer
+Description: A bank customer
+Attributes: customer_id, name
+Source: datapedia
+Confidence: 0.9
+"""
+
+RELATION_TEXT = """Relation: owns
+Source: Customer
+Target: Customer
+Type: referral
+Cardinality: 1:N
+Confidence: 0.5
+Description: Customers refer customers
+"""
+
+
+class StubLLM:
+    """Answers every prompt; fails the mapper's entity and relation prompts while ``failing``"""
+
+    def __init__(self, failing: bool = False):
+        self.failing = failing
+
+    def _answer(self, messages) -> str:
+        prompt = messages[0].content
+        mapper_prompt = "suggest comprehensive entities" in prompt or "relationships between the entities" in prompt
+        if self.failing and mapper_prompt:
+            raise RuntimeError("quota exceeded")
+        if "suggest comprehensive entities" in prompt:
+            return ENTITY_TEXT
+        if "relationships between the entities" in prompt:
+            return RELATION_TEXT
+        return "analysis"
+
+    async def ainvoke(self, messages, **kwargs):
+        return AIMessage(content=self._answer(messages))
+
+    async def astream(self, messages, **kwargs):
+        yield AIMessageChunk(content=self._answer(messages))
+
+
+class StubCatalog:
+    def __init__(self, data):
+        self.data = data
+
+    def get_data(self):
+        return self.data
+
+    def validate(self):
+        return validate_catalog(self.data)
+
+
+def _run(state_path: Path, llm: StubLLM):
+    agent = MapperAgent(StubCatalog(copy.deepcopy(CATALOG)), llm=llm, state_path=state_path)
+    return asyncio.run(agent.analyze_and_suggest())
+
+
+def test_failed_prompts_are_reanalyzed_next_run(tmp_path):
+    state_path = tmp_path / "state.json"
+
+    failed = _run(state_path, StubLLM(failing=True))
+    assert failed["entity_suggestions"] == []
+    assert failed["source_analyses"]["incremental"]["failed"]
+
+    recovered = _run(state_path, StubLLM())
+    assert recovered["source_analyses"]["incremental"]["reanalyzed"] > 0
+    assert [s.name for s in recovered["entity_suggestions"]] == ["Customer"]
+    assert len(recovered["relation_suggestions"]) == 1
+
+
+def test_successful_run_is_reused(tmp_path):
+    state_path = tmp_path / "state.json"
+    _run(state_path, StubLLM())
+
+    reused = _run(state_path, StubLLM(failing=True))
+    assert reused["source_analyses"]["incremental"]["reanalyzed"] == 0
+    assert [s.name for s in reused["entity_suggestions"]] == ["Customer"]
+
+
+def test_reused_entities_are_streamed(tmp_path):
+    state_path = tmp_path / "state.json"
+    _run(state_path, StubLLM())
+
+    streamed = []
+    agent = MapperAgent(StubCatalog(copy.deepcopy(CATALOG)), llm=StubLLM(failing=True), state_path=state_path)
+    result = asyncio.run(agent.analyze_and_suggest(on_entity=streamed.append))
+    assert result["source_analyses"]["incremental"]["reanalyzed"] == 0
+    assert streamed == result["entity_suggestions"]
+
+
+def _catalog(customer_columns, account_description="A bank account"):
+    return {
+        "datapedia": {"entities": {
+            "Customer": {"description": "A bank customer", "attributes": ["customer_id"]},
+            "Account": {"description": account_description, "attributes": ["account_id"]}
+        }},
+        "conceptual_model": {"entities": {}},
+        "schema": {"tables": {"customers": {"columns": [{"name": name} for name in customer_columns]}}}
+    }
+
+
+def _entity(name, attributes, description=""):
+    return EntitySuggestion(name=name, attributes=attributes, source="datapedia", confidence=0.9, description=description)
+
+
+def test_schema_alias_edit_reanalyzes_its_entity(tmp_path):
+    state = IncrementalState(tmp_path / "state.json")
+    plan = state.plan(_catalog(["customer_id", "legacy_col"]))
+    assert set(plan.fingerprints) == {"Customer", "Account"}
+    state.commit(plan, [_entity("Customer", ["customer_id", "legacy_col"])], [])
+
+    # Dropping a column of the "customers" table changes "Customer"
+    plan = state.plan(_catalog(["customer_id"]))
+    assert plan.changed == {"Customer"}
+    state.commit(plan, [_entity("customers", ["customer_id"])], [])
+    assert [(s.name, s.attributes) for s in state.entity_suggestions()] == [("customers", ["customer_id"])]
+
+
+def test_invented_suggestions_follow_the_entities_they_mention(tmp_path):
+    state = IncrementalState(tmp_path / "state.json")
+    plan = state.plan(_catalog(["customer_id"]))
+    party = _entity("Party", ["party_id", "customer_id"], "Anyone the bank deals with")
+    state.commit(plan, [party], [RelationSuggestion("Party", "Account", "holds", "1:N", 0.6, "")])
+
+    # An edit to Account re-analyzes Account only; Party came from Customer
+    plan = state.plan(_catalog(["customer_id"], "A deposit account"))
+    assert plan.scope == {"Account"}
+    state.commit(plan, [], [])
+    assert [s.name for s in state.entity_suggestions()] == ["Party"]
+    # The relation also touches Account, so it is due for regeneration
+    assert state.relation_suggestions() == []
+
+    # Editing Customer drops Party so the run that re-analyzes it can regenerate it
+    plan = state.plan(_catalog(["customer_id", "email"], "A deposit account"))
+    assert plan.scope == {"Customer"}
+    state.commit(plan, [], [])
+    assert state.entity_suggestions() == []
@@ -0,0 +1,109 @@
+import json
+from collections.abc import Mapping
+from pathlib import Path
+
+import pytest
+
+from src.vertex.loader import LazyJSONObject, SECTION_ALIASES, load_python_literals, open_catalog
+
+ROOT = Path(__file__).parent
+DATA_FILES = sorted((ROOT / "data").glob("*.json"))
+
+
+def materialize(value):
+    """Plain dicts and lists, so lazy catalogs compare with json.load results"""
+    if isinstance(value, Mapping):
+        return {key: materialize(value[key]) for key in value}
+    if isinstance(value, list):
+        return [materialize(item) for item in value]
+    return value
+
+
+def write_jsonl(path: Path, catalog: dict) -> None:
+    with open(path, "w") as f:
+        for section, content in catalog.items():
+            for key, value in content.items():
+                if isinstance(value, dict):
+                    for name, member in value.items():
+                        f.write(json.dumps({"section": section, "key": key, "name": name, "value": member}) + "\n")
+                elif isinstance(value, list):
+                    for item in value:
+                        f.write(json.dumps({"section": section, "key": key, "item": item}) + "\n")
+                else:
+                    f.write(json.dumps({"section": section, "key": key, "value": value}) + "\n")
+
+
+def test_vertex_json_matches_json_load():
+    path = ROOT / "vertex" / "vertex.json"
+    catalog = open_catalog(path)
+    assert materialize(catalog) == json.loads(path.read_text())
+    # Streamed tables decode again on every access and still agree
+    tables = catalog["schema"]["tables"]
+    for name in tables:
+        assert tables[name] == json.loads(path.read_text())["schema"]["tables"][name]
+
+
+@pytest.mark.parametrize("path", DATA_FILES, ids=lambda path: path.name)
+def test_data_exports_match_json_load(path, tmp_path):
+    sections = {SECTION_ALIASES.get(name, name): value for name, value in load_python_literals(path).items()}
+    assert materialize(open_catalog(path)) == sections
+
+    as_json = tmp_path / "catalog.json"
+    as_json.write_text(json.dumps(sections, indent=2))
+    assert materialize(open_catalog(as_json)) == json.load(open(as_json))
+
+    as_jsonl = tmp_path / "catalog.jsonl"
+    write_jsonl(as_jsonl, sections)
+    assert materialize(open_catalog(as_jsonl)) == sections
+
+
+def test_data_directory_matches_literals():
+    expected = {}
+    for path in DATA_FILES:
+        for name, value in load_python_literals(path).items():
+            expected.setdefault(SECTION_ALIASES.get(name, name), value)
+    assert materialize(open_catalog(ROOT / "data")) == expected
+
+
+def test_escapes_and_brackets_inside_strings(tmp_path):
+    catalog = {
+        "datapedia": {
+            "entities": {
+                'quoted "name"': {"definition": 'ends with a backslash \\', "attributes": []},
+                "braces": {"definition": "{not} [an] {object", "attributes": ["}", "]", "\"{"]},
+                "unicode é中": {"definition": "line\nbreak\ttab 😀", "attributes": {}}
+            }
+        },
+        "schema": {
+            "tables": {
+                "t}": {"columns": [{"name": "c\"]", "type": "varchar(1)", "nullable": True}]},
+                "empty": {"columns": []}
+            }
+        },
+        "numbers": [1, -2.5e3, True, False, None, "", {}, []]
+    }
+    path = tmp_path / "catalog.json"
+    for text in (json.dumps(catalog), json.dumps(catalog, indent=4), json.dumps(catalog, ensure_ascii=False)):
+        path.write_text(text, encoding="utf-8")
+        lazy = open_catalog(path)
+        # Reading a late section first must not depend on earlier ones
+        assert materialize(lazy["numbers"]) == catalog["numbers"]
+        assert materialize(lazy) == catalog
+
+
+def test_empty_object_and_empty_file(tmp_path):
+    path = tmp_path / "catalog.json"
+    path.write_text("{}")
+    assert materialize(open_catalog(path)) == {}
+
+    path.write_text("")
+    assert open_catalog(path) == {}
+    with pytest.raises(ValueError):
+        LazyJSONObject(b"", 0)
+
+
+def test_unterminated_object_is_rejected(tmp_path):
+    path = tmp_path / "catalog.json"
+    path.write_text('{"datapedia": {"entities": {"a": 1}')
+    with pytest.raises(ValueError):
+        materialize(open_catalog(path))
@@ -0,0 +1,41 @@
+from src.agents.DatapediaAgent import DatapediaAgent
+from src.vertex.names import attribute_key, canonical_name
+
+
+def test_canonical_name_merges_entity_spellings():
+    assert {canonical_name(n) for n in ("Customer", "customers", "customer_id", "CUSTOMER-CD")} == {"customer"}
+    assert canonical_name("FinancialProducts") == "financial_product"
+    assert canonical_name("series") == "series"
+    assert canonical_name("news") == "news"
+
+
+def test_attribute_key_only_ignores_case_and_separators():
+    assert attribute_key("customerId") == attribute_key("CUSTOMER-ID") == attribute_key("customer_id")
+    for a, b in (("party_type_cd", "party_type"), ("status_cd", "status"), ("customer_id", "customer"),
+                 ("series", "sery"), ("news", "new"), ("statuses", "status")):
+        assert attribute_key(a) != attribute_key(b)
+
+
+def test_entity_attributes_keep_suffixes_and_plurals():
+    agent = DatapediaAgent(vertex_db_client=None, llm=object())
+    datapedia = {
+        "entities": {
+            "Party": {"definition": "A party", "attributes": ["party_type", "status", "series", "news"]}
+        }
+    }
+    schema = {
+        "tables": {
+            "parties": {
+                "columns": [
+                    {"name": name}
+                    for name in ("PARTY_TYPE", "partyType", "party_type_cd", "status_cd", "series", "new", "customer_id")
+                ]
+            }
+        }
+    }
+    entities = agent._extract_entities(datapedia, {}, schema)
+    assert list(entities) == ["Party"]
+    assert entities["Party"]["attributes"] == [
+        "party_type", "status", "series", "news", "party_type_cd", "status_cd", "new", "customer_id"
+    ]
+    assert entities["Party"]["aliases"] == {"schema": ["parties"]}
@@ -0,0 +1,30 @@
+import asyncio
+
+from src.agents.MapperAgent import MapperAgent
+from src.types.suggestions import EntitySuggestion, RelationSuggestion
+
+
+def _entity(name: str) -> EntitySuggestion:
+    return EntitySuggestion(name=name, description=name, attributes=[], source="datapedia", confidence=0.9)
+
+
+def test_relation_batches_merge_in_shard_order():
+    agent = MapperAgent(None, llm=object(), relation_batch_size=1, relation_workers=2)
+
+    async def stream(context, bian, accord):
+        for name in ("Customer", "Account"):
+            yield _entity(name)
+
+    async def relations(context, bian, accord, entities):
+        (suggestion,) = entities["new"]
+        # The first batch finishes last; ties must still go to it
+        if suggestion.name == "Customer":
+            await asyncio.sleep(0.05)
+        return [RelationSuggestion("Customer", "Account", "owns", "1:N", 0.8, f"from {suggestion.name}")]
+
+    agent._stream_entities_for = stream
+    agent._suggest_relations_for = relations
+    result = asyncio.run(agent._suggest_pipelined({}, {}, {}))
+
+    assert [s.name for s in result["entities"]] == ["Customer", "Account"]
+    assert [r.description for r in result["relations"]] == ["from Customer"]
@@ -0,0 +1,56 @@
+import asyncio
+import json
+
+import pytest
+
+from src.vertex.registry import CatalogRegistry
+
+CATALOG = {
+    "datapedia": {"entities": {"Customer": {"attributes": []}}, "relationships": []},
+    "conceptual_model": {"entities": {}, "relationships": []},
+    "schema": {"tables": {}}
+}
+
+
+def _write(tmp_path, name):
+    path = tmp_path / f"{name}.json"
+    path.write_text(json.dumps(CATALOG))
+    return path
+
+
+def test_failed_load_stops_its_watcher(tmp_path):
+    _write(tmp_path, "bank")
+    clients = []
+
+    def sizeof(client):
+        clients.append(client)
+        raise RuntimeError("cannot measure")
+
+    registry = CatalogRegistry(root=tmp_path, watch_interval=60, sizeof=sizeof)
+    with pytest.raises(RuntimeError):
+        registry.get("bank")
+    (client,) = clients
+    assert client._watcher is None
+    assert registry.get_stats()["loaded"] == []
+
+
+def test_swapped_catalogs_are_measured_again(tmp_path):
+    _write(tmp_path, "bank")
+    _write(tmp_path, "insurer")
+    # Ten bytes per datapedia entity of the current version
+    registry = CatalogRegistry(
+        root=tmp_path,
+        max_bytes=25,
+        sizeof=lambda client: 10 * len(client.get_datapedia()["entities"])
+    )
+    bank = registry.get("bank")
+    registry.get("insurer")
+    assert registry.get_stats()["bytes"] == 20
+
+    grown = {**CATALOG, "datapedia": {"entities": {"Customer": {}, "Account": {}}, "relationships": []}}
+    registry.get("insurer").set_data(grown)
+    assert asyncio.run(registry.aget("insurer")).version == 2
+    # 30 bytes is over budget, so the least recently used catalog goes
+    stats = registry.get_stats()
+    assert (stats["loaded"], stats["bytes"]) == (["insurer"], 20)
+    assert bank.get_entity("Customer") is not None
@@ -0,0 +1,40 @@
+import gc
+import threading
+import weakref
+
+import numpy as np
+
+from src.retrieval.embedders import HashingEmbedder
+from src.retrieval.index import VectorIndex
+
+
+def test_embedders_keep_separate_caches_and_are_collected():
+    small, large = HashingEmbedder(dim=8), HashingEmbedder(dim=512)
+    assert small.embed(["customer_id"]).shape == (1, 8)
+    assert large.embed(["customer_id"]).shape == (1, 512)
+    # "customer" and "id", cached once per embedder
+    assert small._features.cache_info().currsize == large._features.cache_info().currsize == 2
+
+    ref = weakref.ref(small)
+    del small
+    gc.collect()
+    assert ref() is None
+
+
+def test_save_round_trip_and_concurrent_writers(tmp_path):
+    keys = [f"entity_{i}" for i in range(50)]
+    index = VectorIndex(keys, HashingEmbedder(dim=32).embed(keys), meta={"embedder": "hashing-32-0.5"})
+    path = tmp_path / "index.npz"
+
+    threads = [threading.Thread(target=index.save, args=(path,)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Every writer used its own temporary file, and none is left behind
+    assert [file.name for file in tmp_path.iterdir()] == ["index.npz"]
+    loaded = VectorIndex.load(path)
+    assert loaded.keys == keys
+    assert loaded.meta == index.meta
+    assert np.array_equal(loaded.vectors, index.vectors)
@@ -0,0 +1,74 @@
+from src.vertex.snapshot import CatalogSnapshot
+from src.vertex.vertex_client import VertexDBClient
+
+CATALOG = {
+    "datapedia": {
+        "entities": {"Customer": {"attributes": []}, "Account": {"attributes": []}},
+        "relationships": [
+            {"source": "Customer", "target": "Account", "type": "owns"},
+            {"source": "Customer", "target": "Customer", "type": "refers"}
+        ]
+    },
+    "conceptual_model": {
+        "entities": {"Customer": {"attributes": []}, "Party": {"attributes": []}},
+        "relationships": [{"source": "Party", "target": "Customer", "type": "is_a"}]
+    },
+    "schema": {"tables": {
+        "customers": {"columns": [{"name": "customer_id"}]},
+        "accounts": {"columns": [
+            {"name": "account_id"},
+            {"name": "customer_id", "foreign_key": {"table": "customers", "column": "customer_id"}}
+        ]}
+    }}
+}
+
+
+def scan(data, name):
+    """What the adjacency index replaces: every relationship, in catalog order"""
+    found = []
+    for source in ("datapedia", "conceptual_model"):
+        for rel in data[source]["relationships"]:
+            if name in (rel["source"], rel["target"]):
+                found.append({"source": source, "data": rel})
+    for table, spec in data["schema"]["tables"].items():
+        for column in spec["columns"]:
+            target = column.get("foreign_key", {}).get("table")
+            if target and name in (table, target):
+                found.append({"source": "schema", "data": {
+                    "source": table, "target": target, "type": "foreign_key", "column": column["name"]
+                }})
+    return found
+
+
+def test_adjacency_index_matches_a_full_scan():
+    snapshot = CatalogSnapshot(CATALOG, version=1)
+    for name in ("Customer", "Account", "Party", "customers", "accounts", "Missing"):
+        assert snapshot.get_relationships_for_entity(name) == scan(CATALOG, name)
+    # The self-reference is listed once, and in both directions
+    refers = {"source": "datapedia", "data": CATALOG["datapedia"]["relationships"][1]}
+    assert snapshot.get_relationships_for_entity("Customer").count(refers) == 1
+    assert refers in snapshot.get_outgoing_relationships("Customer")
+    assert refers in snapshot.get_incoming_relationships("Customer")
+    assert [r["data"]["source"] for r in snapshot.get_incoming_relationships("customers")] == ["accounts"]
+
+
+def test_entity_index_prefers_earlier_sections():
+    snapshot = CatalogSnapshot(CATALOG, version=1)
+    assert snapshot.get_entity("Customer")["source"] == "datapedia"
+    assert snapshot.get_entity("Party")["source"] == "conceptual_model"
+    assert snapshot.get_entity("accounts")["source"] == "schema"
+    assert snapshot.get_entity("Missing") is None
+
+
+def test_indexes_follow_replaced_data(tmp_path):
+    client = VertexDBClient(tmp_path / "missing.json")
+    client.set_data(CATALOG)
+    assert client.get_outgoing_relationships("Account") == []
+
+    changed = {**CATALOG, "datapedia": {
+        **CATALOG["datapedia"],
+        "relationships": [{"source": "Account", "target": "Customer", "type": "held_by"}]
+    }}
+    client.set_data(changed)
+    assert [r["data"]["type"] for r in client.get_outgoing_relationships("Account")] == ["held_by"]
+    assert client.get_outgoing_relationships("Customer") == []
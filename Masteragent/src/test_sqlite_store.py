@@ -0,0 +1,55 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from src.test_loader import materialize
+from src.vertex.sqlite_store import SQLiteCatalogStore
+from src.vertex.vertex_client import VertexDBClient
+
+VERTEX_JSON = Path(__file__).parent / "vertex" / "vertex.json"
+CATALOG = json.loads(VERTEX_JSON.read_text())
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SQLiteCatalogStore(tmp_path / "catalog.sqlite3")
+    store.import_catalog(VERTEX_JSON, batch_size=2)
+    return store
+
+
+def test_round_trip(store):
+    data = store.get_data()
+    assert materialize(data) == CATALOG
+    # Section and collection order survive the import
+    assert list(data) == list(CATALOG)
+    assert list(data["schema"]["tables"]) == list(CATALOG["schema"]["tables"])
+
+
+def test_reads_match_vertex_client(store):
+    client = VertexDBClient(VERTEX_JSON)
+    names = list(CATALOG["datapedia"]["entities"]) + list(CATALOG["schema"]["tables"]) + ["Missing"]
+    for name in names:
+        assert materialize(store.get_entity(name)) == materialize(client.get_entity(name))
+        assert store.get_relationships_for_entity(name) == client.get_relationships_for_entity(name)
+        assert store.get_outgoing_relationships(name) == client.get_outgoing_relationships(name)
+        assert store.get_incoming_relationships(name) == client.get_incoming_relationships(name)
+    assert materialize(store.get_entities(names)) == materialize(client.get_entities(names))
+    info = client.get_vertex_info()
+    # Only the client versions its snapshots
+    info.pop("version")
+    assert store.get_vertex_info() == info
+
+
+def test_reimport_replaces_the_catalog(store, tmp_path):
+    catalog = {
+        "datapedia": {"entities": {"Only": {"definition": "one", "attributes": ["id"]}}},
+        "conceptual_model": {"entities": {}},
+        "schema": {"tables": {"only": {"columns": [{"name": "id", "type": "int", "primary_key": True}]}}},
+        "notes": "kept as a plain value"
+    }
+    store.import_catalog(catalog)
+    assert materialize(store.get_data()) == catalog
+    assert store.get_entity(next(iter(CATALOG["datapedia"]["entities"]))) is None
+    # A second connection sees the committed import
+    assert materialize(SQLiteCatalogStore(store.db_path).get_data()) == catalog
@@ -0,0 +1,104 @@
+import json
+import pytest
+
+from src.agents.suggestion_parser import entity_parser, relation_parser
+from src.types.suggestions import EntitySuggestion, RelationSuggestion
+
+ENTITIES = """Here are the suggested entities.
+
+Entity: Customer
+Description: A person or organisation that holds products
+Attributes: customer_id, name, customer_type_cd
+Source: datapedia
+Confidence: 0.95
+
+Entity: Account
+Description: A product arrangement
+Attributes: account_id, customer_id
+Source: BIAN
+Confidence: 1.7
+
+Entity: Branch
+Description: A physical location
+Attributes: branch_id
+"""
+
+RELATIONS = """Relation: holds
+Source: Customer
+Target: Account
+Type: ownership
+Cardinality: 1:N
+Confidence: 0.8
+Description: Customers hold accounts
+
+Relation: orphan
+Target: Account
+Type: ownership
+"""
+
+
+def parse(parser, chunks):
+    results = []
+    for chunk in chunks:
+        results.extend(parser.feed(chunk))
+    return results + parser.close()
+
+
+def split_every(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def test_whole_text():
+    entities = parse(entity_parser(), [ENTITIES])
+    assert [entity.name for entity in entities] == ["Customer", "Account", "Branch"]
+    assert entities[0].attributes == ["customer_id", "name", "customer_type_cd"]
+    # Confidence is clamped, missing fields keep their defaults
+    assert entities[1].confidence == 1.0
+    assert (entities[2].source, entities[2].confidence) == ("", 0.0)
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 16, 64])
+def test_chunk_boundaries_do_not_change_entities(size):
+    assert parse(entity_parser(), split_every(ENTITIES, size)) == parse(entity_parser(), [ENTITIES])
+
+
+def test_every_two_way_split():
+    expected = parse(relation_parser(), [RELATIONS])
+    for cut in range(len(RELATIONS) + 1):
+        assert parse(relation_parser(), [RELATIONS[:cut], RELATIONS[cut:]]) == expected
+
+
+def test_block_is_emitted_once_all_fields_arrive():
+    parser = entity_parser()
+    head, tail = ENTITIES.split("Entity: Account")
+    # The last field line is still partial until its newline arrives
+    assert parser.feed(head[:-2]) == []
+    assert [entity.name for entity in parser.feed(head[-2:])] == ["Customer"]
+    assert [entity.name for entity in parser.feed("Entity: Account" + tail)] == ["Account"]
+    assert [entity.name for entity in parser.close()] == ["Branch"]
+
+
+def test_relation_without_endpoints_is_dropped():
+    relations = parse(relation_parser(), split_every(RELATIONS, 5))
+    assert [(r.source_entity, r.target_entity, r.cardinality) for r in relations] == [("Customer", "Account", "1:N")]
+
+
+def test_trailing_line_without_newline():
+    parser = relation_parser()
+    text = RELATIONS.split("\n\n")[0]
+    assert parser.feed(text) == []
+    assert [r.description for r in parser.close()] == ["Customers hold accounts"]
+
+
+def test_suggestions_are_slotted_and_intern_repeated_strings():
+    # Decoded JSON holds a fresh string object per occurrence
+    rows = json.loads('[{"name": "Customer", "source": "BIAN"}, {"name": "Customer", "source": "BIAN"}]')
+    first, second = (EntitySuggestion(row["name"], ["customer_id"], row["source"], 0.9, "") for row in rows)
+    assert not hasattr(first, "__dict__")
+    assert first.name is second.name and first.source is second.source
+    assert first.attributes[0] is second.attributes[0]
+
+    relation = RelationSuggestion(rows[0]["name"], "Account", "owns", "1:N", 0.5, "")
+    assert not hasattr(relation, "__dict__")
+    assert relation.source_entity is first.name
+    assert EntitySuggestion.from_dict(first.to_dict()) == first
@@ -0,0 +1,76 @@
+import copy
+import json
+from pathlib import Path
+
+import pytest
+
+from src.vertex.loader import open_catalog
+from src.vertex.validation import CatalogValidationError, content_hash, validate_catalog
+
+CATALOG = json.loads((Path(__file__).parent / "vertex" / "vertex.json").read_text())
+
+
+def errors(catalog):
+    return {(error.path, error.message) for error in validate_catalog(catalog).errors}
+
+
+def test_vertex_json_is_valid():
+    assert validate_catalog(CATALOG).valid
+    # The lazily opened file validates the same way
+    assert validate_catalog(open_catalog(Path(__file__).parent / "vertex" / "vertex.json")).valid
+
+
+def test_missing_sections():
+    messages = {message for _, message in errors({"datapedia": {"entities": {}}})}
+    assert "'conceptual_model' is a required property" in messages
+    assert "'schema' is a required property" in messages
+
+
+def test_unknown_relationship_endpoint():
+    catalog = copy.deepcopy(CATALOG)
+    catalog["datapedia"].setdefault("relationships", []).append({"source": "Customer", "target": "Nowhere"})
+    index = len(catalog["datapedia"]["relationships"]) - 1
+    assert (f"datapedia.relationships[{index}].target", "Unknown entity 'Nowhere'") in errors(catalog)
+
+
+def test_bad_columns_and_foreign_keys():
+    catalog = copy.deepcopy(CATALOG)
+    tables = catalog["schema"]["tables"]
+    name = next(iter(tables))
+    columns = tables[name]["columns"]
+    columns.append({"name": "broken", "type": 7})
+    columns.append({"name": "dangling", "type": "varchar(36)", "foreign_key": {"table": "missing_table"}})
+    columns.append({"name": "wrong_column", "type": "varchar(36)", "foreign_key": {"table": name, "column": "nope"}})
+    found = errors(catalog)
+    base = f"schema.tables.{name}.columns"
+    assert f"{base}[{len(columns) - 3}].type" in {path for path, _ in found}
+    assert (f"{base}[{len(columns) - 2}].foreign_key.table", "Unknown table 'missing_table'") in found
+    assert (f"{base}[{len(columns) - 1}].foreign_key.column", f"Unknown column 'nope' in table {name!r}") in found
+
+
+def test_index_on_unknown_column():
+    catalog = copy.deepcopy(CATALOG)
+    name = next(iter(catalog["schema"]["tables"]))
+    catalog["schema"]["tables"][name]["indexes"] = [{"columns": ["no_such_column"]}]
+    assert (f"schema.tables.{name}.indexes[0].columns[0]", "Unknown column 'no_such_column'") in errors(catalog)
+
+
+def test_reports_are_reused_by_content_hash():
+    catalog = copy.deepcopy(CATALOG)
+    catalog["schema"]["tables"]["extra"] = {"columns": "not a list"}
+    report = validate_catalog(catalog)
+    assert not report.valid
+    assert validate_catalog(copy.deepcopy(catalog)) is report
+    assert report.content_hash == content_hash(catalog) != content_hash(CATALOG)
+
+
+def test_error_message_lists_the_first_errors():
+    catalog = copy.deepcopy(CATALOG)
+    for i in range(7):
+        catalog["schema"]["tables"][f"bad_{i}"] = {}
+    report = validate_catalog(catalog)
+    error = CatalogValidationError(report)
+    assert isinstance(error, ValueError)
+    assert error.report is report
+    assert str(error).startswith("Invalid catalog: ")
+    assert str(error).endswith(f"(+{len(report.errors) - 5} more)")
@@ -0,0 +1,88 @@
+import json
+import shutil
+from pathlib import Path
+
+from src.test_loader import materialize
+from src.vertex.vertex_client import VertexDBClient
+
+ROOT = Path(__file__).parent
+CATALOG = json.loads((ROOT / "vertex" / "vertex.json").read_text())
+
+
+def rewrite_in_place(path: Path, text: str) -> None:
+    # Same inode, new bytes: what an editor or `cat >` does
+    with open(path, "r+") as f:
+        f.truncate(0)
+        f.write(text)
+
+
+def replace_atomically(path: Path, text: str) -> None:
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(text)
+    tmp_path.replace(path)
+
+
+def test_pinned_snapshot_survives_atomic_replace(tmp_path):
+    path = tmp_path / "vertex.json"
+    path.write_text(json.dumps(CATALOG, indent=2))
+    client = VertexDBClient(path)
+    changed = json.loads(json.dumps(CATALOG))
+    changed["datapedia"]["entities"] = {"Replacement": {"definition": "new", "attributes": []}}
+
+    with client.pinned() as snapshot:
+        replace_atomically(path, json.dumps(changed))
+        assert client.refresh()
+        # The old inode stays mapped until the snapshot is dropped
+        assert materialize(snapshot.data) == CATALOG
+        assert materialize(client.get_data()) == CATALOG
+    assert materialize(client.get_datapedia()) == changed["datapedia"]
+    assert not client.refresh()
+
+
+def test_pinned_snapshot_survives_in_place_rewrite(tmp_path):
+    path = tmp_path / "vertex.json"
+    path.write_text(json.dumps(CATALOG, indent=2))
+    client = VertexDBClient(path, private_copy=True)
+    changed = json.loads(json.dumps(CATALOG))
+    changed["datapedia"]["entities"] = {"Replacement": {"definition": "new", "attributes": []}}
+
+    with client.pinned() as snapshot:
+        # Nothing has been decoded yet when the file changes
+        for text in (json.dumps(changed), "{", ""):
+            rewrite_in_place(path, text)
+            assert materialize(client.get_data()) == CATALOG
+        rewrite_in_place(path, json.dumps(changed))
+        assert client.refresh()
+        assert client.snapshot() is snapshot
+        assert materialize(snapshot.data) == CATALOG
+    assert materialize(client.get_datapedia()) == changed["datapedia"]
+
+
+def test_directory_snapshot_ignores_later_edits(tmp_path):
+    shutil.copytree(ROOT / "data", tmp_path / "data")
+    client = VertexDBClient(tmp_path / "data", private_copy=True)
+    before = materialize(VertexDBClient(ROOT / "data").get_data())
+
+    with client.pinned():
+        for file in (tmp_path / "data").glob("*.json"):
+            rewrite_in_place(file, "")
+        assert materialize(client.get_data()) == before
+
+
+def test_nbytes_counts_decoded_sections_and_indexes(tmp_path):
+    path = ROOT / "vertex" / "vertex.json"
+    client = VertexDBClient(path)
+    unindexed = client.nbytes()
+    # The mapped file is part of the cost from the start
+    assert unindexed >= path.stat().st_size
+    client.snapshot().build_indexes()
+    assert client.nbytes() > unindexed
+
+    columnar = VertexDBClient(path, columnar_schema=True)
+    columnar.snapshot().build_indexes()
+    assert columnar.nbytes() > client.nbytes()
+
+    # data/ exports are evaluated into plain objects, which the file size understates
+    data = VertexDBClient(ROOT / "data")
+    data.snapshot().build_indexes()
+    assert data.nbytes() > 2 * sum(file.stat().st_size for file in (ROOT / "data").glob("*.json"))
@@ -0,0 +1,60 @@
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Process-wide pool for blocking catalog work, sized by ``VERTEX_IO_WORKERS``"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=int(os.getenv("VERTEX_IO_WORKERS", "4")),
+                thread_name_prefix="vertex-io"
+            )
+        return _executor
+
+
+async def run_blocking(func: Callable[..., T], *args, **kwargs) -> T:
+    """Run ``func`` on the catalog executor without blocking the event loop.
+
+    The caller's context is copied into the worker, so a snapshot pinned by
+    the current run (and metrics tags) still apply there.
+    """
+    context = contextvars.copy_context()
+    call = functools.partial(context.run, func, *args, **kwargs)
+    return await asyncio.get_running_loop().run_in_executor(get_executor(), call)
+
+
+class AsyncCatalogAPI:
+    """Async counterparts of the catalog read methods.
+
+    Every call is offloaded to the bounded catalog executor, so a slow
+    backend only occupies a worker thread while other pipeline runs on the
+    same event loop keep going.
+    """
+
+    async def aget_data(self) -> Dict[str, Any]:
+        return await run_blocking(self.get_data)
+
+    async def aget_entity(self, entity_name: str) -> Optional[Dict[str, Any]]:
+        return await run_blocking(self.get_entity, entity_name)
+
+    async def aget_entities(self, entity_names: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Look up many entities with a single executor hop"""
+        return await run_blocking(self.get_entities, list(entity_names))
+
+    async def aget_relationships_for_entity(self, entity_name: str) -> List[Dict[str, Any]]:
+        return await run_blocking(self.get_relationships_for_entity, entity_name)
+
+    async def avalidate(self):
+        return await run_blocking(self.validate)
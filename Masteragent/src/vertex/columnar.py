@@ -0,0 +1,285 @@
+import copy
+import sys
+from array import array
+from collections import ChainMap
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# primary_key / nullable are stored as absent, False or True
+_ABSENT, _FALSE, _TRUE = 0, 1, 2
+_FLAG_VALUES = {False: _FALSE, True: _TRUE}
+_NO_STRING = -1
+_COLUMN_FIELDS = frozenset(("name", "type", "primary_key", "nullable", "foreign_key"))
+
+# (name, type, primary_key, nullable, foreign key table, foreign key column);
+# flags and foreign key fields are None when the column does not set them
+ColumnRecord = Tuple[Any, Any, Optional[bool], Optional[bool], Optional[str], Optional[str]]
+
+
+class ColumnarTables(Mapping):
+    """``schema.tables`` stored column-wise instead of as one dict per column.
+
+    Every column attribute is a parallel array indexed by column position,
+    table and column names and types are interned in one string pool, and
+    tables are integer ids whose columns are a contiguous range. Reading a
+    table builds a fresh plain dict in the original key order, so callers
+    keep the dict-shaped API (and cannot modify the store); bulk readers use
+    ``iter_columns`` and ``foreign_keys`` to skip the dicts altogether.
+
+    Columns with keys beyond name/type/primary_key/nullable/foreign_key keep
+    the rest in a sparse side table; malformed columns are kept as they are.
+    """
+
+    def __init__(self):
+        self._strings: List[str] = []
+        self._string_ids: Optional[Dict[str, int]] = {}
+        self._table_names: List[str] = []
+        self._table_ids: Dict[str, int] = {}
+        # Key order of each table and column, shared between equal layouts
+        self._layouts: List[Tuple] = []
+        self._layout_ids: Optional[Dict[Tuple, int]] = {}
+        self._table_layout = array("H")
+        self._table_extras: Dict[int, Dict[str, Any]] = {}
+        self._raw_tables: Dict[int, Any] = {}
+        self._offsets = array("I", [0])
+
+        self._name = array("i")
+        self._type = array("i")
+        self._primary = array("b")
+        self._nullable = array("b")
+        self._fk_table = array("i")
+        self._fk_column = array("i")
+        self._column_layout = array("H")
+        self._column_extras: Dict[int, Dict[str, Any]] = {}
+        self._raw_columns: Dict[int, Any] = {}
+
+    @classmethod
+    def from_tables(cls, tables: Mapping) -> "ColumnarTables":
+        """Build from any ``schema.tables`` mapping, reading one table at a time"""
+        if isinstance(tables, ColumnarTables):
+            return tables
+        store = cls()
+        for name, table in tables.items():
+            store._add_table(name, table)
+        # Lookups only need the pools from here on
+        store._string_ids = None
+        store._layout_ids = None
+        return store
+
+    def _intern(self, value: str) -> int:
+        string_id = self._string_ids.get(value)
+        if string_id is None:
+            string_id = self._string_ids[value] = len(self._strings)
+            self._strings.append(sys.intern(value))
+        return string_id
+
+    def _layout(self, keys: Tuple) -> int:
+        layout_id = self._layout_ids.get(keys)
+        if layout_id is None:
+            layout_id = self._layout_ids[keys] = len(self._layouts)
+            self._layouts.append(keys)
+        return layout_id
+
+    def _add_table(self, name: str, table: Any) -> None:
+        table_id = len(self._table_names)
+        name = self._strings[self._intern(name)]
+        self._table_names.append(name)
+        self._table_ids[name] = table_id
+        if not isinstance(table, Mapping) or not isinstance(table.get("columns"), list):
+            self._raw_tables[table_id] = table
+            self._table_layout.append(0)
+            self._offsets.append(self._offsets[-1])
+            return
+
+        extras = {key: value for key, value in table.items() if key != "columns"}
+        if extras:
+            self._table_extras[table_id] = extras
+        self._table_layout.append(self._layout(tuple(table)))
+        for column in table["columns"]:
+            self._add_column(column)
+        self._offsets.append(len(self._name))
+
+    def _add_column(self, column: Any) -> None:
+        position = len(self._name)
+        if self._is_plain(column):
+            foreign_key = column.get("foreign_key")
+            keys = layout = tuple(column)
+            if foreign_key is not None:
+                layout = tuple(
+                    ("foreign_key", tuple(foreign_key)) if key == "foreign_key" else key
+                    for key in keys
+                )
+            self._name.append(self._intern(column["name"]))
+            self._type.append(self._intern(column["type"]) if "type" in column else _NO_STRING)
+            self._primary.append(_FLAG_VALUES[column["primary_key"]] if "primary_key" in column else _ABSENT)
+            self._nullable.append(_FLAG_VALUES[column["nullable"]] if "nullable" in column else _ABSENT)
+            if foreign_key is not None:
+                self._fk_table.append(self._intern(foreign_key["table"]))
+                self._fk_column.append(self._intern(foreign_key["column"]) if "column" in foreign_key else _NO_STRING)
+            else:
+                self._fk_table.append(_NO_STRING)
+                self._fk_column.append(_NO_STRING)
+            self._column_layout.append(self._layout(layout))
+            if not _COLUMN_FIELDS.issuperset(keys):
+                self._column_extras[position] = {
+                    key: value for key, value in column.items() if key not in _COLUMN_FIELDS
+                }
+        else:
+            self._raw_columns[position] = column
+            for values in (self._name, self._type, self._fk_table, self._fk_column):
+                values.append(_NO_STRING)
+            self._primary.append(_ABSENT)
+            self._nullable.append(_ABSENT)
+            self._column_layout.append(0)
+
+    @staticmethod
+    def _is_plain(column: Any) -> bool:
+        # Decoded catalogs hold plain dicts; skip the slower ABC check for them
+        if type(column) is not dict and not isinstance(column, Mapping):
+            return False
+        if not isinstance(column.get("name"), str):
+            return False
+        if "type" in column and not isinstance(column["type"], str):
+            return False
+        for flag in ("primary_key", "nullable"):
+            if flag in column and not isinstance(column[flag], bool):
+                return False
+        if "foreign_key" in column:
+            foreign_key = column["foreign_key"]
+            if not isinstance(foreign_key, Mapping) or not isinstance(foreign_key.get("table"), str):
+                return False
+            if set(foreign_key) - {"table", "column"}:
+                return False
+            if "column" in foreign_key and not isinstance(foreign_key["column"], str):
+                return False
+        return True
+
+    def _column(self, position: int) -> Any:
+        if position in self._raw_columns:
+            return copy.deepcopy(self._raw_columns[position])
+        column: Dict[str, Any] = {}
+        for key in self._layouts[self._column_layout[position]]:
+            if key == "name":
+                column["name"] = self._strings[self._name[position]]
+            elif key == "type":
+                column["type"] = self._strings[self._type[position]]
+            elif key == "primary_key":
+                column["primary_key"] = self._primary[position] == _TRUE
+            elif key == "nullable":
+                column["nullable"] = self._nullable[position] == _TRUE
+            elif isinstance(key, tuple):
+                column["foreign_key"] = {
+                    field: self._strings[self._fk_table[position] if field == "table" else self._fk_column[position]]
+                    for field in key[1]
+                }
+            else:
+                column[key] = copy.deepcopy(self._column_extras[position][key])
+        return column
+
+    def __getitem__(self, name: str) -> Any:
+        table_id = self._table_ids[name]
+        if table_id in self._raw_tables:
+            return copy.deepcopy(self._raw_tables[table_id])
+        extras = self._table_extras.get(table_id, {})
+        table: Dict[str, Any] = {}
+        for key in self._layouts[self._table_layout[table_id]]:
+            if key == "columns":
+                table["columns"] = [
+                    self._column(position)
+                    for position in range(self._offsets[table_id], self._offsets[table_id + 1])
+                ]
+            else:
+                table[key] = copy.deepcopy(extras[key])
+        return table
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._table_ids
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._table_names)
+
+    def __len__(self) -> int:
+        return len(self._table_names)
+
+    def __repr__(self) -> str:
+        return f"<ColumnarTables {len(self)} tables, {self.column_count} columns>"
+
+    @property
+    def column_count(self) -> int:
+        return len(self._name)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the arrays and the string pool"""
+        arrays = (
+            self._offsets, self._table_layout, self._name, self._type, self._primary,
+            self._nullable, self._fk_table, self._fk_column, self._column_layout
+        )
+        size = sum(values.itemsize * len(values) for values in arrays)
+        size += sum(sys.getsizeof(string) for string in self._strings)
+        # List and dict slots for the pool, table names and table ids
+        size += 8 * len(self._strings) + 8 * len(self._table_names) + 100 * len(self._table_ids)
+        return size
+
+    def iter_columns(self, name: str) -> Iterator[ColumnRecord]:
+        """The columns of one table as tuples, without building dicts"""
+        table_id = self._table_ids[name]
+        if table_id in self._raw_tables:
+            table = self._raw_tables[table_id]
+            columns = table.get("columns", []) if isinstance(table, Mapping) else []
+            for column in columns if isinstance(columns, list) else []:
+                yield self._raw_record(column)
+            return
+        strings, raw_columns = self._strings, self._raw_columns
+        # Bound locally: this loop runs once per column of the catalog
+        names, types, primary, nullable = self._name, self._type, self._primary, self._nullable
+        fk_tables, fk_columns = self._fk_table, self._fk_column
+        for position in range(self._offsets[table_id], self._offsets[table_id + 1]):
+            if raw_columns and position in raw_columns:
+                yield self._raw_record(raw_columns[position])
+                continue
+            data_type, is_primary, is_nullable = types[position], primary[position], nullable[position]
+            fk_table, fk_column = fk_tables[position], fk_columns[position]
+            yield (
+                strings[names[position]],
+                None if data_type == _NO_STRING else strings[data_type],
+                None if is_primary == _ABSENT else is_primary == _TRUE,
+                None if is_nullable == _ABSENT else is_nullable == _TRUE,
+                None if fk_table == _NO_STRING else strings[fk_table],
+                None if fk_column == _NO_STRING else strings[fk_column]
+            )
+
+    @staticmethod
+    def _raw_record(column: Any) -> ColumnRecord:
+        if not isinstance(column, Mapping):
+            return (None, None, None, None, None, None)
+        foreign_key = column.get("foreign_key")
+        foreign_key = foreign_key if isinstance(foreign_key, Mapping) else {}
+        return (
+            column.get("name"),
+            column.get("type"),
+            column.get("primary_key"),
+            column.get("nullable"),
+            foreign_key.get("table"),
+            foreign_key.get("column")
+        )
+
+    def foreign_keys(self) -> Iterator[Tuple[str, str, Any]]:
+        """(table, referenced table, column name) for every foreign key, in catalog order"""
+        for name in self._table_names:
+            for column_name, _, _, _, fk_table, _ in self.iter_columns(name):
+                if fk_table is not None:
+                    yield name, fk_table, column_name
+
+
+def columnar_catalog(catalog: Mapping) -> Mapping:
+    """``catalog`` with ``schema.tables`` converted to ColumnarTables
+
+    The other sections are not copied: they are still read (lazily, for
+    catalogs from ``open_catalog``) from ``catalog``.
+    """
+    schema = catalog.get("schema")
+    if not isinstance(schema, Mapping) or not isinstance(schema.get("tables"), Mapping):
+        return catalog
+    tables = ColumnarTables.from_tables(schema["tables"])
+    return ChainMap({"schema": ChainMap({"tables": tables}, schema)}, catalog)
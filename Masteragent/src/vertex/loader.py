@@ -0,0 +1,405 @@
+import ast
+import hashlib
+import json
+import logging
+import mmap
+import re
+import shutil
+import tempfile
+import threading
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# Python-literal exports under data/ name their sections differently
+SECTION_ALIASES = {
+    "datapedia_data": "datapedia",
+    "conceptual_model": "conceptual_model",
+    "existing_schema": "schema"
+}
+
+# Collections that are streamed member by member instead of decoded whole
+STREAMED = {"schema": ("tables",)}
+
+_WHITESPACE = re.compile(rb"\s*")
+_STRING = re.compile(rb'"[^"\\]*+(?:\\.[^"\\]*+)*+"', re.DOTALL)
+# Everything up to the next bracket outside a string, in one match
+_FLAT = re.compile(rb'[^"\[\]{}]*+(?:"[^"\\]*+(?:\\.[^"\\]*+)*+"[^"\[\]{}]*+)*+', re.DOTALL)
+_SCALAR = re.compile(rb"[^,\]}\s]+")
+
+Span = Tuple[int, int]
+
+
+def _skip_whitespace(buf, pos: int) -> int:
+    return _WHITESPACE.match(buf, pos).end()
+
+
+def _skip_value(buf, pos: int) -> int:
+    """Return the end offset of the JSON value starting at ``pos`` without decoding it"""
+    first = buf[pos:pos + 1]
+    if first == b'"':
+        return _STRING.match(buf, pos).end()
+    if first not in (b"{", b"["):
+        return _SCALAR.match(buf, pos).end()
+    depth = 0
+    size = len(buf)
+    while pos < size:
+        bracket = buf[pos]
+        if bracket in b"{[":
+            depth += 1
+        elif bracket in b"}]":
+            depth -= 1
+            if depth == 0:
+                return pos + 1
+        pos = _FLAT.match(buf, pos + 1).end()
+    raise ValueError(f"Unterminated JSON value at offset {pos}")
+
+
+class LazyMapping(Mapping):
+    """Read-only mapping whose values are decoded from spans of a buffer on access.
+
+    With ``cache`` the decoded values are kept; without it every access
+    decodes again, so iterating a huge collection holds one member at a time.
+    """
+
+    def __init__(self, decode: Callable[[str, Span], Any], cache: bool = True):
+        self._decode = decode
+        self._cache = cache
+        self._spans: Dict[str, Span] = {}
+        self._values: Dict[str, Any] = {}
+        self._complete = True
+        self._lock = threading.Lock()
+
+    def _scan(self, key: Optional[str] = None) -> None:
+        """Locate more keys until ``key`` is found (or all of them)"""
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._spans and not self._complete:
+            self._scan(key)
+        if key in self._values:
+            return self._values[key]
+        span = self._spans[key]
+        value = self._decode(key, span)
+        if self._cache:
+            self._values[key] = value
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        if key not in self._spans and not self._complete:
+            self._scan(key)
+        return key in self._spans
+
+    def __iter__(self) -> Iterator[str]:
+        if not self._complete:
+            self._scan()
+        return iter(list(self._spans))
+
+    def __len__(self) -> int:
+        if not self._complete:
+            self._scan()
+        return len(self._spans)
+
+    def __repr__(self) -> str:
+        state = "" if self._complete else ", partially scanned"
+        return f"<{type(self).__name__} {len(self._spans)} keys{state}>"
+
+
+class LazyJSONObject(LazyMapping):
+    """A JSON object in ``buf`` whose members are located on demand.
+
+    Keys are scanned incrementally, so reading an early section never walks
+    past it. ``streamed`` maps member names to the keyword arguments of the
+    ``LazyJSONObject`` they are opened as, instead of being decoded whole.
+    """
+
+    def __init__(
+        self,
+        buf,
+        start: int,
+        cache: bool = True,
+        streamed: Optional[Dict[str, Dict[str, Any]]] = None
+    ):
+        super().__init__(self._decode_member, cache)
+        self._buf = buf
+        self._streamed = streamed or {}
+        pos = _skip_whitespace(buf, start)
+        if buf[pos:pos + 1] != b"{":
+            raise ValueError(f"Expected a JSON object at offset {pos}")
+        self._cursor = pos + 1
+        self._complete = False
+        # A streamed child located but not yet scanned to its end
+        self._pending: Optional["LazyJSONObject"] = None
+
+    def _decode_member(self, key: str, span: Span) -> Any:
+        return json.loads(self._buf[span[0]:span[1]])
+
+    def _end(self) -> int:
+        """Offset just past the closing brace; scans the whole object"""
+        self._scan()
+        return self._cursor
+
+    def _scan(self, key: Optional[str] = None) -> None:
+        with self._lock:
+            buf = self._buf
+            if self._pending is not None:
+                # The child's own scan finds its end, so the bytes are read once
+                self._cursor = self._pending._end()
+                self._pending = None
+                self._cursor = self._after_value(self._cursor)
+            while not self._complete:
+                pos = _skip_whitespace(buf, self._cursor)
+                if buf[pos:pos + 1] == b"}":
+                    self._cursor = pos + 1
+                    self._complete = True
+                    break
+                match = _STRING.match(buf, pos)
+                if match is None:
+                    raise ValueError(f"Expected an object key at offset {pos}")
+                name = json.loads(match.group())
+                pos = _skip_whitespace(buf, match.end())
+                if buf[pos:pos + 1] != b":":
+                    raise ValueError(f"Expected ':' at offset {pos}")
+                value_start = _skip_whitespace(buf, pos + 1)
+                if name in self._streamed and buf[value_start:value_start + 1] == b"{":
+                    child = LazyJSONObject(buf, value_start, **self._streamed[name])
+                    self._spans[name] = (value_start, -1)
+                    self._values[name] = child
+                    if name == key:
+                        self._pending = child
+                        break
+                    value_end = child._end()
+                else:
+                    value_end = _skip_value(buf, value_start)
+                    self._spans[name] = (value_start, value_end)
+                self._cursor = self._after_value(value_end)
+                if name == key:
+                    break
+
+    def _after_value(self, pos: int) -> int:
+        pos = _skip_whitespace(self._buf, pos)
+        if self._buf[pos:pos + 1] == b",":
+            pos += 1
+        return pos
+
+
+class _JSONLCollection(LazyMapping):
+    """Named members of one JSONL collection, decoded line by line on access"""
+
+    def __init__(self, buf, cache: bool = False):
+        super().__init__(self._decode_line, cache)
+        self._buf = buf
+
+    def _decode_line(self, key: str, span: Span) -> Any:
+        return json.loads(self._buf[span[0]:span[1]])["value"]
+
+
+class _Section(LazyMapping):
+    """A catalog section assembled from JSONL records on first access"""
+
+    def __init__(self, buf, lines: List[Span], collections: Dict[str, _JSONLCollection]):
+        super().__init__(self._decode_field)
+        self._buf = buf
+        self._lines = lines
+        self._collections = collections
+        self._complete = False
+
+    def _decode_field(self, key: str, span: Span) -> Any:
+        return self._fields[key]
+
+    def _scan(self, key: Optional[str] = None) -> None:
+        with self._lock:
+            if self._complete:
+                return
+            fields: Dict[str, Any] = dict(self._collections)
+            for start, end in self._lines:
+                record = json.loads(self._buf[start:end])
+                field = record["key"]
+                if "item" in record:
+                    fields.setdefault(field, []).append(record["item"])
+                elif "name" in record:
+                    fields.setdefault(field, {})[record["name"]] = record["value"]
+                else:
+                    fields[field] = record["value"]
+            self._fields = fields
+            self._spans = {name: (0, 0) for name in fields}
+            self._complete = True
+
+
+def _map(f) -> Any:
+    try:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:
+        # Empty files cannot be mapped
+        return b""
+
+
+def _open_buffer(path: Path, private_copy: bool = False):
+    """Map ``path`` read-only, or a private copy of it.
+
+    Snapshots keep decoding from their buffer long after it was opened.
+    Mapping the file itself is safe when writers replace it by an atomic
+    rename: the mapping keeps the old inode alive, and the new inode and
+    mtime show up in the client's file signature. Rewriting it in place
+    would change (or, when truncated, unmap) the bytes under pinned
+    snapshots, so catalogs edited that way need ``private_copy``: an
+    unlinked temporary copy, at the cost of reading the file twice.
+    """
+    with open(path, "rb") as source:
+        if not private_copy:
+            return _map(source)
+        with tempfile.TemporaryFile() as copy:
+            shutil.copyfileobj(source, copy, 1 << 20)
+            copy.flush()
+            return _map(copy)
+
+
+def _is_json(path: Path) -> bool:
+    """JSON catalogs start with '{'; data/ exports start with an assignment"""
+    with open(path, "rb") as f:
+        head = f.read(4096)
+    return head.lstrip()[:1] == b"{"
+
+
+def load_python_literals(path: Path, text: Optional[str] = None) -> Dict[str, Any]:
+    """Evaluate the ``name = {...}`` literal assignments of a data/ export
+
+    ``text`` is the content of ``path`` when it was already read.
+    """
+    tree = ast.parse(Path(path).read_text() if text is None else text, filename=str(path))
+    values: Dict[str, Any] = {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign):
+            value = ast.literal_eval(node.value)
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    values[target.id] = value
+    return values
+
+
+def _literal_sections(path: Path, text: Optional[str] = None) -> Dict[str, Any]:
+    values = load_python_literals(path, text)
+    return {SECTION_ALIASES.get(name, name): value for name, value in values.items()}
+
+
+def _json_catalog(path: Path, private_copy: bool = False) -> LazyJSONObject:
+    return LazyJSONObject(
+        _open_buffer(path, private_copy),
+        0,
+        streamed={
+            section: {"streamed": {name: {"cache": False} for name in names}}
+            for section, names in STREAMED.items()
+        }
+    )
+
+
+def _jsonl_catalog(path: Path, private_copy: bool = False) -> Dict[str, _Section]:
+    """Index a JSONL catalog by section without decoding the payloads.
+
+    Each line is ``{"section": S, "key": K, ...}`` with one of
+    ``"name"`` + ``"value"`` (member K[name] of a keyed collection),
+    ``"item"`` (appended to list K) or just ``"value"`` (field K).
+    Keyed collections listed in ``STREAMED`` decode one member per access.
+    """
+    buf = _open_buffer(path, private_copy)
+    lines: Dict[str, List[Span]] = {}
+    collections: Dict[str, Dict[str, _JSONLCollection]] = {}
+    header = re.compile(rb'\s*\{\s*"section"\s*:\s*("(?:[^"\\]|\\.)*")\s*,\s*"key"\s*:\s*("(?:[^"\\]|\\.)*")\s*,\s*"name"\s*:\s*("(?:[^"\\]|\\.)*")')
+    start = 0
+    size = len(buf)
+    while start < size:
+        end = buf.find(b"\n", start)
+        end = size if end == -1 else end
+        if buf[start:end].strip():
+            match = header.match(buf, start, end)
+            section_key = None
+            if match:
+                section, key = json.loads(match.group(1)), json.loads(match.group(2))
+                if key in STREAMED.get(section, ()):
+                    section_key = (section, key, json.loads(match.group(3)))
+            if section_key is None:
+                # Records are small except streamed members, so decode the rest now
+                section = json.loads(buf[start:end])["section"]
+                lines.setdefault(section, []).append((start, end))
+            else:
+                section, key, name = section_key
+                collection = collections.setdefault(section, {}).setdefault(key, _JSONLCollection(buf))
+                collection._spans[name] = (start, end)
+        start = end + 1
+    return {
+        section: _Section(buf, lines.get(section, []), collections.get(section, {}))
+        for section in set(lines) | set(collections)
+    }
+
+
+class _DirectoryCatalog(LazyMapping):
+    """Sections spread over the files of a directory, each read on first access"""
+
+    _ASSIGNMENT = re.compile(r"^([A-Za-z_]\w*)\s*=", re.MULTILINE)
+
+    def __init__(self, path: Path, private_copy: bool = False):
+        super().__init__(self._decode_section)
+        self._files: Dict[str, Path] = {}
+        self._loaded: Dict[Path, Mapping] = {}
+        # Literal files are read now and parsed on first access, so later
+        # edits to the directory never leak into this catalog
+        self._texts: Dict[Path, str] = {}
+        for file in sorted(Path(path).glob("*.json")) + sorted(Path(path).glob("*.jsonl")):
+            if file.suffix == ".jsonl":
+                self._loaded[file] = _jsonl_catalog(file, private_copy)
+                sections = list(self._loaded[file])
+            elif _is_json(file):
+                # A plain JSON file holds the section named after it
+                self._loaded[file] = {file.stem: _json_catalog(file, private_copy)}
+                sections = [file.stem]
+            else:
+                self._texts[file] = file.read_text()
+                sections = [
+                    SECTION_ALIASES.get(name, name)
+                    for name in self._ASSIGNMENT.findall(self._texts[file])
+                ]
+            for section in sections:
+                self._files.setdefault(section, file)
+        self._spans = {section: (0, 0) for section in self._files}
+
+    def _decode_section(self, section: str, span: Span) -> Any:
+        file = self._files[section]
+        if file not in self._loaded:
+            self._loaded[file] = _literal_sections(file, self._texts.pop(file))
+        return self._loaded[file][section]
+
+
+def source_hash(path: Path) -> str:
+    """Hash of the bytes a catalog is read from (every catalog file of a directory)"""
+    path = Path(path)
+    files = sorted(path.glob("*.json")) + sorted(path.glob("*.jsonl")) if path.is_dir() else [path]
+    digest = hashlib.sha256()
+    for file in files:
+        digest.update(file.name.encode("utf-8") + b"\0")
+        with open(file, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def open_catalog(path: Path, private_copy: bool = False) -> Mapping:
+    """Open a catalog for lazy, read-only access.
+
+    ``path`` may be a JSON object with one member per section (vertex.json),
+    a JSONL file of section records, a Python-literal export like the files
+    under data/, or a directory of such files. Sections are parsed on first
+    access and ``schema.tables`` is decoded one table at a time.
+
+    JSON and JSONL files are mapped, not read: writers must replace them by
+    an atomic rename unless ``private_copy`` is set (see ``_open_buffer``).
+    """
+    path = Path(path)
+    if path.is_dir():
+        catalog: Mapping = _DirectoryCatalog(path, private_copy)
+    elif path.suffix == ".jsonl":
+        catalog = _jsonl_catalog(path, private_copy)
+    elif _is_json(path):
+        catalog = _json_catalog(path, private_copy)
+    else:
+        catalog = _literal_sections(path)
+    logging.info(f"Opened catalog {path}")
+    return catalog
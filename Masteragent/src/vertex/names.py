@@ -0,0 +1,135 @@
+import functools
+import re
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+_CAMEL_BOUNDARY = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+_SEPARATORS = re.compile(r"[^a-z0-9]+")
+# Code and key columns name the entity they point at (customer_id, status_cd)
+_KEY_SUFFIXES = ("_cd", "_id")
+# Singular forms that already end in "s"
+_SINGULAR_ENDINGS = ("ss", "us", "is")
+_SAME_PLURAL = frozenset(("series", "species", "news"))
+
+
+def _singular(word: str) -> str:
+    if word in _SAME_PLURAL:
+        return word
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if word.endswith(("sses", "xes", "ches", "shes", "uses")):
+        return word[:-2]
+    if len(word) > 2 and word.endswith("s") and not word.endswith(_SINGULAR_ENDINGS):
+        return word[:-1]
+    return word
+
+
+@functools.lru_cache(maxsize=65536)
+def attribute_key(name: str) -> str:
+    """Case- and separator-insensitive form of an attribute name
+
+    ``customerId``, ``CUSTOMER-ID`` and ``customer_id`` match, but key
+    suffixes and plurals are kept: ``status_cd`` and ``status`` are
+    different attributes, as are ``customer_id`` and ``customer``.
+    """
+    return _SEPARATORS.sub("_", _CAMEL_BOUNDARY.sub("_", name).lower()).strip("_")
+
+
+@functools.lru_cache(maxsize=65536)
+def canonical_name(name: str) -> str:
+    """Case-, separator-, suffix- and plural-insensitive form of an entity name
+
+    ``Customer``, ``customers``, ``customer_id`` and ``CUSTOMER-CD`` all map
+    to ``customer``; ``FinancialProducts`` maps to ``financial_product``.
+    Use ``attribute_key`` to compare attributes of one entity.
+    """
+    name = attribute_key(name)
+    for suffix in _KEY_SUFFIXES:
+        if name.endswith(suffix) and len(name) > len(suffix):
+            name = name[:-len(suffix)]
+            break
+    head, separator, last = name.rpartition("_")
+    return head + separator + _singular(last)
+
+
+def conceptual_entities(conceptual: Mapping) -> Iterable[Tuple[str, Any]]:
+    """(name, definition) of every concept; vertex.json uses "entities",
+    the conceptual model export uses "business_concepts"
+    """
+    for key in ("entities", "business_concepts"):
+        concepts = conceptual.get(key, {})
+        if isinstance(concepts, Mapping):
+            yield from concepts.items()
+
+
+def attribute_names(attributes: Any) -> List[str]:
+    """Attribute names from a list of names, a name -> spec map or a list of specs"""
+    if isinstance(attributes, Mapping):
+        return list(attributes)
+    return [a.get("name", "") if isinstance(a, Mapping) else str(a) for a in attributes or []]
+
+
+class NameIndex:
+    """Canonical entity names across datapedia, the conceptual model and the schema
+
+    Each entity is filed under the canonical form of its name and keyed by
+    the first spelling seen (datapedia, then conceptual model, then schema),
+    so cross-source matches resolve the same way on every run with a single
+    dict lookup. A conceptual ``sub_types`` entry is an alias of its concept
+    unless another section defines an entity of that name, in which case
+    the concept is recorded as that entity's supertype.
+    """
+
+    def __init__(self):
+        self._keys: Dict[str, str] = {}
+        self._members: Dict[str, List[Tuple[str, str]]] = {}
+        self._supertypes: Dict[str, List[str]] = {}
+
+    @classmethod
+    def from_catalog(cls, datapedia: Mapping, conceptual: Mapping, schema: Mapping) -> "NameIndex":
+        index = cls()
+        concepts = list(conceptual_entities(conceptual))
+        for name in datapedia.get("entities", {}):
+            index.add("datapedia", name)
+        for name, _ in concepts:
+            index.add("conceptual", name)
+        for name in schema.get("tables", {}):
+            index.add("schema", name)
+        # Sub-types are resolved last so real entities always take precedence
+        for name, concept in concepts:
+            if isinstance(concept, Mapping):
+                for sub_type in concept.get("sub_types", []) or []:
+                    index.add_sub_type(name, sub_type)
+        return index
+
+    def add(self, section: str, name: str) -> str:
+        """File ``name`` from ``section`` and return the key of its entity"""
+        key = self._keys.setdefault(canonical_name(name), name)
+        self._members.setdefault(key, []).append((section, name))
+        return key
+
+    def add_sub_type(self, concept: str, sub_type: str) -> None:
+        concept_key = self.resolve(concept) or concept
+        canonical = canonical_name(sub_type)
+        key = self._keys.get(canonical)
+        if key is None:
+            self._keys[canonical] = concept_key
+        elif key != concept_key and concept_key not in self._supertypes.get(key, []):
+            self._supertypes.setdefault(key, []).append(concept_key)
+
+    def resolve(self, name: str) -> Optional[str]:
+        """Key of the entity ``name`` refers to, or None if it names none"""
+        return self._keys.get(canonical_name(name))
+
+    def members(self, key: str) -> List[Tuple[str, str]]:
+        """(section, name) of every catalog entry merged into ``key``"""
+        return self._members.get(key, [])
+
+    def supertypes(self, key: str) -> List[str]:
+        return self._supertypes.get(key, [])
+
+    def __contains__(self, name: str) -> bool:
+        return self.resolve(name) is not None
+
+    def __len__(self) -> int:
+        return len(self._members)
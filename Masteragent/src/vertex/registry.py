@@ -0,0 +1,210 @@
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+from .async_api import run_blocking
+from .vertex_client import VertexDBClient
+
+# Files and directories under a catalog root that hold a catalog
+_CATALOG_SUFFIXES = (".json", ".jsonl")
+
+
+class CatalogRegistry:
+    """Loads catalogs on demand and keeps the recently used ones in memory.
+
+    Catalogs are addressed by id: an id registered with a path, the name of
+    a catalog under ``root`` (``<root>/<id>.json``, ``.jsonl`` or a
+    directory), or otherwise a path. Loaded catalogs are kept, already
+    indexed, in an LRU bounded by ``max_bytes`` of memory, as measured by
+    ``VertexDBClient.nbytes`` once a catalog is loaded and indexed, and
+    again by the first request after a new version of it was swapped in;
+    the least recently used ones are evicted first, but the most recent
+    catalog is always kept.
+
+    Concurrent requests for a catalog that is not loaded yet share a single
+    load. An evicted client keeps working for runs that still hold it.
+    """
+
+    def __init__(
+        self,
+        catalogs: Optional[Mapping[str, Path]] = None,
+        root: Optional[Path] = None,
+        max_bytes: int = 1 << 30,
+        watch_interval: Optional[float] = None,
+        sizeof: Callable[[VertexDBClient], int] = VertexDBClient.nbytes,
+        **client_options: Any
+    ):
+        self._paths: Dict[str, Path] = {name: Path(path) for name, path in (catalogs or {}).items()}
+        self.root = Path(root) if root else None
+        self.max_bytes = max_bytes
+        self.watch_interval = watch_interval
+        self._sizeof = sizeof
+        self._client_options = client_options
+        self._lock = threading.Lock()
+        self._clients: "OrderedDict[str, VertexDBClient]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        # Catalog version each size was measured at
+        self._measured: Dict[str, int] = {}
+        self._loading: Dict[str, Future] = {}
+        self._stats = {"hits": 0, "misses": 0, "shared_loads": 0, "evictions": 0}
+
+    def register(self, catalog_id: str, path: Path) -> None:
+        """Serve ``catalog_id`` from ``path``; a loaded copy is dropped"""
+        with self._lock:
+            self._paths[catalog_id] = Path(path)
+        self.evict(catalog_id)
+
+    def catalog_ids(self) -> List[str]:
+        """Registered catalogs and those found under ``root``"""
+        ids = set(self._paths)
+        if self.root and self.root.is_dir():
+            for entry in self.root.iterdir():
+                if entry.is_dir() or entry.suffix in _CATALOG_SUFFIXES:
+                    ids.add(entry.stem)
+        return sorted(ids)
+
+    def path_for(self, catalog_id: str) -> Path:
+        if catalog_id in self._paths:
+            return self._paths[catalog_id]
+        if self.root:
+            for candidate in [self.root / catalog_id] + [self.root / f"{catalog_id}{suffix}" for suffix in _CATALOG_SUFFIXES]:
+                if candidate.exists():
+                    return candidate
+        path = Path(catalog_id)
+        if not path.exists():
+            raise KeyError(f"Unknown catalog {catalog_id!r}")
+        return path
+
+    def get(self, catalog_id: str) -> VertexDBClient:
+        """The client for ``catalog_id``, loading it if needed"""
+        client, future, owner = self._claim(catalog_id)
+        if client is not None:
+            if self._is_stale(catalog_id, client):
+                self._remeasure(catalog_id, client)
+            return client
+        if not owner:
+            return future.result()
+        return self._load(catalog_id, future)
+
+    async def aget(self, catalog_id: str) -> VertexDBClient:
+        """Like ``get``; loads run on the catalog executor and waiters hold no thread"""
+        client, future, owner = self._claim(catalog_id)
+        if client is not None:
+            if self._is_stale(catalog_id, client):
+                await run_blocking(self._remeasure, catalog_id, client)
+            return client
+        if not owner:
+            return await asyncio.wrap_future(future)
+        return await run_blocking(self._load, catalog_id, future)
+
+    def _claim(self, catalog_id: str) -> Tuple[Optional[VertexDBClient], Optional[Future], bool]:
+        """Return the cached client, or the load to wait for and whether the caller runs it"""
+        with self._lock:
+            client = self._clients.get(catalog_id)
+            if client is not None:
+                self._clients.move_to_end(catalog_id)
+                self._stats["hits"] += 1
+                return client, None, False
+            future = self._loading.get(catalog_id)
+            if future is not None:
+                self._stats["shared_loads"] += 1
+                return None, future, False
+            self._stats["misses"] += 1
+            future = self._loading[catalog_id] = Future()
+            return None, future, True
+
+    def _load(self, catalog_id: str, future: Future) -> VertexDBClient:
+        client = None
+        try:
+            client = VertexDBClient(self.path_for(catalog_id), **self._client_options)
+            # Cached catalogs are served indexed, so the first run pays nothing extra
+            client.snapshot().build_indexes()
+            version = client.version
+            if self.watch_interval:
+                client.watch(self.watch_interval)
+            size = self._sizeof(client)
+        except BaseException as e:
+            # A client that never made it into the cache must not keep polling
+            if client is not None:
+                client.stop_watching()
+            with self._lock:
+                del self._loading[catalog_id]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            del self._loading[catalog_id]
+            self._clients[catalog_id] = client
+            self._sizes[catalog_id] = size
+            self._measured[catalog_id] = version
+            evicted = self._evict_over_budget()
+        self._stop_evicted(evicted)
+        logging.info(f"Loaded catalog {catalog_id} ({size / 2**20:.1f} MB)")
+        future.set_result(client)
+        return client
+
+    def _is_stale(self, catalog_id: str, client: VertexDBClient) -> bool:
+        """Whether a newer catalog version was swapped in since ``client`` was measured"""
+        return self._measured.get(catalog_id, client.version) != client.version
+
+    def _remeasure(self, catalog_id: str, client: VertexDBClient) -> None:
+        version = client.version
+        with self._lock:
+            if self._clients.get(catalog_id) is not client or self._measured.get(catalog_id) == version:
+                return
+            # Claimed before measuring so concurrent requests do not measure too
+            self._measured[catalog_id] = version
+        size = self._sizeof(client)
+        with self._lock:
+            if self._clients.get(catalog_id) is not client:
+                return
+            self._sizes[catalog_id] = size
+            evicted = self._evict_over_budget()
+        self._stop_evicted(evicted)
+        logging.info(f"Re-measured catalog {catalog_id} at v{version} ({size / 2**20:.1f} MB)")
+
+    @staticmethod
+    def _stop_evicted(evicted: List[Tuple[str, VertexDBClient]]) -> None:
+        for name, old in evicted:
+            old.stop_watching()
+            logging.info(f"Evicted catalog {name} from the registry")
+
+    def _evict_over_budget(self) -> List[Tuple[str, VertexDBClient]]:
+        evicted = []
+        while len(self._clients) > 1 and sum(self._sizes.values()) > self.max_bytes:
+            name, client = self._clients.popitem(last=False)
+            del self._sizes[name]
+            self._measured.pop(name, None)
+            self._stats["evictions"] += 1
+            evicted.append((name, client))
+        return evicted
+
+    def evict(self, catalog_id: str) -> None:
+        with self._lock:
+            client = self._clients.pop(catalog_id, None)
+            self._sizes.pop(catalog_id, None)
+            self._measured.pop(catalog_id, None)
+        if client is not None:
+            client.stop_watching()
+
+    def clear(self) -> None:
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+            self._sizes.clear()
+            self._measured.clear()
+        for client in clients:
+            client.stop_watching()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._stats,
+                "loaded": list(self._clients),
+                "bytes": sum(self._sizes.values()),
+                "max_bytes": self.max_bytes
+            }
@@ -0,0 +1,192 @@
+import heapq
+import logging
+import mmap
+import sys
+import threading
+import time
+from collections import ChainMap
+from typing import Any, Dict, List, Optional, Tuple
+
+from .columnar import ColumnarTables
+from .loader import LazyMapping
+from .names import NameIndex
+from .validation import ValidationReport, content_hash, validate_catalog
+
+
+def retained_bytes(*roots: Any) -> int:
+    """Approximate memory reachable from ``roots``, each object counted once.
+
+    Lazy mappings count their spans, the values they cached and the buffer
+    they decode from, but not members that are decoded again on every
+    access; columnar tables count their arrays and string pool.
+    """
+    seen = set()
+    size = 0
+    stack = list(roots)
+    while stack:
+        value = stack.pop()
+        if id(value) in seen:
+            continue
+        seen.add(id(value))
+        if isinstance(value, ColumnarTables):
+            size += value.nbytes
+        elif isinstance(value, mmap.mmap):
+            size += len(value)
+        else:
+            size += sys.getsizeof(value)
+            if isinstance(value, dict):
+                stack.extend(value)
+                stack.extend(value.values())
+            elif isinstance(value, (list, tuple, set, frozenset)):
+                stack.extend(value)
+            elif isinstance(value, ChainMap):
+                stack.extend(value.maps)
+            elif isinstance(value, (LazyMapping, NameIndex)):
+                stack.extend(vars(value).values())
+    return size
+
+
+class CatalogSnapshot:
+    """One version of the catalog together with its lookup indexes.
+
+    Snapshots are never modified after they are published: a reload or an
+    edit produces a new snapshot, so a reader holding one sees a consistent
+    catalog for as long as it keeps it.
+    """
+
+    def __init__(self, data: Dict[str, Any], version: int, source_hash: Optional[str] = None):
+        self.data = data
+        self.version = version
+        self.loaded_at = time.time()
+        # Until it is modified, a catalog read from disk is identified by its source bytes
+        self._content_hash = source_hash
+        self._lock = threading.Lock()
+        self._entity_index: Optional[Dict[str, str]] = None
+        self._names: Optional[NameIndex] = None
+        self._relationships: List[Tuple[str, Any]] = []
+        self._outgoing: Dict[str, List[int]] = {}
+        self._incoming: Dict[str, List[int]] = {}
+
+    @property
+    def content_hash(self) -> str:
+        if self._content_hash is None:
+            self._content_hash = content_hash(self.data)
+        return self._content_hash
+
+    def build_indexes(self) -> None:
+        """Build the entity and adjacency indexes (once)"""
+        if self._entity_index is not None:
+            return
+        with self._lock:
+            if self._entity_index is not None:
+                return
+
+            # Only the owning section is kept so lazily loaded tables are not
+            # pinned in memory; earlier sections win on duplicate names
+            entity_index: Dict[str, str] = {}
+            for source, definitions in self._entity_sections():
+                for name in definitions:
+                    entity_index.setdefault(name, source)
+
+            relationships: List[Tuple[str, Any]] = []
+            for source in ("datapedia", "conceptual_model"):
+                for rel in self.data.get(source, {}).get("relationships", []):
+                    relationships.append((source, rel))
+            # Foreign keys are kept as (table, referenced table, column) and only
+            # expanded into relationship records when looked up
+            tables = self.data.get("schema", {}).get("tables", {})
+            if isinstance(tables, ColumnarTables):
+                relationships.extend(("schema", foreign_key) for foreign_key in tables.foreign_keys())
+            else:
+                for table_name, table_data in tables.items():
+                    for column in table_data.get("columns", []):
+                        if "foreign_key" in column:
+                            relationships.append(("schema", (table_name, column["foreign_key"]["table"], column["name"])))
+
+            # Positions are appended in catalog order, so every list stays sorted
+            outgoing: Dict[str, List[int]] = {}
+            incoming: Dict[str, List[int]] = {}
+            for position, (_, rel) in enumerate(relationships):
+                source, target = (rel[0], rel[1]) if isinstance(rel, tuple) else (rel.get("source"), rel.get("target"))
+                if source is not None:
+                    outgoing.setdefault(source, []).append(position)
+                if target is not None:
+                    incoming.setdefault(target, []).append(position)
+
+            names = NameIndex.from_catalog(
+                self.data.get("datapedia", {}),
+                self.data.get("conceptual_model", {}),
+                self.data.get("schema", {})
+            )
+
+            self._relationships = relationships
+            self._names = names
+            self._outgoing = outgoing
+            self._incoming = incoming
+            # Published last: readers only check this field
+            self._entity_index = entity_index
+            logging.info(
+                f"Indexed catalog v{self.version}: {len(entity_index)} entities, "
+                f"{len(relationships)} relationships, {len(names)} canonical names"
+            )
+
+    def nbytes(self) -> int:
+        """Approximate memory held by this snapshot: the buffers it reads
+        from, the sections it decoded and kept, and its indexes.
+
+        Walks everything the snapshot retains, so it costs about as much as
+        building the indexes; measure once, after ``build_indexes``, when
+        the sections the indexes read have been decoded.
+        """
+        return retained_bytes(
+            self.data, self._entity_index, self._names, self._relationships, self._outgoing, self._incoming
+        )
+
+    def name_index(self) -> NameIndex:
+        self.build_indexes()
+        return self._names
+
+    def _entity_sections(self) -> List[Tuple[str, Dict[str, Any]]]:
+        return [
+            ("datapedia", self.data.get("datapedia", {}).get("entities", {})),
+            ("conceptual_model", self.data.get("conceptual_model", {}).get("entities", {})),
+            ("schema", self.data.get("schema", {}).get("tables", {}))
+        ]
+
+    def _relationship_entries(self, positions) -> List[Dict[str, Any]]:
+        entries = []
+        for position in positions:
+            source, rel = self._relationships[position]
+            if isinstance(rel, tuple):
+                rel = {"source": rel[0], "target": rel[1], "type": "foreign_key", "column": rel[2]}
+            entries.append({"source": source, "data": rel})
+        return entries
+
+    def get_entity(self, entity_name: str) -> Optional[Dict[str, Any]]:
+        self.build_indexes()
+        source = self._entity_index.get(entity_name)
+        if source is None:
+            return None
+        return {"source": source, "data": dict(self._entity_sections())[source][entity_name]}
+
+    def get_relationships_for_entity(self, entity_name: str) -> List[Dict[str, Any]]:
+        self.build_indexes()
+        outgoing = self._outgoing.get(entity_name, [])
+        incoming = self._incoming.get(entity_name, [])
+        positions = []
+        # Merge in catalog order; self-references appear in both lists
+        for position in heapq.merge(outgoing, incoming):
+            if not positions or positions[-1] != position:
+                positions.append(position)
+        return self._relationship_entries(positions)
+
+    def get_outgoing_relationships(self, entity_name: str) -> List[Dict[str, Any]]:
+        self.build_indexes()
+        return self._relationship_entries(self._outgoing.get(entity_name, []))
+
+    def get_incoming_relationships(self, entity_name: str) -> List[Dict[str, Any]]:
+        self.build_indexes()
+        return self._relationship_entries(self._incoming.get(entity_name, []))
+
+    def validate(self) -> ValidationReport:
+        return validate_catalog(self.data, self.content_hash)
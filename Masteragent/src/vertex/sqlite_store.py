@@ -0,0 +1,405 @@
+"""SQLite-backed catalog with the VertexDBClient read API.
+
+Entities, tables, columns and relationships are stored as indexed rows, so
+lookups are single indexed queries and nothing is kept in memory between
+calls. The database runs in WAL mode, so several worker processes can read
+one catalog file while another re-imports it.
+
+    python -m src.vertex.sqlite_store src/vertex/vertex.json catalog.sqlite3
+"""
+import argparse
+import json
+import logging
+import sqlite3
+import threading
+from collections.abc import ItemsView, Mapping
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .async_api import AsyncCatalogAPI
+from .loader import open_catalog, source_hash
+from .validation import ValidationReport, content_hash, validate_catalog
+
+# Collections stored as entity rows, in get_entity lookup order
+_COLLECTIONS = (
+    ("datapedia", "entities"),
+    ("conceptual_model", "entities"),
+    ("conceptual_model", "business_concepts"),
+    ("schema", "tables")
+)
+# get_entity only resolves the collections VertexDBClient resolves
+_LOOKUP_RANK = {("datapedia", "entities"): 0, ("conceptual_model", "entities"): 1, ("schema", "tables"): 2}
+_RELATIONSHIP_SECTIONS = ("datapedia", "conceptual_model")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS sections (
+    section TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    fields TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entities (
+    section TEXT NOT NULL,
+    collection TEXT NOT NULL,
+    name TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    lookup_rank INTEGER,
+    definition TEXT NOT NULL,
+    PRIMARY KEY (section, collection, name)
+);
+CREATE INDEX IF NOT EXISTS entities_by_name ON entities (name, lookup_rank);
+CREATE INDEX IF NOT EXISTS entities_by_position ON entities (section, collection, position);
+CREATE TABLE IF NOT EXISTS columns (
+    table_name TEXT NOT NULL,
+    table_position INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    name TEXT,
+    fk_table TEXT,
+    definition TEXT NOT NULL,
+    PRIMARY KEY (table_name, position)
+);
+CREATE INDEX IF NOT EXISTS columns_by_fk_table ON columns (fk_table) WHERE fk_table IS NOT NULL;
+CREATE TABLE IF NOT EXISTS relationships (
+    id INTEGER PRIMARY KEY,
+    section TEXT NOT NULL,
+    source TEXT,
+    target TEXT,
+    definition TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS relationships_by_source ON relationships (source);
+CREATE INDEX IF NOT EXISTS relationships_by_target ON relationships (target);
+"""
+
+
+_dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+
+class _CollectionItems(ItemsView):
+    """Items read in one ordered scan instead of a query per key"""
+
+    def __iter__(self):
+        view = self._mapping
+        for name, definition in view._store._query(
+            "SELECT name, definition FROM entities WHERE section = ? AND collection = ? ORDER BY position",
+            (view._section, view._collection)
+        ):
+            yield name, view._store._definition(view._section, name, definition)
+
+
+class _CollectionView(Mapping):
+    """Read-only mapping over one entity collection; rows are read per access"""
+
+    def __init__(self, store: "SQLiteCatalogStore", section: str, collection: str):
+        self._store = store
+        self._section = section
+        self._collection = collection
+
+    def __getitem__(self, name: str) -> Any:
+        row = self._store._query_one(
+            "SELECT definition FROM entities WHERE section = ? AND collection = ? AND name = ?",
+            (self._section, self._collection, name)
+        )
+        if row is None:
+            raise KeyError(name)
+        return self._store._definition(self._section, name, row[0])
+
+    def __contains__(self, name: object) -> bool:
+        return self._store._query_one(
+            "SELECT 1 FROM entities WHERE section = ? AND collection = ? AND name = ?",
+            (self._section, self._collection, name)
+        ) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        for (name,) in self._store._query(
+            "SELECT name FROM entities WHERE section = ? AND collection = ? ORDER BY position",
+            (self._section, self._collection)
+        ):
+            yield name
+
+    def items(self) -> "_CollectionItems":
+        return _CollectionItems(self)
+
+    def __len__(self) -> int:
+        return self._store._query_one(
+            "SELECT COUNT(*) FROM entities WHERE section = ? AND collection = ?",
+            (self._section, self._collection)
+        )[0]
+
+
+class SQLiteCatalogStore(AsyncCatalogAPI):
+    """Catalog stored in SQLite, with the read methods of VertexDBClient"""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._local = threading.local()
+        self._connection().executescript(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections are per thread; each worker process opens its own
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.db_path, timeout=30)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    def _query(self, sql: str, params: Tuple = ()) -> Iterator[Tuple]:
+        return self._connection().execute(sql, params)
+
+    def _query_one(self, sql: str, params: Tuple = ()) -> Optional[Tuple]:
+        return self._connection().execute(sql, params).fetchone()
+
+    def _definition(self, section: str, name: str, definition: str) -> Dict[str, Any]:
+        value = json.loads(definition)
+        if section == "schema":
+            value["columns"] = [
+                json.loads(column) for (column,) in self._query(
+                    "SELECT definition FROM columns WHERE table_name = ? ORDER BY position", (name,)
+                )
+            ]
+        return value
+
+    def import_catalog(self, source: Union[Path, Mapping], batch_size: int = 1000) -> None:
+        """Replace the stored catalog with a JSON/JSONL catalog file or mapping.
+
+        Tables are streamed in batches, and the whole import is one
+        transaction, so concurrent readers see either the old catalog or
+        the new one.
+        """
+        if isinstance(source, Mapping):
+            catalog, digest = source, content_hash(source)
+        else:
+            catalog, digest = open_catalog(Path(source)), source_hash(Path(source))
+
+        db = self._connection()
+        with db:
+            for table in ("meta", "sections", "entities", "columns", "relationships"):
+                db.execute(f"DELETE FROM {table}")
+            stored = {(section, collection) for section, collection in _COLLECTIONS}
+            for section_position, (section, content) in enumerate(catalog.items()):
+                if not isinstance(content, Mapping):
+                    db.execute(
+                        "INSERT INTO sections VALUES (?, ?, ?)",
+                        (section, section_position, _dumps({"__value__": content}))
+                    )
+                    continue
+                fields = {
+                    key: value for key, value in content.items()
+                    if (section, key) not in stored
+                    and not (section in _RELATIONSHIP_SECTIONS and key == "relationships")
+                }
+                # Key order of the section is kept for get_data
+                fields["__keys__"] = list(content)
+                db.execute("INSERT INTO sections VALUES (?, ?, ?)", (section, section_position, _dumps(fields)))
+
+                if section in _RELATIONSHIP_SECTIONS:
+                    db.executemany(
+                        "INSERT INTO relationships (section, source, target, definition) VALUES (?, ?, ?, ?)",
+                        (
+                            (section, rel.get("source"), rel.get("target"), _dumps(rel))
+                            for rel in content.get("relationships", []) or []
+                        )
+                    )
+                for collection in [key for (name, key) in _COLLECTIONS if name == section]:
+                    if isinstance(content.get(collection), Mapping):
+                        self._import_collection(db, section, collection, content[collection], batch_size)
+
+            db.execute("INSERT INTO meta VALUES ('content_hash', ?)", (digest,))
+        logging.info(f"Imported catalog into {self.db_path}")
+
+    def _import_collection(
+        self,
+        db: sqlite3.Connection,
+        section: str,
+        collection: str,
+        definitions: Mapping,
+        batch_size: int
+    ) -> None:
+        rank = _LOOKUP_RANK.get((section, collection))
+        entities: List[Tuple] = []
+        columns: List[Tuple] = []
+
+        def flush() -> None:
+            db.executemany("INSERT INTO entities VALUES (?, ?, ?, ?, ?, ?)", entities)
+            db.executemany("INSERT INTO columns VALUES (?, ?, ?, ?, ?, ?)", columns)
+            entities.clear()
+            columns.clear()
+
+        for position, (name, definition) in enumerate(definitions.items()):
+            if section == "schema" and isinstance(definition, Mapping):
+                definition = dict(definition)
+                for column_position, column in enumerate(definition.pop("columns", []) or []):
+                    # Decoded JSON is plain dicts; the ABC check is only a fallback
+                    is_mapping = type(column) is dict or isinstance(column, Mapping)
+                    foreign_key = column.get("foreign_key") if is_mapping else None
+                    columns.append((
+                        name,
+                        position,
+                        column_position,
+                        column.get("name") if is_mapping else None,
+                        foreign_key.get("table") if type(foreign_key) is dict or isinstance(foreign_key, Mapping) else None,
+                        _dumps(column)
+                    ))
+            entities.append((section, collection, name, position, rank, _dumps(definition)))
+            if len(entities) >= batch_size:
+                flush()
+        flush()
+
+    def get_data(self) -> Dict[str, Any]:
+        """Get all data as a read-only view; collections are read on access"""
+        catalog: Dict[str, Any] = {}
+        for section, fields in self._query("SELECT section, fields FROM sections ORDER BY position"):
+            fields = json.loads(fields)
+            if "__value__" in fields:
+                catalog[section] = fields["__value__"]
+                continue
+            content: Dict[str, Any] = {}
+            for key in fields.pop("__keys__"):
+                if key in fields:
+                    content[key] = fields[key]
+                elif key == "relationships":
+                    content[key] = [
+                        json.loads(definition) for (definition,) in self._query(
+                            "SELECT definition FROM relationships WHERE section = ? ORDER BY id", (section,)
+                        )
+                    ]
+                else:
+                    content[key] = _CollectionView(self, section, key)
+            catalog[section] = content
+        return catalog
+
+    def get_datapedia(self) -> Dict[str, Any]:
+        """Get datapedia section"""
+        return self.get_data().get("datapedia", {})
+
+    def get_conceptual_model(self) -> Dict[str, Any]:
+        """Get conceptual model section"""
+        return self.get_data().get("conceptual_model", {})
+
+    def get_schema(self) -> Dict[str, Any]:
+        """Get schema section"""
+        return self.get_data().get("schema", {})
+
+    def get_entity(self, entity_name: str) -> Optional[Dict[str, Any]]:
+        """Get specific entity from any source"""
+        row = self._query_one(
+            "SELECT section, definition FROM entities WHERE name = ? AND lookup_rank IS NOT NULL "
+            "ORDER BY lookup_rank LIMIT 1",
+            (entity_name,)
+        )
+        if row is None:
+            return None
+        section, definition = row
+        return {"source": section, "data": self._definition(section, entity_name, definition)}
+
+    def get_entities(self, entity_names: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Get several entities with one query per batch of names"""
+        names = list(dict.fromkeys(entity_names))
+        found: Dict[str, Tuple[int, str, str]] = {}
+        # Stay well below SQLite's bound-parameter limit
+        for start in range(0, len(names), 500):
+            batch = names[start:start + 500]
+            placeholders = ",".join("?" * len(batch))
+            for name, rank, section, definition in self._query(
+                "SELECT name, lookup_rank, section, definition FROM entities "
+                f"WHERE name IN ({placeholders}) AND lookup_rank IS NOT NULL",
+                tuple(batch)
+            ):
+                if name not in found or rank < found[name][0]:
+                    found[name] = (rank, section, definition)
+        return {
+            name: (
+                {"source": found[name][1], "data": self._definition(found[name][1], name, found[name][2])}
+                if name in found else None
+            )
+            for name in names
+        }
+
+    def _relationship_rows(self, where: str, params: Tuple) -> List[Dict[str, Any]]:
+        return [
+            {"source": section, "data": json.loads(definition)}
+            for section, definition in self._query(
+                f"SELECT section, definition FROM relationships WHERE {where} ORDER BY id", params
+            )
+        ]
+
+    def _foreign_key_rows(self, where: str, params: Tuple) -> List[Dict[str, Any]]:
+        return [
+            {
+                "source": "schema",
+                "data": {"source": table_name, "target": fk_table, "type": "foreign_key", "column": name}
+            }
+            for table_name, fk_table, name in self._query(
+                "SELECT table_name, fk_table, name FROM columns "
+                f"WHERE fk_table IS NOT NULL AND ({where}) ORDER BY table_position, position",
+                params
+            )
+        ]
+
+    def get_relationships_for_entity(self, entity_name: str) -> List[Dict[str, Any]]:
+        """Get all relationships involving an entity"""
+        return (
+            self._relationship_rows("source = ? OR target = ?", (entity_name, entity_name))
+            + self._foreign_key_rows("table_name = ? OR fk_table = ?", (entity_name, entity_name))
+        )
+
+    def get_outgoing_relationships(self, entity_name: str) -> List[Dict[str, Any]]:
+        """Get relationships whose source is the entity"""
+        return (
+            self._relationship_rows("source = ?", (entity_name,))
+            + self._foreign_key_rows("table_name = ?", (entity_name,))
+        )
+
+    def get_incoming_relationships(self, entity_name: str) -> List[Dict[str, Any]]:
+        """Get relationships whose target is the entity"""
+        return (
+            self._relationship_rows("target = ?", (entity_name,))
+            + self._foreign_key_rows("fk_table = ?", (entity_name,))
+        )
+
+    def validate(self) -> ValidationReport:
+        """Validate the stored catalog; cached by the hash recorded at import"""
+        row = self._query_one("SELECT value FROM meta WHERE key = 'content_hash'")
+        data = self.get_data()
+        return validate_catalog(data, row[0] if row else content_hash(data))
+
+    def validate_data(self) -> bool:
+        """Validate data structure"""
+        try:
+            return self.validate().valid
+        except Exception as e:
+            logging.error(f"Error validating data: {e}")
+            return False
+
+    def _count(self, sql: str, params: Tuple) -> int:
+        return self._query_one(sql, params)[0]
+
+    def get_vertex_info(self) -> Dict[str, Any]:
+        """Get summary information about the vertex data"""
+        entities = "SELECT COUNT(*) FROM entities WHERE section = ? AND collection = ?"
+        relationships = "SELECT COUNT(*) FROM relationships WHERE section = ?"
+        return {
+            "datapedia_entities": self._count(entities, ("datapedia", "entities")),
+            "datapedia_relationships": self._count(relationships, ("datapedia",)),
+            "conceptual_entities": self._count(entities, ("conceptual_model", "entities")),
+            "conceptual_relationships": self._count(relationships, ("conceptual_model",)),
+            "schema_tables": self._count(entities, ("schema", "tables")),
+            "is_valid": self.validate_data()
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import a catalog into a SQLite catalog store")
+    parser.add_argument("catalog", type=Path, help="vertex.json, a JSONL catalog, a data/ export or a directory")
+    parser.add_argument("db_path", type=Path)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    store = SQLiteCatalogStore(args.db_path)
+    store.import_catalog(args.catalog)
+    print(json.dumps(store.get_vertex_info(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
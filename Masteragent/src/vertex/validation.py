@@ -0,0 +1,301 @@
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from jsonschema import Draft7Validator, validators
+
+RELATIONSHIP_SCHEMA = {
+    "type": "object",
+    "required": ["source", "target"],
+    "properties": {
+        "source": {"type": "string", "minLength": 1},
+        "target": {"type": "string", "minLength": 1},
+        "type": {"type": "string"},
+        "cardinality": {"type": "string"}
+    }
+}
+
+# Entity-level relationships are either free text ("has_many accounts") or
+# records whose target names another entity
+ENTITY_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "attributes": {"type": ["array", "object"]},
+        "relationships": {
+            "type": "array",
+            "items": {
+                "anyOf": [
+                    {"type": "string"},
+                    {
+                        "type": "object",
+                        "required": ["target"],
+                        "properties": {"target": {"type": "string", "minLength": 1}}
+                    }
+                ]
+            }
+        }
+    }
+}
+
+COLUMN_SCHEMA = {
+    "type": "object",
+    "required": ["name", "type"],
+    "properties": {
+        "name": {"type": "string", "minLength": 1},
+        "type": {"type": "string", "minLength": 1},
+        "primary_key": {"type": "boolean"},
+        "nullable": {"type": "boolean"},
+        "valid_values": {"type": "array"},
+        "foreign_key": {
+            "type": "object",
+            "required": ["table"],
+            "properties": {
+                "table": {"type": "string", "minLength": 1},
+                "column": {"type": "string", "minLength": 1}
+            }
+        }
+    }
+}
+
+TABLE_SCHEMA = {
+    "type": "object",
+    "required": ["columns"],
+    "properties": {
+        "columns": {"type": "array", "items": COLUMN_SCHEMA},
+        "indexes": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["columns"],
+                "properties": {"columns": {"type": "array", "items": {"type": "string"}}}
+            }
+        }
+    }
+}
+
+# Tables are checked separately against TABLE_SCHEMA while they are walked
+# once for the referential checks, so the catalog schema only types the map.
+CATALOG_SCHEMA = {
+    "type": "object",
+    "required": ["datapedia", "conceptual_model", "schema"],
+    "properties": {
+        "datapedia": {
+            "type": "object",
+            "required": ["entities"],
+            "properties": {
+                "entities": {"type": "object", "additionalProperties": ENTITY_SCHEMA},
+                "relationships": {"type": "array", "items": RELATIONSHIP_SCHEMA}
+            }
+        },
+        "conceptual_model": {
+            "type": "object",
+            # vertex.json uses "entities"; the conceptual model export uses "business_concepts"
+            "anyOf": [{"required": ["entities"]}, {"required": ["business_concepts"]}],
+            "properties": {
+                "entities": {"type": "object", "additionalProperties": ENTITY_SCHEMA},
+                "business_concepts": {"type": "object", "additionalProperties": ENTITY_SCHEMA},
+                "relationships": {"type": "array", "items": RELATIONSHIP_SCHEMA}
+            }
+        },
+        "schema": {
+            "type": "object",
+            "required": ["tables"],
+            "properties": {"tables": {"type": "object"}}
+        }
+    }
+}
+
+# Lazily loaded catalogs are Mappings rather than dicts
+_MappingValidator = validators.extend(
+    Draft7Validator,
+    type_checker=Draft7Validator.TYPE_CHECKER.redefine(
+        "object", lambda checker, instance: isinstance(instance, Mapping)
+    )
+)
+
+
+@dataclass(frozen=True)
+class ValidationIssue:
+    """One problem in the catalog, located by a dotted path"""
+    path: str
+    message: str
+
+    def __str__(self) -> str:
+        return f"{self.path or '<root>'}: {self.message}"
+
+
+@dataclass
+class ValidationReport:
+    content_hash: str
+    errors: List[ValidationIssue] = field(default_factory=list)
+
+    @property
+    def valid(self) -> bool:
+        return not self.errors
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "content_hash": self.content_hash,
+            "valid": self.valid,
+            "errors": [{"path": e.path, "message": e.message} for e in self.errors]
+        }
+
+
+class CatalogValidationError(ValueError):
+    """Raised when a catalog is rejected before it reaches the LLM"""
+
+    def __init__(self, report: ValidationReport):
+        self.report = report
+        shown = "; ".join(str(error) for error in report.errors[:5])
+        more = f" (+{len(report.errors) - 5} more)" if len(report.errors) > 5 else ""
+        super().__init__(f"Invalid catalog: {shown}{more}")
+
+
+def _format_path(parts: Iterable[Any]) -> str:
+    path = ""
+    for part in parts:
+        path += f"[{part}]" if isinstance(part, int) else (f".{part}" if path else str(part))
+    return path
+
+
+class CatalogValidator:
+    """Structural and referential catalog checks, compiled once"""
+
+    def __init__(self):
+        for schema in (CATALOG_SCHEMA, TABLE_SCHEMA):
+            _MappingValidator.check_schema(schema)
+        self._catalog = _MappingValidator(CATALOG_SCHEMA)
+        self._table = _MappingValidator(TABLE_SCHEMA)
+
+    def _schema_errors(self, validator, instance: Any, prefix: Tuple[Any, ...]) -> List[ValidationIssue]:
+        return [
+            ValidationIssue(_format_path(prefix + tuple(error.absolute_path)), error.message)
+            for error in validator.iter_errors(instance)
+        ]
+
+    def validate(self, catalog: Mapping) -> List[ValidationIssue]:
+        errors = self._schema_errors(self._catalog, catalog, ())
+        if not isinstance(catalog, Mapping):
+            return errors
+
+        def section(name: str) -> Mapping:
+            value = catalog.get(name, {})
+            return value if isinstance(value, Mapping) else {}
+
+        datapedia = section("datapedia")
+        conceptual = section("conceptual_model")
+        tables = section("schema").get("tables", {})
+        tables = tables if isinstance(tables, Mapping) else {}
+
+        known: Set[str] = set(tables)
+        for source, key in ((datapedia, "entities"), (conceptual, "entities"), (conceptual, "business_concepts")):
+            if isinstance(source.get(key), Mapping):
+                known.update(source[key])
+
+        # Relationship endpoints must name an entity from some section
+        relationships: List[Tuple[Tuple[Any, ...], Dict[str, Any]]] = []
+        for name, source in (("datapedia", datapedia), ("conceptual_model", conceptual)):
+            for index, rel in enumerate(source.get("relationships", []) or []):
+                relationships.append(((name, "relationships", index), rel))
+        entities = datapedia.get("entities", {})
+        if isinstance(entities, Mapping):
+            for entity_name, entity in entities.items():
+                if not isinstance(entity, Mapping):
+                    continue
+                for index, rel in enumerate(entity.get("relationships", []) or []):
+                    relationships.append((("datapedia", "entities", entity_name, "relationships", index), rel))
+        for path, rel in relationships:
+            if not isinstance(rel, Mapping):
+                continue
+            for end in ("source", "target"):
+                if isinstance(rel.get(end), str) and rel[end] and rel[end] not in known:
+                    errors.append(ValidationIssue(
+                        _format_path(path + (end,)), f"Unknown entity {rel[end]!r}"
+                    ))
+
+        # Each table is decoded once: shape checks, column sets and FK targets
+        columns_by_table: Dict[str, Set[str]] = {}
+        foreign_keys: List[Tuple[Tuple[Any, ...], Dict[str, Any]]] = []
+        for table_name, table in tables.items():
+            prefix = ("schema", "tables", table_name)
+            table_errors = self._schema_errors(self._table, table, prefix)
+            errors.extend(table_errors)
+            if not isinstance(table, Mapping) or not isinstance(table.get("columns"), list):
+                continue
+            names = {column.get("name") for column in table["columns"] if isinstance(column, Mapping)}
+            columns_by_table[table_name] = names
+            for index, column in enumerate(table["columns"]):
+                if isinstance(column, Mapping) and isinstance(column.get("foreign_key"), Mapping):
+                    foreign_keys.append((prefix + ("columns", index, "foreign_key"), column["foreign_key"]))
+            for index, table_index in enumerate(table.get("indexes", []) or []):
+                if not isinstance(table_index, Mapping):
+                    continue
+                for position, column in enumerate(table_index.get("columns", []) or []):
+                    if isinstance(column, str) and column not in names:
+                        errors.append(ValidationIssue(
+                            _format_path(prefix + ("indexes", index, "columns", position)),
+                            f"Unknown column {column!r}"
+                        ))
+
+        for path, foreign_key in foreign_keys:
+            target = foreign_key.get("table")
+            if not isinstance(target, str):
+                continue
+            if target not in columns_by_table:
+                errors.append(ValidationIssue(_format_path(path + ("table",)), f"Unknown table {target!r}"))
+            elif foreign_key.get("column") and foreign_key["column"] not in columns_by_table[target]:
+                errors.append(ValidationIssue(
+                    _format_path(path + ("column",)),
+                    f"Unknown column {foreign_key['column']!r} in table {target!r}"
+                ))
+        return errors
+
+
+def content_hash(catalog: Mapping) -> str:
+    """Hash of the catalog content, fed one table at a time"""
+    digest = hashlib.sha256()
+
+    def feed(value: Any) -> None:
+        if isinstance(value, Mapping):
+            digest.update(b"{")
+            for key in sorted(value):
+                digest.update(json.dumps(key).encode("utf-8") + b":")
+                feed(value[key])
+            digest.update(b"}")
+        else:
+            digest.update(json.dumps(value, sort_keys=True, default=str).encode("utf-8"))
+
+    feed(catalog)
+    return digest.hexdigest()
+
+
+_validator: Optional[CatalogValidator] = None
+_reports: "OrderedDict[str, ValidationReport]" = OrderedDict()
+_reports_lock = threading.Lock()
+_MAX_REPORTS = 32
+
+
+def validate_catalog(catalog: Mapping, catalog_hash: Optional[str] = None) -> ValidationReport:
+    """Validate a catalog, reusing the report of any earlier catalog with the same content"""
+    global _validator
+    catalog_hash = catalog_hash or content_hash(catalog)
+    with _reports_lock:
+        if catalog_hash in _reports:
+            _reports.move_to_end(catalog_hash)
+            return _reports[catalog_hash]
+        if _validator is None:
+            _validator = CatalogValidator()
+
+    report = ValidationReport(catalog_hash, _validator.validate(catalog))
+    if report.errors:
+        logging.error(f"Catalog has {len(report.errors)} validation errors, first: {report.errors[0]}")
+    with _reports_lock:
+        _reports[catalog_hash] = report
+        while len(_reports) > _MAX_REPORTS:
+            _reports.popitem(last=False)
+    return report
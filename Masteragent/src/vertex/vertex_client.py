@@ -1,164 +1,279 @@
-import json
-import logging
-from pathlib import Path
-from typing import Dict, Any, Optional
-
-class VertexDBClient:
-    def __init__(self):
-        self.data_path = Path(__file__).parent / "vertex.json"
-        self.data = self._load_data()
-        
-    def _load_data(self) -> Dict[str, Any]:
-        """Load data from vertex.json"""
-        try:
-            if not self.data_path.exists():
-                logging.warning(f"Vertex data file not found at {self.data_path}")
-                return self._get_default_data()
-                
-            with open(self.data_path, 'r') as f:
-                data = json.load(f)
-                logging.info("Successfully loaded vertex data")
-                return data
-                
-        except Exception as e:
-            logging.error(f"Error loading vertex data: {e}")
-            return self._get_default_data()
-
-    def _get_default_data(self) -> Dict[str, Any]:
-        """Return default empty data structure"""
-        return {
-            "datapedia": {
-                "entities": {},
-                "relationships": []
-            },
-            "conceptual_model": {
-                "entities": {},
-                "relationships": []
-            },
-            "schema": {
-                "tables": {},
-                "relationships": []
-            }
-        }
-
-    def get_data(self) -> Dict[str, Any]:
-        """Get all data"""
-        return self.data
-
-    def get_datapedia(self) -> Dict[str, Any]:
-        """Get datapedia section"""
-        return self.data.get("datapedia", {})
-
-    def get_conceptual_model(self) -> Dict[str, Any]:
-        """Get conceptual model section"""
-        return self.data.get("conceptual_model", {})
-
-    def get_schema(self) -> Dict[str, Any]:
-        """Get schema section"""
-        return self.data.get("schema", {})
-
-    def get_entity(self, entity_name: str) -> Optional[Dict[str, Any]]:
-        """Get specific entity from any source"""
-        # Check datapedia
-        if entity_name in self.data.get("datapedia", {}).get("entities", {}):
-            return {
-                "source": "datapedia",
-                "data": self.data["datapedia"]["entities"][entity_name]
-            }
-            
-        # Check conceptual model
-        if entity_name in self.data.get("conceptual_model", {}).get("entities", {}):
-            return {
-                "source": "conceptual_model",
-                "data": self.data["conceptual_model"]["entities"][entity_name]
-            }
-            
-        # Check schema
-        if entity_name in self.data.get("schema", {}).get("tables", {}):
-            return {
-                "source": "schema",
-                "data": self.data["schema"]["tables"][entity_name]
-            }
-            
-        return None
-
-    def get_relationships_for_entity(self, entity_name: str) -> List[Dict[str, Any]]:
-        """Get all relationships involving an entity"""
-        relationships = []
-        
-        # Check datapedia relationships
-        for rel in self.data.get("datapedia", {}).get("relationships", []):
-            if rel.get("source") == entity_name or rel.get("target") == entity_name:
-                relationships.append({
-                    "source": "datapedia",
-                    "data": rel
-                })
-                
-        # Check conceptual model relationships
-        for rel in self.data.get("conceptual_model", {}).get("relationships", []):
-            if rel.get("source") == entity_name or rel.get("target") == entity_name:
-                relationships.append({
-                    "source": "conceptual_model",
-                    "data": rel
-                })
-                
-        # Check schema relationships
-        for table_name, table_data in self.data.get("schema", {}).get("tables", {}).items():
-            for column in table_data.get("columns", []):
-                if "foreign_key" in column:
-                    if table_name == entity_name or column["foreign_key"]["table"] == entity_name:
-                        relationships.append({
-                            "source": "schema",
-                            "data": {
-                                "source": table_name,
-                                "target": column["foreign_key"]["table"],
-                                "type": "foreign_key",
-                                "column": column["name"]
-                            }
-                        })
-                        
-        return relationships
-
-    def validate_data(self) -> bool:
-        """Validate data structure"""
-        try:
-            required_sections = ["datapedia", "conceptual_model", "schema"]
-            for section in required_sections:
-                if section not in self.data:
-                    logging.error(f"Missing required section: {section}")
-                    return False
-                    
-            # Validate datapedia
-            datapedia = self.data["datapedia"]
-            if "entities" not in datapedia or "relationships" not in datapedia:
-                logging.error("Invalid datapedia structure")
-                return False
-                
-            # Validate conceptual model
-            conceptual = self.data["conceptual_model"]
-            if "entities" not in conceptual or "relationships" not in conceptual:
-                logging.error("Invalid conceptual model structure")
-                return False
-                
-            # Validate schema
-            schema = self.data["schema"]
-            if "tables" not in schema:
-                logging.error("Invalid schema structure")
-                return False
-                
-            return True
-            
-        except Exception as e:
-            logging.error(f"Error validating data: {e}")
-            return False
-
-    def get_vertex_info(self) -> Dict[str, Any]:
-        """Get summary information about the vertex data"""
-        return {
-            "datapedia_entities": len(self.data.get("datapedia", {}).get("entities", {})),
-            "datapedia_relationships": len(self.data.get("datapedia", {}).get("relationships", [])),
-            "conceptual_entities": len(self.data.get("conceptual_model", {}).get("entities", {})),
-            "conceptual_relationships": len(self.data.get("conceptual_model", {}).get("relationships", [])),
-            "schema_tables": len(self.data.get("schema", {}).get("tables", {})),
-            "is_valid": self.validate_data()
-        }
\ No newline at end of file
+import itertools
+import logging
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+from .async_api import AsyncCatalogAPI
+from .columnar import columnar_catalog
+from .loader import open_catalog, source_hash
+from .names import NameIndex
+from .snapshot import CatalogSnapshot
+from .validation import ValidationReport
+
+class VertexDBClient(AsyncCatalogAPI):
+    def __init__(self, data_path: Optional[Path] = None, columnar_schema: bool = False, private_copy: bool = False):
+        self.data_path = Path(data_path) if data_path else Path(__file__).parent / "vertex.json"
+        # Keep schema tables as ColumnarTables instead of re-decoding them per read
+        self.columnar_schema = columnar_schema
+        # Snapshots map the catalog files themselves, which writers must then
+        # replace by an atomic rename; set this for catalogs edited in place
+        self.private_copy = private_copy
+        self._versions = itertools.count(1)
+        # Runs pin the snapshot they started with; see pinned()
+        self._pinned: ContextVar[Optional[CatalogSnapshot]] = ContextVar(f"vertex_snapshot_{id(self)}", default=None)
+        # Serializes writers only; readers never take it
+        self._reload_lock = threading.Lock()
+        self._watcher: Optional[threading.Thread] = None
+        self._stop_watching = threading.Event()
+        self._signature = self._file_signature()
+        self._current = self._load_snapshot()
+
+    def snapshot(self) -> CatalogSnapshot:
+        """The snapshot pinned by the current run, else the latest one"""
+        return self._pinned.get() or self._current
+
+    @contextmanager
+    def pinned(self) -> Iterator[CatalogSnapshot]:
+        """Serve every read in this context (and tasks it starts) from one snapshot"""
+        snapshot = self._pinned.get()
+        if snapshot is not None:
+            yield snapshot
+            return
+        token = self._pinned.set(self._current)
+        try:
+            yield self._current
+        finally:
+            self._pinned.reset(token)
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        return self.snapshot().data
+
+    @data.setter
+    def data(self, value: Dict[str, Any]) -> None:
+        self._current = CatalogSnapshot(value, next(self._versions))
+
+    async def aget_data(self) -> Dict[str, Any]:
+        # Handing out the snapshot never blocks; sections load when read
+        return self.get_data()
+
+    @property
+    def version(self) -> int:
+        return self.snapshot().version
+
+    def set_data(self, data: Dict[str, Any]) -> None:
+        """Replace the catalog"""
+        self.data = data
+
+    def reload(self) -> None:
+        """Re-read the catalog from ``data_path``"""
+        with self._reload_lock:
+            self._signature = self._file_signature()
+            self._current = self._load_snapshot()
+
+    def mark_changed(self) -> None:
+        """Publish a fresh snapshot after the catalog was modified in place"""
+        self.data = self._current.data
+
+    def nbytes(self) -> int:
+        """Approximate memory cost of the current snapshot; see ``CatalogSnapshot.nbytes``"""
+        return self.snapshot().nbytes()
+
+    def _file_signature(self) -> Tuple:
+        files = [self.data_path]
+        if self.data_path.is_dir():
+            files = sorted(self.data_path.glob("*.json")) + sorted(self.data_path.glob("*.jsonl"))
+        signature = []
+        for file in files:
+            try:
+                stat = file.stat()
+            except OSError:
+                continue
+            signature.append((file.name, stat.st_ino, stat.st_size, stat.st_mtime_ns))
+        return tuple(signature)
+
+    def refresh(self) -> bool:
+        """Load a changed catalog file and swap it in; returns True if swapped.
+
+        The new version is parsed, indexed and validated before it is
+        published, and an invalid one is not published at all. Readers are
+        never blocked: they keep using the previous snapshot meanwhile.
+        """
+        with self._reload_lock:
+            signature = self._file_signature()
+            if signature == self._signature:
+                return False
+            self._signature = signature
+            try:
+                # Hashed first: a change landing in between is then seen
+                # again by the next poll instead of matching this digest
+                digest = source_hash(self.data_path)
+                data = self._open_catalog()
+            except Exception as e:
+                logging.error(f"Error reloading vertex data, keeping v{self._current.version}: {e}")
+                return False
+            if digest == self._current.content_hash:
+                return False
+
+            snapshot = CatalogSnapshot(data, next(self._versions), digest)
+            report = snapshot.validate()
+            if not report.valid:
+                logging.error(
+                    f"Not publishing catalog change with {len(report.errors)} validation errors, "
+                    f"keeping v{self._current.version}: {report.errors[0]}"
+                )
+                return False
+            snapshot.build_indexes()
+            self._current = snapshot
+            logging.info(f"Swapped in vertex catalog v{snapshot.version}")
+            return True
+
+    def watch(self, interval: float = 2.0) -> None:
+        """Poll ``data_path`` in a background thread and hot-swap new versions.
+
+        A replacement is detected by the inode, size and mtime of the catalog
+        files. Writers should replace them by an atomic rename, which leaves
+        runs pinned to an older snapshot reading the old inode; catalogs
+        rewritten in place need ``private_copy``.
+        """
+        if self._watcher is not None:
+            return
+        self._stop_watching.clear()
+
+        def poll() -> None:
+            while not self._stop_watching.wait(interval):
+                try:
+                    self.refresh()
+                except Exception as e:
+                    logging.error(f"Error watching vertex data: {e}")
+
+        self._watcher = threading.Thread(target=poll, name="vertex-catalog-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self) -> None:
+        self._stop_watching.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+    def _load_snapshot(self) -> CatalogSnapshot:
+        data, digest = self._load_data()
+        return CatalogSnapshot(data, next(self._versions), digest)
+        
+    def _load_data(self) -> Tuple[Dict[str, Any], Optional[str]]:
+        """Open vertex.json (or a JSONL catalog, data/ export or directory of them)
+
+        Sections are parsed on first access and schema tables are decoded one
+        at a time, so large catalogs are never held in memory as a whole.
+        """
+        try:
+            if not self.data_path.exists():
+                logging.warning(f"Vertex data file not found at {self.data_path}")
+                return self._get_default_data(), None
+                
+            digest = source_hash(self.data_path)
+            data = self._open_catalog()
+            logging.info("Successfully loaded vertex data")
+            return data, digest
+                
+        except Exception as e:
+            logging.error(f"Error loading vertex data: {e}")
+            return self._get_default_data(), None
+
+    def _open_catalog(self) -> Dict[str, Any]:
+        data = open_catalog(self.data_path, self.private_copy)
+        return columnar_catalog(data) if self.columnar_schema else data
+
+    def _get_default_data(self) -> Dict[str, Any]:
+        """Return default empty data structure"""
+        return {
+            "datapedia": {
+                "entities": {},
+                "relationships": []
+            },
+            "conceptual_model": {
+                "entities": {},
+                "relationships": []
+            },
+            "schema": {
+                "tables": {},
+                "relationships": []
+            }
+        }
+
+    def get_data(self) -> Dict[str, Any]:
+        """Get all data"""
+        return self.data
+
+    def get_datapedia(self) -> Dict[str, Any]:
+        """Get datapedia section"""
+        return self.data.get("datapedia", {})
+
+    def get_conceptual_model(self) -> Dict[str, Any]:
+        """Get conceptual model section"""
+        return self.data.get("conceptual_model", {})
+
+    def get_schema(self) -> Dict[str, Any]:
+        """Get schema section"""
+        return self.data.get("schema", {})
+
+    def get_entity(self, entity_name: str) -> Optional[Dict[str, Any]]:
+        """Get specific entity from any source"""
+        return self.snapshot().get_entity(entity_name)
+
+    def get_entities(self, entity_names: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Get several entities, all from the same snapshot"""
+        snapshot = self.snapshot()
+        return {name: snapshot.get_entity(name) for name in entity_names}
+
+    def name_index(self) -> NameIndex:
+        """Canonical entity names of the current snapshot, built with its other indexes"""
+        return self.snapshot().name_index()
+
+    def resolve_entity(self, name: str) -> Optional[str]:
+        """Key of the entity ``name`` refers to in any section (``customers`` -> ``customer``)"""
+        return self.snapshot().name_index().resolve(name)
+
+    def get_relationships_for_entity(self, entity_name: str) -> List[Dict[str, Any]]:
+        """Get all relationships involving an entity"""
+        return self.snapshot().get_relationships_for_entity(entity_name)
+
+    def get_outgoing_relationships(self, entity_name: str) -> List[Dict[str, Any]]:
+        """Get relationships whose source is the entity"""
+        return self.snapshot().get_outgoing_relationships(entity_name)
+
+    def get_incoming_relationships(self, entity_name: str) -> List[Dict[str, Any]]:
+        """Get relationships whose target is the entity"""
+        return self.snapshot().get_incoming_relationships(entity_name)
+
+    def validate(self) -> ValidationReport:
+        """Check structure, foreign keys and relationship endpoints in one pass
+
+        The report is cached by content hash, so repeated calls are free
+        until the catalog changes.
+        """
+        return self.snapshot().validate()
+
+    def validate_data(self) -> bool:
+        """Validate data structure"""
+        try:
+            return self.validate().valid
+        except Exception as e:
+            logging.error(f"Error validating data: {e}")
+            return False
+
+    def get_vertex_info(self) -> Dict[str, Any]:
+        """Get summary information about the vertex data"""
+        with self.pinned() as snapshot:
+            data = snapshot.data
+            return {
+                "version": snapshot.version,
+                "datapedia_entities": len(data.get("datapedia", {}).get("entities", {})),
+                "datapedia_relationships": len(data.get("datapedia", {}).get("relationships", [])),
+                "conceptual_entities": len(data.get("conceptual_model", {}).get("entities", {})),
+                "conceptual_relationships": len(data.get("conceptual_model", {}).get("relationships", [])),
+                "schema_tables": len(data.get("schema", {}).get("tables", {})),
+                "is_valid": self.validate_data()
+            }
\ No newline at end of file